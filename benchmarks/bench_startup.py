@@ -0,0 +1,91 @@
+"""
+Measure CLI startup: import time and wall time of cheap invocations.
+
+Parent skills spawn ``python -m bilibili_subtitle`` for every video, so the
+imports done before any real work are paid on every call. Import time is
+read from ``python -X importtime`` (modules the bare interpreter already
+loads at startup, and runpy, are excluded); wall time is best-of-N for the whole process.
+
+Usage:
+    pixi run python -m benchmarks.bench_startup
+    pixi run python -m benchmarks.bench_startup --repeat 20 --help-budget-ms 30
+
+Exits with status 1 if a command's import time exceeds its budget.
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import time
+
+
+def _top_level_imports(stderr: str) -> dict[str, int]:
+    """Top-level ``-X importtime`` entries -> cumulative microseconds."""
+    out: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:") :].split("|")
+        if len(parts) != 3 or not parts[1].strip().isdigit():
+            continue  # header row
+        name = parts[2]
+        if name.startswith(" ") and not name.startswith("  "):  # depth 0
+            out[name.strip()] = int(parts[1])
+    return out
+
+
+def import_time_ms(args: list[str], *, baseline: set[str]) -> float:
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", *args], capture_output=True, text=True
+    )
+    imports = _top_level_imports(proc.stderr)
+    return sum(us for name, us in imports.items() if name not in baseline) / 1000
+
+
+def wall_time_ms(args: list[str], *, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        subprocess.run([sys.executable, *args], capture_output=True)
+        best = min(best, time.perf_counter() - t0)
+    return best * 1000
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--help-budget-ms", type=float, default=50.0, help="Import budget for --help")
+    parser.add_argument("--check-budget-ms", type=float, default=75.0, help="Import budget for --check-json")
+    args = parser.parse_args()
+
+    startup = _top_level_imports(
+        subprocess.run([sys.executable, "-X", "importtime", "-c", "pass"], capture_output=True, text=True).stderr
+    )
+    baseline = set(startup) | {"runpy"}  # runpy is the cost of ``-m`` itself
+    bare_ms = wall_time_ms(["-c", "pass"], repeat=args.repeat)
+    print(f"{'python -c pass':<52} {'':>12} wall {bare_ms:8.1f} ms")
+
+    cases = [
+        ("python -c 'import bilibili_subtitle'", ["-c", "import bilibili_subtitle"], None),
+        ("python -m bilibili_subtitle --help", ["-m", "bilibili_subtitle", "--help"], args.help_budget_ms),
+        (
+            "python -m bilibili_subtitle --check-json",
+            ["-m", "bilibili_subtitle", "--check-json", "--skip-auth-check"],
+            args.check_budget_ms,
+        ),
+    ]
+    over_budget = []
+    for label, cmd, budget in cases:
+        imports = min(import_time_ms(cmd, baseline=baseline) for _ in range(3))
+        wall = wall_time_ms(cmd, repeat=args.repeat)
+        status = "" if budget is None else ("  OK" if imports <= budget else f"  OVER BUDGET ({budget:.0f} ms)")
+        print(f"{label:<52} import {imports:6.1f} ms wall {wall:8.1f} ms{status}")
+        if budget is not None and imports > budget:
+            over_budget.append(label)
+    return 1 if over_budget else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
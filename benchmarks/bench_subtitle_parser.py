@@ -0,0 +1,107 @@
+"""
+Compare the single-pass SRT/VTT parser with the previous regex-based one.
+
+Usage:
+    pixi run python -m benchmarks.bench_subtitle_parser
+    pixi run python -m benchmarks.bench_subtitle_parser --cues 50000 --repeat 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import time
+from collections.abc import Callable
+
+from bilibili_subtitle.converters.srt_converter import srt_to_segments, vtt_to_segments
+from bilibili_subtitle.renderers._time import format_timestamp_srt, format_timestamp_vtt
+from bilibili_subtitle.segment import Segment
+
+# --- Previous implementation, kept verbatim as the baseline ---
+
+_LEGACY_TIME_RE = re.compile(
+    r"(?P<sh>\d{2}):(?P<sm>\d{2}):(?P<ss>\d{2}),(?P<sms>\d{3})\s*-->\s*"
+    r"(?P<eh>\d{2}):(?P<em>\d{2}):(?P<es>\d{2}),(?P<ems>\d{3})"
+)
+_LEGACY_VTT_TS_RE = re.compile(r"(\d{2}:\d{2}:\d{2})\.(\d{3})")
+
+
+def _legacy_to_ms(h: str, m: str, s: str, ms: str) -> int:
+    return (int(h) * 3600 + int(m) * 60 + int(s)) * 1000 + int(ms)
+
+
+def legacy_srt_to_segments(srt_text: str) -> list[Segment]:
+    blocks = re.split(r"\r?\n\r?\n+", srt_text.strip())
+    segments: list[Segment] = []
+    for block in blocks:
+        lines = [ln.strip("\r") for ln in block.splitlines() if ln.strip("\r").strip()]
+        if len(lines) < 2:
+            continue
+        time_line = lines[1] if lines[0].isdigit() else lines[0]
+        m = _LEGACY_TIME_RE.search(time_line)
+        if not m:
+            continue
+        start_ms = _legacy_to_ms(m["sh"], m["sm"], m["ss"], m["sms"])
+        end_ms = _legacy_to_ms(m["eh"], m["em"], m["es"], m["ems"])
+        text_lines = lines[2:] if lines[0].isdigit() else lines[1:]
+        text = " ".join(" ".join(text_lines).replace("\n", " ").split())
+        segments.append(Segment(start_ms=start_ms, end_ms=end_ms, text=text))
+    return segments
+
+
+def legacy_vtt_to_segments(text: str) -> list[Segment]:
+    out: list[str] = []
+    for line in text.splitlines(keepends=True):
+        if "-->" in line and _LEGACY_VTT_TS_RE.search(line):
+            line = _LEGACY_VTT_TS_RE.sub(r"\1,\2", line)
+        out.append(line)
+    return legacy_srt_to_segments("".join(out))
+
+
+# --- Corpus ---
+
+
+def make_corpus(cues: int, *, vtt: bool) -> str:
+    fmt = format_timestamp_vtt if vtt else format_timestamp_srt
+    lines = ["WEBVTT", ""] if vtt else []
+    for i in range(cues):
+        start = i * 2000
+        lines.append(str(i + 1))
+        lines.append(f"{fmt(start)} --> {fmt(start + 1800)}")
+        lines.append(f"第{i}句字幕 subtitle line {i}")
+        lines.append("")
+    return "\n".join(lines)
+
+
+def best_of(fn: Callable[[str], list[Segment]], text: str, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(text)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cues", type=int, default=50_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    cases = [
+        ("srt", legacy_srt_to_segments, srt_to_segments, False),
+        ("vtt", legacy_vtt_to_segments, vtt_to_segments, True),
+    ]
+    for name, legacy, current, vtt in cases:
+        text = make_corpus(args.cues, vtt=vtt)
+        if legacy(text) != current(text):
+            print(f"{name}: outputs differ")
+            return 1
+        old = best_of(legacy, text, args.repeat)
+        new = best_of(current, text, args.repeat)
+        print(f"{name}: {args.cues} cues  legacy {old * 1000:8.1f} ms  current {new * 1000:8.1f} ms  {old / new:5.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,269 @@
+"""
+Benchmark suite for the CPU-bound hot paths.
+
+Runs on synthetic SRT/VTT corpora and chunk transcripts only: no network,
+binaries or API keys. Each case reports best-of-N wall time, throughput
+(cues per second) and tracemalloc peak memory.
+
+Usage:
+    pixi run python -m benchmarks.run
+    pixi run python -m benchmarks.run --sizes 1000 10000 --case srt_to_segments
+    pixi run python -m benchmarks.run --save benchmarks/baseline.json
+    pixi run python -m benchmarks.run --compare benchmarks/baseline.json
+
+``--compare`` exits with status 1 if any case is slower, or uses more memory,
+than the baseline by more than the given tolerance. Baselines are
+machine-specific; regenerate one with ``--save`` before comparing on a new
+machine.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import sys
+import time
+import tracemalloc
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from bilibili_subtitle.converters.srt_converter import srt_to_segments, vtt_to_segments
+from bilibili_subtitle.merger import ChunkTranscript, merge_chunk_transcripts
+from bilibili_subtitle.renderers.combined import render_all_formats
+from bilibili_subtitle.renderers.markdown import render_transcript_markdown
+from bilibili_subtitle.renderers.srt import render_srt
+from bilibili_subtitle.renderers.vtt import render_vtt
+from bilibili_subtitle.segment import Segment
+from bilibili_subtitle.subtitle_loader import check_title_relevance
+
+from .bench_subtitle_parser import make_corpus
+
+DEFAULT_SIZES = (1_000, 10_000, 100_000)
+
+# A title none of the synthetic cues mention, so the relevance check scans everything.
+_UNMATCHED_TITLE = "量子力学入门讲座"
+
+
+# --- Corpora ---
+
+
+def make_segments(cues: int) -> list[Segment]:
+    return srt_to_segments(make_corpus(cues, vtt=False))
+
+
+def make_chunk_transcripts(
+    cues: int, *, chunk_ms: int = 60_000, overlap_ms: int = 2_000, cue_ms: int = 2_000
+) -> list[ChunkTranscript]:
+    """Chunks ``chunk_ms`` long, each overlapping the previous by ``overlap_ms``.
+
+    Cue text depends only on absolute time, so the cues in each overlap
+    appear in both neighbouring chunks and must be deduplicated.
+    """
+    step = chunk_ms - overlap_ms
+    chunks: list[ChunkTranscript] = []
+    total = 0
+    chunk_start = 0
+    while total < cues:
+        segments = []
+        for local in range(0, chunk_ms, cue_ms):
+            n = (chunk_start + local) // cue_ms
+            segments.append(Segment(local, local + cue_ms - 200, f"第{n}句字幕 subtitle line {n}"))
+        chunks.append(ChunkTranscript(chunk_start_ms=chunk_start, segments=segments))
+        total += len(segments)
+        chunk_start += step
+    return chunks
+
+
+# --- Cases ---
+
+
+@dataclass(frozen=True, slots=True)
+class Case:
+    name: str
+    # Builds the inputs for a corpus of ``size`` cues and returns the timed call.
+    prepare: Callable[[int], Callable[[], object]]
+
+
+def _parse_case(vtt: bool) -> Callable[[int], Callable[[], object]]:
+    parse = vtt_to_segments if vtt else srt_to_segments
+
+    def prepare(size: int) -> Callable[[], object]:
+        text = make_corpus(size, vtt=vtt)
+        return lambda: parse(text)
+
+    return prepare
+
+
+def _merge_case(size: int) -> Callable[[], object]:
+    chunks = make_chunk_transcripts(size)
+    return lambda: merge_chunk_transcripts(chunks)
+
+
+def _relevance_case(size: int) -> Callable[[], object]:
+    segments = make_segments(size)
+    return lambda: check_title_relevance(segments, _UNMATCHED_TITLE)
+
+
+def _render_case(render: Callable[[list[Segment]], object]) -> Callable[[int], Callable[[], object]]:
+    def prepare(size: int) -> Callable[[], object]:
+        segments = make_segments(size)
+        return lambda: render(segments)
+
+    return prepare
+
+
+def _segment_case(size: int) -> Callable[[], object]:
+    rows = [(i * 2000, i * 2000 + 1800, f"第{i}句字幕") for i in range(size)]
+    return lambda: [Segment(s, e, t) for s, e, t in rows]
+
+
+CASES: tuple[Case, ...] = (
+    Case("srt_to_segments", _parse_case(vtt=False)),
+    Case("vtt_to_segments", _parse_case(vtt=True)),
+    Case("merge_chunk_transcripts", _merge_case),
+    Case("check_title_relevance", _relevance_case),
+    Case("render_srt", _render_case(render_srt)),
+    Case("render_vtt", _render_case(render_vtt)),
+    Case("render_transcript_markdown", _render_case(render_transcript_markdown)),
+    Case("render_all_formats", _render_case(render_all_formats)),
+    Case("Segment", _segment_case),
+)
+
+
+# --- Measurement ---
+
+
+def measure(fn: Callable[[], object], *, repeat: int) -> tuple[float, int]:
+    """Best-of-``repeat`` wall time in seconds, then peak traced bytes of one extra run."""
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    # Measured separately: tracing allocations slows the timed runs down.
+    tracemalloc.start()
+    try:
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def run_cases(
+    sizes: tuple[int, ...] | list[int],
+    *,
+    repeat: int = 5,
+    names: list[str] | None = None,
+    report: Callable[[str, dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    """Run the selected cases at each size; returns a baseline-shaped dict."""
+    results: dict[str, dict[str, Any]] = {}
+    for case in CASES:
+        if names and case.name not in names:
+            continue
+        for size in sizes:
+            seconds, peak = measure(case.prepare(size), repeat=repeat)
+            key = f"{case.name}@{size}"
+            results[key] = {
+                "case": case.name,
+                "size": size,
+                "seconds": round(seconds, 6),
+                "cues_per_s": round(size / seconds) if seconds else None,
+                "peak_kib": round(peak / 1024, 1),
+            }
+            if report is not None:
+                report(key, results[key])
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def compare(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    *,
+    time_tolerance: float = 0.25,
+    memory_tolerance: float = 0.10,
+) -> list[str]:
+    """Describe every case that regressed against ``baseline``.
+
+    Cases missing from either side are ignored. Memory differences below
+    64 KiB are treated as noise.
+    """
+    regressions: list[str] = []
+    base_results = baseline.get("results", {})
+    for key, cur in current["results"].items():
+        base = base_results.get(key)
+        if base is None:
+            continue
+        if base["seconds"] and cur["seconds"] > base["seconds"] * (1 + time_tolerance):
+            regressions.append(
+                f"{key}: time {base['seconds'] * 1000:.2f} ms -> {cur['seconds'] * 1000:.2f} ms "
+                f"({cur['seconds'] / base['seconds']:.2f}x)"
+            )
+        if (
+            cur["peak_kib"] > base["peak_kib"] * (1 + memory_tolerance)
+            and cur["peak_kib"] - base["peak_kib"] > 64
+        ):
+            regressions.append(
+                f"{key}: peak memory {base['peak_kib']:.0f} KiB -> {cur['peak_kib']:.0f} KiB"
+            )
+    return regressions
+
+
+def _print_row(key: str, row: dict[str, Any]) -> None:
+    print(
+        f"{key:<36} {row['seconds'] * 1000:10.2f} ms {row['cues_per_s'] or 0:>12,} cues/s "
+        f"{row['peak_kib']:>12,.1f} KiB",
+        flush=True,
+    )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Corpus sizes in cues")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case (best is kept)")
+    parser.add_argument(
+        "--case", action="append", choices=[c.name for c in CASES], help="Run only this case (repeatable)"
+    )
+    parser.add_argument("--save", metavar="PATH", help="Write results as a JSON baseline")
+    parser.add_argument("--compare", metavar="PATH", help="Compare against a JSON baseline")
+    parser.add_argument("--time-tolerance", type=float, default=0.25, help="Allowed slowdown (0.25 = 25%%)")
+    parser.add_argument("--memory-tolerance", type=float, default=0.10, help="Allowed peak memory growth")
+    args = parser.parse_args()
+    if args.repeat < 1 or any(s < 1 for s in args.sizes):
+        parser.error("--repeat and --sizes must be >= 1")
+
+    current = run_cases(args.sizes, repeat=args.repeat, names=args.case, report=_print_row)
+
+    if args.save:
+        Path(args.save).write_text(json.dumps(current, indent=2) + "\n", encoding="utf-8")
+        print(f"Saved baseline to {args.save}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))
+        regressions = compare(
+            current,
+            baseline,
+            time_tolerance=args.time_tolerance,
+            memory_tolerance=args.memory_tolerance,
+        )
+        if regressions:
+            print(f"\n{len(regressions)} regression(s) against {args.compare}:", file=sys.stderr)
+            for line in regressions:
+                print(f"  {line}", file=sys.stderr)
+            return 1
+        print(f"\nNo regressions against {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
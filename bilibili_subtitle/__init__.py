@@ -6,8 +6,14 @@ Extract subtitles from Bilibili videos with ASR fallback for videos without subt
 
 from __future__ import annotations
 
+import importlib
+
+# ``typing`` itself is not free to import; type checkers understand this form.
+TYPE_CHECKING = False
+
 __version__ = "0.1.0"
 __all__ = [
+    "AsyncBBDownClient",
     "BBDownClient",
     "BBDownError",
     "VideoInfo",
@@ -25,16 +31,63 @@ __all__ = [
     "SubtitleOutput",
     "ExitCode",
     "build_cli_command",
+    "extract_video",
 ]
 
-from .bbdown_client import BBDownClient, BBDownError, SubtitleInfo, VideoInfo
-from .contract import (
-    ExitCode,
-    ExecutionResult,
-    SubtitleOutput,
-    build_cli_command,
-)
-from .detector import VideoMetadata, detect_subtitles
-from .errors import ErrorLevel, Remediation, SkillError
-from .preflight import PreflightReport, run_preflight
-from .url_parser import VideoRef, parse_bilibili_ref
+# Public names are resolved on first access (PEP 562) so that importing the
+# package, e.g. for ``python -m bilibili_subtitle --help``, does not pull in
+# asyncio, subprocess handling and the rest of the pipeline.
+_LAZY_ATTRS: dict[str, str] = {
+    "AsyncBBDownClient": "bbdown_client",
+    "BBDownClient": "bbdown_client",
+    "BBDownError": "bbdown_client",
+    "SubtitleInfo": "bbdown_client",
+    "VideoInfo": "bbdown_client",
+    "ExitCode": "contract",
+    "ExecutionResult": "contract",
+    "SubtitleOutput": "contract",
+    "build_cli_command": "contract",
+    "extract_video": "contract",
+    "VideoMetadata": "detector",
+    "detect_subtitles": "detector",
+    "ErrorLevel": "errors",
+    "Remediation": "errors",
+    "SkillError": "errors",
+    "PreflightReport": "preflight",
+    "run_preflight": "preflight",
+    "VideoRef": "url_parser",
+    "parse_bilibili_ref": "url_parser",
+}
+
+if TYPE_CHECKING:
+    from .bbdown_client import (
+        AsyncBBDownClient,
+        BBDownClient,
+        BBDownError,
+        SubtitleInfo,
+        VideoInfo,
+    )
+    from .contract import (
+        ExitCode,
+        ExecutionResult,
+        SubtitleOutput,
+        build_cli_command,
+        extract_video,
+    )
+    from .detector import VideoMetadata, detect_subtitles
+    from .errors import ErrorLevel, Remediation, SkillError
+    from .preflight import PreflightReport, run_preflight
+    from .url_parser import VideoRef, parse_bilibili_ref
+
+
+def __getattr__(name: str) -> object:
+    module = _LAZY_ATTRS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value  # later lookups bypass __getattr__
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
@@ -5,6 +5,7 @@ Usage:
     pixi run python -m bilibili_subtitle "BV1234567890"
     pixi run python -m bilibili_subtitle --check
     pixi run python -m bilibili_subtitle "URL" --skip-proofread --skip-summary
+    pixi run python -m bilibili_subtitle --batch ids.txt --workers 8
 """
 
 from __future__ import annotations
@@ -13,23 +14,21 @@ import argparse
 import json
 import sys
 from pathlib import Path
+from typing import TYPE_CHECKING, Any
 
 import re
 
-from .contract import ExitCode, ExecutionResult, SubtitleOutput
-from .errors import (
-    ASRConfigError,
-    BBDownAuthError,
-    BBDownDownloadError,
-    FFmpegNotFoundError,
-    InvalidURLError,
-    NoSubtitleError,
-    SkillError,
-    VideoNotFoundError,
-    exit_code_for_error,
-)
-from .preflight import run_preflight
-from .url_parser import parse_bilibili_ref
+# Everything else is imported where it is used, so ``--help`` and ``--check``
+# stay cheap for parent skills that spawn this CLI for every video.
+from ._defaults import DEFAULT_INFO_TTL_SECONDS
+
+if TYPE_CHECKING:
+    from .agents.transcribe_agent import TranscribeAgent
+    from .bbdown_client import BBDownClient
+    from .cache import TextMemo
+    from .contract import ExecutionResult
+    from .segment import Segment
+    from .tracing import Tracer
 
 
 _WINDOWS_ILLEGAL_RE = re.compile(r'[/\\:*?"<>|]')
@@ -54,6 +53,8 @@ Examples:
   %(prog)s "BV1234567890"
   %(prog)s "https://www.bilibili.com/video/BV1234567890"
   %(prog)s "BV1234567890" --skip-proofread --skip-summary
+  %(prog)s --batch ids.txt --workers 8 > results.jsonl
+  %(prog)s --serve 127.0.0.1:8765 --workers 8
   %(prog)s --check
         """,
     )
@@ -70,6 +71,32 @@ Examples:
         "--skip-summary", action="store_true", help="Skip AI summarization"
     )
     parser.add_argument("--cache-dir", default="./.cache", help="Cache directory")
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore and do not write cached pipeline stages or video info",
+    )
+    parser.add_argument(
+        "--info-cache-ttl",
+        type=float,
+        default=DEFAULT_INFO_TTL_SECONDS,
+        metavar="SECONDS",
+        help="Reuse cached BBDown video info and downloaded subtitles for this long (0 disables)",
+    )
+    parser.add_argument(
+        "--asr-chunk-seconds",
+        type=int,
+        default=None,
+        help="Split audio into N-second chunks and transcribe them concurrently",
+    )
+    parser.add_argument(
+        "--asr-workers", type=int, default=4, help="Concurrent ASR chunk requests"
+    )
+    parser.add_argument(
+        "--asr-stream",
+        action="store_true",
+        help="Decode audio to PCM on a pipe and send chunks from memory (no WAV files)",
+    )
     parser.add_argument("-v", "--verbose", action="store_true", help="Verbose output")
     parser.add_argument("--check", action="store_true", help="Run preflight checks")
     parser.add_argument("--check-json", action="store_true", help="Preflight as JSON")
@@ -77,42 +104,62 @@ Examples:
         "--skip-auth-check", action="store_true", help="Skip auth check"
     )
     parser.add_argument("--json-output", action="store_true", help="Output as JSON")
+    parser.add_argument(
+        "--batch",
+        metavar="FILE",
+        help="Read URLs/BV IDs (one per line) from FILE, or '-' for stdin; "
+        "prints one JSON result per line",
+    )
+    parser.add_argument(
+        "--serve",
+        nargs="?",
+        const="127.0.0.1:8765",
+        metavar="HOST:PORT",
+        help="Run as a resident HTTP service (POST /extract) on HOST:PORT "
+        "(default 127.0.0.1:8765); -j limits concurrent jobs",
+    )
+    parser.add_argument(
+        "--serve-allow-remote",
+        action="store_true",
+        help="Allow --serve on a non-loopback address (the service has no authentication)",
+    )
+    parser.add_argument(
+        "--trace-file",
+        metavar="PATH",
+        help="Write a Chrome trace (chrome://tracing / Perfetto) of the run to PATH",
+    )
+    parser.add_argument(
+        "-j", "--workers", type=int, default=4, help="Concurrent videos in batch/serve mode"
+    )
     parser.add_argument("--version", action="version", version="%(prog)s 0.2.0")
     return parser
 
 
-def run_extraction(
-    url: str,
-    output_dir: Path,
+def _acquire_segments(
+    client: BBDownClient,
+    canonical_url: str,
+    video_id: str,
     *,
-    output_lang: str = "zh",
-    skip_proofread: bool = False,
-    skip_summary: bool = False,
-    cache_dir: Path = Path("./.cache"),
-    verbose: bool = False,
-) -> ExecutionResult:
-    warnings: list[str] = []
-    errors: list[dict] = []
-
-    try:
-        ref = parse_bilibili_ref(url)
-        video_id = ref.video_id or "unknown"
-        canonical_url = ref.canonical_url or ref.input_value
-    except Exception:
-        raise InvalidURLError(url)
-
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    from .bbdown_client import BBDownClient
-    from .segment import Segment
-    from .subtitle_loader import load_segments_from_subtitle_file, check_title_relevance
-
-    client = BBDownClient()
-
-    if verbose:
-        print(f"[INFO] Processing: {video_id}")
-        print(f"[INFO] Output directory: {output_dir}")
+    cache_dir: Path,
+    transcriber: TranscribeAgent,
+    warnings: list[str],
+    verbose: bool,
+) -> tuple[str | None, list[Segment], str | None]:
+    """Fetch subtitles via BBDown, falling back to ASR.
+
+    Returns ``(title, segments, stage)`` where ``stage`` is ``"subtitle"`` or
+    ``"asr"`` when the result is safe to cache, and None otherwise (e.g. the
+    subtitle still looks like crosstalk after retries).
+    """
+    from .errors import (
+        ASRConfigError,
+        BBDownAuthError,
+        BBDownDownloadError,
+        FFmpegNotFoundError,
+        VideoNotFoundError,
+    )
+    from .subtitle_loader import load_segments_from_subtitle_file
+    from .tracing import span
 
     try:
         info = client.get_video_info(canonical_url, cache_dir)
@@ -124,21 +171,25 @@ def run_extraction(
         raise BBDownDownloadError(canonical_url, str(e))
 
     if verbose:
-        print(f"[INFO] Title: {info.title}")
-        print(f"[INFO] Has subtitle: {info.subtitle_info.has_subtitle}")
+        print(f"[INFO] Title: {info.title}", file=sys.stderr)
+        print(f"[INFO] Has subtitle: {info.subtitle_info.has_subtitle}", file=sys.stderr)
 
     segments: list[Segment] = []
+    stage: str | None = None
 
     if info.subtitle_files:
         max_crosstalk_retries = 2
         for attempt in range(max_crosstalk_retries + 1):
             sub_file = info.subtitle_files[0]
             if verbose:
-                print(f"[INFO] Loading subtitle: {sub_file.name}")
-            load_result = load_segments_from_subtitle_file(sub_file, title=info.title)
-            segments = load_result.segments
-
-            if load_result.relevant:
+                print(f"[INFO] Loading subtitle: {sub_file.name}", file=sys.stderr)
+            # One pass: relevance is checked while the cues are parsed.
+            with span("subtitle.load"):
+                loaded = load_segments_from_subtitle_file(sub_file, title=info.title)
+            segments = loaded.segments
+
+            if loaded.relevant:
+                stage = "subtitle"
                 break
 
             # Crosstalk detected — subtitle may belong to a different video
@@ -147,7 +198,7 @@ def run_extraction(
                     f"Crosstalk suspected (attempt {attempt + 1}), re-downloading..."
                 )
                 if verbose:
-                    print(f"[WARN] Subtitle may not match title, retrying ({attempt + 1}/{max_crosstalk_retries})")
+                    print(f"[WARN] Subtitle may not match title, retrying ({attempt + 1}/{max_crosstalk_retries})", file=sys.stderr)
                 # Delete stale file and re-fetch
                 sub_file.unlink(missing_ok=True)
                 try:
@@ -168,17 +219,15 @@ def run_extraction(
         if not shutil.which("ffmpeg"):
             raise FFmpegNotFoundError()
 
-        from .audio_extractor import extract_audio
-        from .agents.transcribe_agent import TranscribeAgent
-
         try:
-            audio_path = extract_audio(canonical_url, cache_dir)
+            audio_path = client.download_audio(canonical_url, cache_dir)
             if verbose:
-                print(f"[INFO] Audio extracted: {audio_path}")
+                print(f"[INFO] Audio extracted: {audio_path}", file=sys.stderr)
 
-            transcriber = TranscribeAgent(mode="qwen")
-            result = transcriber.transcribe(str(audio_path))
+            with span("asr.transcribe"):
+                result = transcriber.transcribe(str(audio_path))
             segments = result.segments
+            stage = "asr"
 
             if audio_path.exists():
                 audio_path.unlink()
@@ -187,90 +236,419 @@ def run_extraction(
                 raise ASRConfigError()
             raise
 
-    if not segments:
-        raise NoSubtitleError(video_id)
+    return info.title, segments, stage
 
-    if not skip_proofread:
-        import os
 
-        if not os.environ.get("ANTHROPIC_API_KEY"):
-            warnings.append("ANTHROPIC_API_KEY not set, skipping proofreading")
-        else:
-            if verbose:
-                print("[INFO] Proofreading...")
-            from .agents.proofread_agent import ProofreadAgent
+def run_extraction(
+    url: str,
+    output_dir: Path,
+    *,
+    output_lang: str = "zh",
+    skip_proofread: bool = False,
+    skip_summary: bool = False,
+    cache_dir: Path = Path("./.cache"),
+    verbose: bool = False,
+    client: BBDownClient | None = None,
+    memo: TextMemo | None = None,
+    use_cache: bool = True,
+    asr_chunk_seconds: int | None = None,
+    asr_workers: int = 4,
+    asr_stream: bool = False,
+    info_cache_ttl: float | None = DEFAULT_INFO_TTL_SECONDS,
+    tracer: Tracer | None = None,
+) -> ExecutionResult:
+    """Extract subtitles for ``url`` into ``output_dir``.
 
-            proofer = ProofreadAgent()
-            try:
-                segments = proofer.proofread_segments(segments)
-            except Exception as e:
-                warnings.append(f"Proofreading failed: {e}")
+    The run is traced with ``tracer`` (a fresh one by default) and its
+    per-stage wall times and counters are attached as ``metadata.timings``.
+    """
+    from .tracing import Tracer, span, tracing
 
-    from .renderers.srt import render_srt
-    from .renderers.vtt import render_vtt
-    from .renderers.markdown import render_transcript_markdown
+    tracer = tracer or Tracer()
+    with tracing(tracer), span("run_extraction"):
+        from .contract import ExitCode, ExecutionResult, SubtitleOutput
+        from .errors import InvalidURLError, NoSubtitleError
+        from .url_parser import parse_bilibili_ref
 
-    srt_content = render_srt(segments)
-    vtt_content = render_vtt(segments)
-    md_content = render_transcript_markdown(segments, title=info.title)
+        warnings: list[str] = []
+        errors: list[dict] = []
 
-    lang_suffix = "" if output_lang == "zh" else f".{output_lang}"
-    safe_title = _sanitize_filename(info.title or video_id)
-    srt_path = output_dir / f"{safe_title}{lang_suffix}.srt"
-    vtt_path = output_dir / f"{safe_title}{lang_suffix}.vtt"
-    md_path = output_dir / f"{safe_title}.transcript.md"
+        try:
+            ref = parse_bilibili_ref(url)
+            video_id = ref.video_id or "unknown"
+            canonical_url = ref.canonical_url or ref.input_value
+        except Exception:
+            raise InvalidURLError(url)
 
-    srt_path.write_text(srt_content, encoding="utf-8")
-    vtt_path.write_text(vtt_content, encoding="utf-8")
-    md_path.write_text(md_content, encoding="utf-8")
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        output_dir.mkdir(parents=True, exist_ok=True)
 
-    if verbose:
-        print(f"[INFO] Generated: {srt_path.name}")
-        print(f"[INFO] Generated: {md_path.name}")
+        from .agents.transcribe_agent import TranscribeAgent
+        from .bbdown_client import BBDownClient
+        from .cache import (
+            Cache,
+            ResponseCache,
+            hash_inputs,
+            segments_digest,
+            segments_from_json,
+            segments_to_json,
+        )
 
-    summary_json_path = None
-    summary_md_path = None
+        if client is None:
+            client = BBDownClient(info_cache_ttl=info_cache_ttl if use_cache else None)
+
+        if verbose:
+            print(f"[INFO] Processing: {video_id}", file=sys.stderr)
+            print(f"[INFO] Output directory: {output_dir}", file=sys.stderr)
+
+        # Stage cache: every entry is keyed by video ID, stage, model and input hash.
+        stage_cache = Cache(cache_dir / "stages") if use_cache else None
+        # Request-level LLM cache: a stage that failed part-way (e.g. one proofread
+        # window) only re-sends the requests that did not complete last time.
+        response_cache = ResponseCache(cache_dir / "llm") if use_cache else None
+        transcriber = TranscribeAgent(
+            mode="qwen",
+            chunk_seconds=asr_chunk_seconds,
+            max_workers=asr_workers,
+            stream=asr_stream,
+        )
+        source_stages = {
+            "subtitle": ("bbdown", hash_inputs(canonical_url)),
+            "asr": (
+                transcriber.model,
+                hash_inputs(canonical_url, transcriber.chunk_seconds, transcriber.overlap_seconds),
+            ),
+        }
+        # Downloaded subtitles expire with the video info, so corrected or
+        # re-uploaded subtitles are picked up; ASR output depends only on its inputs.
+        source_max_age: dict[str, float | None] = {"subtitle": info_cache_ttl or 0, "asr": None}
+
+        cached_source = None
+        if stage_cache is not None:
+            with span("cache.lookup"):
+                for stage, (model, input_hash) in source_stages.items():
+                    cached_source = stage_cache.load_stage(
+                        video_id,
+                        stage,
+                        model=model,
+                        input_hash=input_hash,
+                        max_age_seconds=source_max_age[stage],
+                    )
+                    if cached_source:
+                        if verbose:
+                            print(f"[INFO] Cache hit: {stage} segments", file=sys.stderr)
+                        break
+
+        if cached_source:
+            title = cached_source.get("title")
+            segments = segments_from_json(cached_source.get("segments")) or []
+        else:
+            with span("acquire"):
+                title, segments, source_stage = _acquire_segments(
+                    client,
+                    canonical_url,
+                    video_id,
+                    cache_dir=cache_dir,
+                    transcriber=transcriber,
+                    warnings=warnings,
+                    verbose=verbose,
+                )
+            if stage_cache is not None and segments and source_stage:
+                model, input_hash = source_stages[source_stage]
+                stage_cache.save_stage(
+                    video_id,
+                    source_stage,
+                    {"title": title, "segments": segments_to_json(segments)},
+                    model=model,
+                    input_hash=input_hash,
+                )
 
-    if not skip_summary:
-        import os
+        if not segments:
+            raise NoSubtitleError(video_id)
 
-        if not os.environ.get("ANTHROPIC_API_KEY"):
-            warnings.append("ANTHROPIC_API_KEY not set, skipping summarization")
-        else:
-            if verbose:
-                print("[INFO] Summarizing...")
-            from .agents.summarize_agent import SummarizeAgent
-
-            summarizer = SummarizeAgent()
-            try:
-                result = summarizer.summarize(segments, title=info.title)
-                summary_json_path = output_dir / f"{safe_title}.summary.json"
-                summary_md_path = output_dir / f"{safe_title}.summary.md"
-                summary_json_path.write_text(
-                    json.dumps(result.summary, ensure_ascii=False, indent=2),
-                    encoding="utf-8",
+        if not skip_proofread:
+            import os
+
+            if not os.environ.get("ANTHROPIC_API_KEY"):
+                warnings.append("ANTHROPIC_API_KEY not set, skipping proofreading")
+            else:
+                if verbose:
+                    print("[INFO] Proofreading...", file=sys.stderr)
+                from .agents.proofread_agent import ProofreadAgent
+
+                # Segment-level memo shared by all videos: re-used intros, outros
+                # and sponsor reads are proofread once.
+                if not use_cache:
+                    memo = None
+                elif memo is None:
+                    memo = _proofread_memo(cache_dir)
+                proofer = ProofreadAgent(response_cache=response_cache, memo=memo)
+                proofread_hash = hash_inputs(segments_digest(segments), proofer.prompt_hash)
+                cached = (
+                    stage_cache.load_stage_segments(
+                        video_id, "proofread", model=proofer.model, input_hash=proofread_hash
+                    )
+                    if stage_cache is not None
+                    else None
                 )
-                summary_md_path.write_text(result.raw_text or "", encoding="utf-8")
-            except Exception as e:
-                warnings.append(f"Summarization failed: {e}")
-
-    output = SubtitleOutput(
-        video_id=video_id,
-        title=info.title,
-        transcript_md=md_path,
-        srt_file=srt_path,
-        vtt_file=vtt_path,
-        summary_json=summary_json_path,
-        summary_md=summary_md_path,
-    )
+                if cached is not None:
+                    if verbose:
+                        print("[INFO] Cache hit: proofread segments", file=sys.stderr)
+                    segments = cached
+                else:
+                    try:
+                        with span("proofread", segments=len(segments)):
+                            proofread = proofer.proofread(segments)
+                    except Exception as e:
+                        warnings.append(f"Proofreading failed: {e}")
+                    else:
+                        segments = proofread.segments
+                        if proofread.unproofread:
+                            # Not cached: a rerun retries the missing segments.
+                            warnings.append(
+                                f"Proofreading returned no text for {len(proofread.unproofread)} "
+                                "segment(s); kept original"
+                            )
+                        elif stage_cache is not None:
+                            stage_cache.save_stage_segments(
+                                video_id,
+                                "proofread",
+                                segments,
+                                model=proofer.model,
+                                input_hash=proofread_hash,
+                            )
+
+        from .output_writer import atomic_outputs, write_texts_atomic
+        from .renderers.combined import write_all
+
+        lang_suffix = "" if output_lang == "zh" else f".{output_lang}"
+        safe_title = _sanitize_filename(title or video_id)
+        srt_path = output_dir / f"{safe_title}{lang_suffix}.srt"
+        vtt_path = output_dir / f"{safe_title}{lang_suffix}.vtt"
+        md_path = output_dir / f"{safe_title}.transcript.md"
+
+        # Stream all three formats in one pass into temp files, hashing as we go;
+        # they are renamed into place only once all of them are complete.
+        with span("render", segments=len(segments)):
+            with atomic_outputs(srt_path, vtt_path, md_path) as (srt_f, vtt_f, md_f):
+                write_all(segments, srt=srt_f, vtt=vtt_f, markdown=md_f, title=title)
+        written_files = {"srt": srt_f.written, "vtt": vtt_f.written, "transcript": md_f.written}
+
+        if verbose:
+            print(f"[INFO] Generated: {srt_path.name}", file=sys.stderr)
+            print(f"[INFO] Generated: {md_path.name}", file=sys.stderr)
+
+        summary_json_path = None
+        summary_md_path = None
+
+        if not skip_summary:
+            import os
+
+            if not os.environ.get("ANTHROPIC_API_KEY"):
+                warnings.append("ANTHROPIC_API_KEY not set, skipping summarization")
+            else:
+                if verbose:
+                    print("[INFO] Summarizing...", file=sys.stderr)
+                from .agents.summarize_agent import SummarizeAgent, SummarizeResult
+
+                summarizer = SummarizeAgent(response_cache=response_cache)
+                summary_hash = hash_inputs(segments_digest(segments), title, summarizer.prompt_hash)
+                try:
+                    cached = (
+                        stage_cache.load_stage(
+                            video_id, "summary", model=summarizer.model, input_hash=summary_hash
+                        )
+                        if stage_cache is not None
+                        else None
+                    )
+                    if cached is not None:
+                        if verbose:
+                            print("[INFO] Cache hit: summary", file=sys.stderr)
+                        result = SummarizeResult(
+                            summary=cached["summary"], raw_text=cached.get("raw_text")
+                        )
+                    else:
+                        with span("summarize"):
+                            result = summarizer.summarize(segments, title=title)
+                        if stage_cache is not None:
+                            stage_cache.save_stage(
+                                video_id,
+                                "summary",
+                                {"summary": result.summary, "raw_text": result.raw_text},
+                                model=summarizer.model,
+                                input_hash=summary_hash,
+                            )
+                except Exception as e:
+                    warnings.append(f"Summarization failed: {e}")
+                else:
+                    summary_json_path = output_dir / f"{safe_title}.summary.json"
+                    summary_md_path = output_dir / f"{safe_title}.summary.md"
+                    summary_files = write_texts_atomic(
+                        {
+                            summary_json_path: json.dumps(result.summary, ensure_ascii=False, indent=2),
+                            summary_md_path: result.raw_text or "",
+                        }
+                    )
+                    written_files["summary_json"] = summary_files[summary_json_path]
+                    written_files["summary_md"] = summary_files[summary_md_path]
+
+        output = SubtitleOutput(
+            video_id=video_id,
+            title=title,
+            transcript_md=md_path,
+            srt_file=srt_path,
+            vtt_file=vtt_path,
+            summary_json=summary_json_path,
+            summary_md=summary_md_path,
+        )
+
+        metadata: dict[str, Any] = {
+            "url": canonical_url,
+            "files": {kind: f.to_json() for kind, f in written_files.items() if f is not None},
+        }
+        if response_cache is not None and response_cache.hits + response_cache.misses:
+            metadata["llm_cache"] = response_cache.stats()
+
+        result = ExecutionResult(
+            exit_code=ExitCode.SUCCESS if not errors else ExitCode.PARTIAL_SUCCESS,
+            output=output,
+            errors=errors,
+            warnings=warnings,
+            metadata=metadata,
+        )
+    result.metadata["timings"] = tracer.timings()
+    return result
 
-    return ExecutionResult(
-        exit_code=ExitCode.SUCCESS if not errors else ExitCode.PARTIAL_SUCCESS,
-        output=output,
-        errors=errors,
-        warnings=warnings,
-        metadata={"url": canonical_url},
-    )
+
+def _proofread_memo(cache_dir: Path) -> TextMemo:
+    """The proofread memo under ``cache_dir``; create one per process and reuse it."""
+    from .cache import TextMemo
+
+    return TextMemo(cache_dir / "proofread_memo.jsonl")
+
+
+def run_batch_cli(args: argparse.Namespace) -> int:
+    from .batch import batch_exit_code, iter_batch_inputs, result_line, run_batch
+    from .bbdown_client import BBDownClient
+
+    output_dir = Path(args.output_dir)
+    cache_dir = Path(args.cache_dir)
+    try:
+        client = BBDownClient(
+            info_cache_ttl=None if args.no_cache else args.info_cache_ttl
+        )
+    except Exception as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    # One memo for the whole batch, so its file is read once.
+    memo = _proofread_memo(cache_dir)
+
+    def extract(url: str) -> ExecutionResult:
+        return run_extraction(
+            url,
+            output_dir,
+            output_lang=args.output_lang,
+            skip_proofread=args.skip_proofread,
+            skip_summary=args.skip_summary,
+            cache_dir=cache_dir,
+            verbose=args.verbose,
+            client=client,
+            memo=memo,
+            use_cache=not args.no_cache,
+            asr_chunk_seconds=args.asr_chunk_seconds,
+            asr_workers=args.asr_workers,
+            asr_stream=args.asr_stream,
+            info_cache_ttl=args.info_cache_ttl,
+        )
+
+    try:
+        stream = sys.stdin if args.batch == "-" else open(args.batch, encoding="utf-8")
+    except OSError as e:
+        print(f"❌ Cannot read batch file: {e}", file=sys.stderr)
+        return 1
+    total = succeeded = 0
+    try:
+        for result in run_batch(
+            iter_batch_inputs(stream), extract, max_workers=args.workers
+        ):
+            total += 1
+            succeeded += result.success
+            print(result_line(result), flush=True)
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    return batch_exit_code(succeeded, total)
+
+
+def run_serve_cli(args: argparse.Namespace) -> int:
+    from .bbdown_client import BBDownClient
+    from .server import is_loopback_host, parse_address, serve
+
+    try:
+        address = parse_address(args.serve)
+    except ValueError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    if not args.serve_allow_remote and not is_loopback_host(address[0]):
+        print(
+            f"❌ Refusing to serve on non-loopback address {address[0]!r}: the service has no "
+            "authentication. Pass --serve-allow-remote to override.",
+            file=sys.stderr,
+        )
+        return 1
+    try:
+        # One client for the life of the service: its video-info cache stays warm.
+        client = BBDownClient(
+            info_cache_ttl=None if args.no_cache else args.info_cache_ttl
+        )
+    except Exception as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+
+    defaults: dict[str, Any] = {
+        "output_dir": args.output_dir,
+        "output_lang": args.output_lang,
+        "skip_proofread": args.skip_proofread,
+        "skip_summary": args.skip_summary,
+        "cache_dir": args.cache_dir,
+        "use_cache": not args.no_cache,
+        "asr_chunk_seconds": args.asr_chunk_seconds,
+        "asr_workers": args.asr_workers,
+        "asr_stream": args.asr_stream,
+    }
+    default_cache_dir = Path(args.cache_dir)
+    memo = _proofread_memo(default_cache_dir)
+
+    def extract(url: str, options: dict[str, Any]) -> ExecutionResult:
+        opts = {**defaults, **options}
+        output_dir = Path(opts.pop("output_dir"))
+        cache_dir = Path(opts.pop("cache_dir"))
+        return run_extraction(
+            url,
+            output_dir,
+            cache_dir=cache_dir,
+            verbose=args.verbose,
+            client=client,
+            # A request with its own cache_dir gets a memo there instead.
+            memo=memo if cache_dir == default_cache_dir else None,
+            info_cache_ttl=args.info_cache_ttl,
+            **opts,
+        )
+
+    try:
+        serve(
+            address,
+            extract,
+            max_workers=args.workers,
+            verbose=args.verbose,
+            allow_remote=args.serve_allow_remote,
+        )
+    finally:
+        from .agents.clients import close_clients
+
+        close_clients()
+    return 0
 
 
 def main() -> int:
@@ -278,6 +656,8 @@ def main() -> int:
     args = parser.parse_args()
 
     if args.check or args.check_json:
+        from .preflight import run_preflight
+
         report = run_preflight(include_auth=not args.skip_auth_check)
         if args.check_json:
             print(report.to_json())
@@ -285,12 +665,43 @@ def main() -> int:
             report.print_report()
         return 0 if report.can_proceed else 1
 
+    if args.asr_chunk_seconds is not None and args.asr_chunk_seconds <= 0:
+        parser.error("--asr-chunk-seconds must be > 0")
+    if args.asr_workers < 1:
+        parser.error("--asr-workers must be >= 1")
+
+    # Reads the process umask at import: do it before any worker thread starts.
+    from . import output_writer  # noqa: F401
+
+    if args.serve:
+        if args.url or args.batch:
+            parser.error("--serve cannot be combined with a URL or --batch")
+        if args.workers < 1:
+            parser.error("--workers must be >= 1")
+        if args.trace_file:
+            parser.error("--trace-file is not supported with --serve")
+        return run_serve_cli(args)
+
+    if args.batch:
+        if args.url:
+            parser.error("URL and --batch are mutually exclusive")
+        if args.workers < 1:
+            parser.error("--workers must be >= 1")
+        if args.trace_file:
+            parser.error("--trace-file is not supported with --batch")
+        return run_batch_cli(args)
+
     if not args.url:
-        parser.error("URL is required (unless using --check)")
+        parser.error("URL is required (unless using --check or --batch)")
 
     output_dir = Path(args.output_dir)
     cache_dir = Path(args.cache_dir)
 
+    from .errors import SkillError, exit_code_for_error
+    from .tracing import Tracer
+
+    tracer = Tracer()
+
     try:
         result = run_extraction(
             args.url,
@@ -300,6 +711,12 @@ def main() -> int:
             skip_summary=args.skip_summary,
             cache_dir=cache_dir,
             verbose=args.verbose,
+            use_cache=not args.no_cache,
+            asr_chunk_seconds=args.asr_chunk_seconds,
+            asr_workers=args.asr_workers,
+            asr_stream=args.asr_stream,
+            info_cache_ttl=args.info_cache_ttl,
+            tracer=tracer,
         )
 
         if args.json_output:
@@ -346,6 +763,10 @@ def main() -> int:
             print(f"❌ Unexpected error: {e}", file=sys.stderr)
         return 1
 
+    finally:
+        if args.trace_file:
+            tracer.write_chrome_trace(args.trace_file)
+
 
 if __name__ == "__main__":
     sys.exit(main())
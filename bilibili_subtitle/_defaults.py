@@ -0,0 +1,4 @@
+"""Defaults shared by the CLI and the library, kept import-free for fast CLI startup."""
+
+# How long cached BBDown video info stays valid (see bbdown_client.VideoInfoCache).
+DEFAULT_INFO_TTL_SECONDS = 24 * 3600
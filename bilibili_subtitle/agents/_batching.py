@@ -0,0 +1,80 @@
+"""Token-budgeted batching helpers shared by the LLM agents."""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable, Sequence
+from typing import TypeVar
+
+from ..tracing import count
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count: ~1 token per CJK character, ~4 characters per token otherwise."""
+    cjk = sum(1 for c in text if "\u3000" <= c <= "\u9fff" or "\uff00" <= c <= "\uffef")
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def pack_by_budget(costs: Sequence[int], budget: int) -> list[range]:
+    """Split positions ``0..len(costs)`` into contiguous ranges whose costs sum to <= budget.
+
+    An item that alone exceeds the budget gets a range of its own.
+    """
+    if budget <= 0:
+        raise ValueError("budget must be > 0.")
+    ranges: list[range] = []
+    start = 0
+    total = 0
+    for i, cost in enumerate(costs):
+        if i > start and total + cost > budget:
+            ranges.append(range(start, i))
+            start, total = i, 0
+        total += cost
+    if start < len(costs):
+        ranges.append(range(start, len(costs)))
+    return ranges
+
+
+def is_retryable_api_error(exc: BaseException) -> bool:
+    """True for rate-limit (429) and overloaded (529) API errors."""
+    status = getattr(exc, "status_code", None)
+    return status in (429, 529) or type(exc).__name__ in ("RateLimitError", "OverloadedError")
+
+
+def _retry_after_seconds(exc: BaseException) -> float | None:
+    response = getattr(exc, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        return float(headers.get("retry-after"))
+    except (TypeError, ValueError):
+        return None
+
+
+def call_with_retry(
+    fn: Callable[[], T],
+    *,
+    max_retries: int = 4,
+    retry_delay: float = 1.0,
+) -> T:
+    """Call ``fn``, retrying rate-limit errors with exponential backoff (or Retry-After)."""
+    for attempt in range(max_retries + 1):
+        try:
+            return fn()
+        except Exception as e:
+            if attempt == max_retries or not is_retryable_api_error(e):
+                raise
+            delay = _retry_after_seconds(e) or retry_delay * (2 ** attempt)
+            logger.warning(
+                "API rate limited (attempt %d/%d), retrying in %.1fs",
+                attempt + 1, max_retries, delay,
+            )
+            count("llm.retries")
+            time.sleep(delay)
+    raise AssertionError("unreachable")  # pragma: no cover
@@ -0,0 +1,147 @@
+"""
+Shared Anthropic clients for the LLM agents.
+
+Clients are created once per (API key, base URL) and reused by every agent
+and every run in the process (batch mode, ``--serve``), so calls share one
+keep-alive connection pool instead of paying TLS setup each time. HTTP/2 is
+used when the ``h2`` package is installed.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections.abc import Callable
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Any
+
+from .. import tracing
+from ._batching import call_with_retry
+
+if TYPE_CHECKING:
+    from ..cache import ResponseCache
+
+# Keep idle connections longer than httpx's 5 s default: batch runs pause
+# between LLM stages (rendering, BBDown) for longer than that.
+_KEEPALIVE_EXPIRY_SECONDS = 60.0
+_MAX_CONNECTIONS = 64
+
+_lock = threading.Lock()
+_clients: dict[tuple[bool, str, str | None], Any] = {}
+
+
+def _resolve_api_key(api_key: str | None) -> str:
+    api_key = api_key or os.environ.get("ANTHROPIC_API_KEY")
+    if not api_key:
+        raise RuntimeError("Missing ANTHROPIC_API_KEY (or pass api_key=...).")
+    return api_key
+
+
+def _create_client(api_key: str, base_url: str | None, *, is_async: bool) -> Any:
+    try:
+        import anthropic  # type: ignore[import-not-found]
+        import httpx
+    except Exception as e:  # pragma: no cover
+        raise RuntimeError("anthropic package is required for the LLM agents. Install: pip install anthropic") from e
+
+    http_options: dict[str, Any] = {
+        "limits": httpx.Limits(
+            max_connections=_MAX_CONNECTIONS,
+            max_keepalive_connections=_MAX_CONNECTIONS,
+            keepalive_expiry=_KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        "http2": find_spec("h2") is not None,
+    }
+    if is_async:
+        return anthropic.AsyncAnthropic(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=anthropic.DefaultAsyncHttpxClient(**http_options),
+        )
+    return anthropic.Anthropic(
+        api_key=api_key,
+        base_url=base_url,
+        http_client=anthropic.DefaultHttpxClient(**http_options),
+    )
+
+
+def _get(api_key: str | None, base_url: str | None, *, is_async: bool) -> Any:
+    key = (is_async, _resolve_api_key(api_key), base_url or os.environ.get("ANTHROPIC_BASE_URL"))
+    with _lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _clients[key] = _create_client(key[1], key[2], is_async=is_async)
+        return client
+
+
+def get_anthropic_client(*, api_key: str | None = None, base_url: str | None = None) -> Any:
+    """Shared ``Anthropic`` client for this key and base URL (``$ANTHROPIC_*`` by default)."""
+    return _get(api_key, base_url, is_async=False)
+
+
+def get_async_anthropic_client(*, api_key: str | None = None, base_url: str | None = None) -> Any:
+    """Shared ``AsyncAnthropic`` client, for dispatching requests from one event loop."""
+    return _get(api_key, base_url, is_async=True)
+
+
+def close_clients() -> None:
+    """Close and forget all shared sync clients (async ones are just dropped)."""
+    with _lock:
+        clients = list(_clients.items())
+        _clients.clear()
+    for (is_async, _, _), client in clients:
+        if not is_async:
+            client.close()
+
+
+def message_text(msg: Any) -> str:
+    """Concatenate the text blocks of a Messages API response."""
+    return "".join(block.text for block in msg.content if getattr(block, "type", None) == "text")
+
+
+def complete(
+    client: Any,
+    *,
+    model: str,
+    system: str,
+    user: str,
+    usage_prefix: str,
+    max_tokens: int = 4096,
+    cache: ResponseCache | None = None,
+    validate: Callable[[str], bool] | None = None,
+) -> str:
+    """Send one single-turn request (retrying rate limits) and return its text.
+
+    Token usage is recorded on the active tracer under ``usage_prefix``.
+    With a ``cache``, an identical earlier request is answered from disk.
+    Only replies that ``validate`` accepts (e.g. ones the caller can parse)
+    are cached or served from the cache; replies cut off at ``max_tokens``
+    are never cached. Anything else is re-sent on the next run.
+    """
+    key = None
+    if cache is not None:
+        key = cache.key(model=model, system=system, user=user, max_tokens=max_tokens)
+        cached = cache.get(key)
+        if cached is not None and (validate is None or validate(cached)):
+            tracing.count(f"{usage_prefix}.cache_hits")
+            return cached
+        tracing.count(f"{usage_prefix}.cache_misses")
+
+    msg = call_with_retry(
+        lambda: client.messages.create(
+            model=model,
+            max_tokens=max_tokens,
+            system=system,
+            messages=[{"role": "user", "content": user}],
+        )
+    )
+    tracing.record_llm_usage(usage_prefix, msg)
+    text = message_text(msg)
+    if (
+        key is not None
+        and getattr(msg, "stop_reason", None) != "max_tokens"
+        and (validate is None or validate(text))
+    ):
+        cache.put(key, text)
+    return text
+
@@ -1,15 +1,35 @@
 from __future__ import annotations
 
 import json
-import os
-from dataclasses import dataclass
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from typing import Any, Literal
 
+from .. import tracing
+from ..cache import ResponseCache, TextMemo, hash_inputs
 from ..segment import Segment
+from ._batching import estimate_tokens, pack_by_budget
+from .clients import complete, get_anthropic_client
 
+logger = logging.getLogger(__name__)
 
 Mode = Literal["noop", "anthropic"]
 
+# JSON framing per segment ({"index": N, "text": ...}) on both input and output.
+_PER_SEGMENT_OVERHEAD = 12
+
+_SYSTEM_PROMPT = (
+    "You are a subtitle proofreader for Chinese content.\n"
+    "Rules:\n"
+    "- Only fix typos, punctuation, spacing, and obvious ASR errors.\n"
+    "- Keep proper nouns consistent.\n"
+    "- Do NOT add, remove, merge or split segments.\n"
+    "- context_before/context_after are for reference only; do NOT return them.\n"
+    "- Output ONLY a JSON array with one item per entry in \"segments\": "
+    "{\"index\": number, \"text\": string}.\n"
+)
+
 
 def diff_segments(before: list[Segment], after: list[Segment]) -> list[dict[str, Any]]:
     if len(before) != len(after):
@@ -39,10 +59,20 @@ def _extract_json_array(text: str) -> Any:
     return json.loads(text[start : end + 1])
 
 
+def _is_json_array(text: str) -> bool:
+    try:
+        return isinstance(_extract_json_array(text), list)
+    except ValueError:
+        return False
+
+
 @dataclass(frozen=True, slots=True)
 class ProofreadResult:
     segments: list[Segment]
     changes: list[dict[str, Any]]
+    # Indices the model never returned, even after re-requests; they keep
+    # their original text.
+    unproofread: list[int] = field(default_factory=list)
 
 
 class ProofreadAgent:
@@ -52,78 +82,191 @@ class ProofreadAgent:
         mode: Mode = "anthropic",
         model: str = "claude-3-5-sonnet-latest",
         api_key: str | None = None,
+        client: Any | None = None,
+        response_cache: ResponseCache | None = None,
+        memo: TextMemo | None = None,
+        max_window_tokens: int = 1500,
+        context_segments: int = 2,
+        max_workers: int = 4,
+        max_rounds: int = 3,
     ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1.")
+        if max_rounds < 1:
+            raise ValueError("max_rounds must be >= 1.")
         self._mode = mode
         self._model = model
         self._api_key = api_key
+        self._injected_client = client
+        self._response_cache = response_cache
+        self._memo = memo
+        self._max_window_tokens = max_window_tokens
+        self._context_segments = context_segments
+        self._max_workers = max_workers
+        self._max_rounds = max_rounds
+
+    @property
+    def model(self) -> str:
+        return self._model
+
+    @property
+    def prompt_hash(self) -> str:
+        """Hash of the system prompt, for cache keys that must change with it."""
+        return hash_inputs(_SYSTEM_PROMPT)
 
     def proofread_segments(self, segments: list[Segment]) -> list[Segment]:
         return self.proofread(segments).segments
 
     def proofread(self, segments: list[Segment]) -> ProofreadResult:
-        if self._mode == "noop":
+        """Proofread in token-budgeted windows, dispatched concurrently, stitched by index.
+
+        With a ``memo``, segments already proofread with the same text and
+        neighbouring context are filled in from it; only the rest are sent.
+        Indices the model leaves out are re-requested (up to ``max_rounds``
+        passes in total); any still missing are listed in ``unproofread``.
+        """
+        if self._mode == "noop" or not segments:
             return ProofreadResult(segments=segments, changes=[])
 
-        api_key = self._api_key or os.environ.get("ANTHROPIC_API_KEY")
-        if not api_key:
-            raise RuntimeError("Missing ANTHROPIC_API_KEY (or pass api_key=...).")
+        corrected_text_by_index: dict[int, str] = {}
+        keys: list[str] = []
+        todo = list(range(len(segments)))
+        if self._memo is not None:
+            keys = self._memo_keys(segments)
+            todo = []
+            for i, key in enumerate(keys):
+                text = self._memo.get(key)
+                if text is None:
+                    todo.append(i)
+                else:
+                    corrected_text_by_index[i] = text
+            tracing.count("proofread.memo_hits", len(segments) - len(todo))
+            tracing.count("proofread.memo_misses", len(todo))
+
+        costs = [estimate_tokens(s.text) + _PER_SEGMENT_OVERHEAD for s in segments]
+        if todo:
+            client = self._client()
+            with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+                for round_no in range(self._max_rounds):
+                    if not todo:
+                        break
+                    if round_no:
+                        logger.info("Re-requesting %d unproofread segment(s)", len(todo))
+                        tracing.count("proofread.rerequested", len(todo))
+                    # A re-sent window may be identical to the first one (the
+                    # model returned nothing); skip the response cache then.
+                    use_cache = round_no == 0
+                    windows = self._plan_windows(costs, todo)
+                    for part in pool.map(
+                        tracing.propagate(
+                            lambda w: self._proofread_window(client, segments, w, use_cache=use_cache)
+                        ),
+                        windows,
+                    ):
+                        corrected_text_by_index.update(part)
+                        if self._memo is not None:
+                            self._memo.put_many({keys[i]: text for i, text in part.items()})
+                    todo = [i for i in todo if i not in corrected_text_by_index]
 
-        try:
-            from anthropic import Anthropic  # type: ignore[import-not-found]
-        except Exception as e:  # pragma: no cover
-            raise RuntimeError("anthropic package is required for proofreading. Install: pip install anthropic") from e
+        if todo:
+            logger.warning(
+                "Proofreading returned no text for %d segment(s) after %d round(s); kept original",
+                len(todo),
+                self._max_rounds,
+            )
+
+        out: list[Segment] = []
+        for i, seg in enumerate(segments):
+            text = corrected_text_by_index.get(i, seg.text)
+            out.append(Segment(start_ms=seg.start_ms, end_ms=seg.end_ms, text=text))
 
-        client = Anthropic(api_key=api_key)
+        return ProofreadResult(segments=out, changes=diff_segments(segments, out), unproofread=todo)
 
-        payload = [
-            {"index": i, "start_ms": s.start_ms, "end_ms": s.end_ms, "text": s.text}
-            for i, s in enumerate(segments)
+    def _plan_windows(self, costs: list[int], indices: list[int]) -> list[range]:
+        """Token-budgeted windows over ``indices``.
+
+        Windows never span a skipped index (memo hit or already proofread),
+        so each one is a contiguous run whose context is its real neighbours.
+        """
+        return [
+            range(run.start + w.start, run.start + w.stop)
+            for run in _contiguous_runs(indices)
+            for w in pack_by_budget(costs[run.start : run.stop], self._max_window_tokens)
         ]
 
-        system = (
-            "You are a subtitle proofreader for Chinese content.\n"
-            "Rules:\n"
-            "- Do NOT change start_ms/end_ms.\n"
-            "- Only fix typos, punctuation, spacing, and obvious ASR errors.\n"
-            "- Keep proper nouns consistent.\n"
-            "- Do NOT add or remove segments.\n"
-            "- Output ONLY a JSON array, each item: {\"index\": number, \"text\": string}.\n"
-        )
+    def _memo_keys(self, segments: list[Segment]) -> list[str]:
+        """One key per segment: model, prompt, normalized text and its context."""
+        ctx = self._context_segments
+        texts = [_normalize(s.text) for s in segments]
+        prompt = self.prompt_hash
+        return [
+            hash_inputs(self._model, prompt, texts[max(0, i - ctx) : i], text, texts[i + 1 : i + 1 + ctx])
+            for i, text in enumerate(texts)
+        ]
+
+    def _client(self) -> Any:
+        if self._injected_client is not None:
+            return self._injected_client
+        return get_anthropic_client(api_key=self._api_key)
+
+    def _proofread_window(
+        self, client: Any, segments: list[Segment], window: range, *, use_cache: bool = True
+    ) -> dict[int, str]:
+        ctx = self._context_segments
+        before = range(max(0, window.start - ctx), window.start)
+        after = range(window.stop, min(len(segments), window.stop + ctx))
+
+        payload = {
+            "context_before": [{"index": i, "text": segments[i].text} for i in before],
+            "segments": [{"index": i, "text": segments[i].text} for i in window],
+            "context_after": [{"index": i, "text": segments[i].text} for i in after],
+        }
 
         user = (
             "Proofread these subtitle segments. Return corrected text per index as JSON array.\n\n"
             f"{json.dumps(payload, ensure_ascii=False)}"
         )
 
-        msg = client.messages.create(
-            model=self._model,
-            max_tokens=4096,
-            system=system,
-            messages=[{"role": "user", "content": user}],
-        )
-
-        content = ""
-        for block in msg.content:
-            if getattr(block, "type", None) == "text":
-                content += block.text
+        with tracing.span("proofread.window", segments=len(window)):
+            content = complete(
+                client,
+                model=self._model,
+                system=_SYSTEM_PROMPT,
+                user=user,
+                usage_prefix="llm.proofread",
+                cache=self._response_cache if use_cache else None,
+                validate=_is_json_array,
+            )
 
         items = _extract_json_array(content)
         if not isinstance(items, list):
             raise ValueError("Model output was not a JSON array.")
 
-        corrected_text_by_index: dict[int, str] = {}
+        corrected: dict[int, str] = {}
         for item in items:
             if not isinstance(item, dict):
                 continue
             idx = item.get("index")
             text = item.get("text")
-            if isinstance(idx, int) and isinstance(text, str):
-                corrected_text_by_index[idx] = text
+            if isinstance(idx, int) and idx in window and isinstance(text, str) and text.strip():
+                corrected[idx] = text
+        return corrected
 
-        out: list[Segment] = []
-        for i, seg in enumerate(segments):
-            text = corrected_text_by_index.get(i, seg.text)
-            out.append(Segment(start_ms=seg.start_ms, end_ms=seg.end_ms, text=text))
 
-        return ProofreadResult(segments=out, changes=diff_segments(segments, out))
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
+
 
+def _contiguous_runs(indices: list[int]) -> list[range]:
+    """Sorted indices -> maximal runs of consecutive values."""
+    runs: list[range] = []
+    start = prev = None
+    for i in indices:
+        if prev is None or i != prev + 1:
+            if start is not None:
+                runs.append(range(start, prev + 1))
+            start = i
+        prev = i
+    if start is not None:
+        runs.append(range(start, prev + 1))
+    return runs
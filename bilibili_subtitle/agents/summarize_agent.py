@@ -1,16 +1,49 @@
 from __future__ import annotations
 
 import json
-import os
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Literal
 
+from .. import tracing
+from ..cache import hash_inputs
 from ..segment import Segment
+from ._batching import estimate_tokens, pack_by_budget
+from .clients import complete, get_anthropic_client
+
+if TYPE_CHECKING:
+    from ..cache import ResponseCache
 
 
 Mode = Literal["noop", "anthropic"]
 
+# JSON framing per transcript line ([index, text] or {"index", "start_ms", ...}).
+_PER_SEGMENT_OVERHEAD = 16
+
+_SYSTEM_PROMPT = (
+    "You summarize transcripts into a structured JSON object.\n"
+    "Return ONLY valid JSON matching the provided JSON Schema.\n"
+    "Include timestamp references using {start_ms,end_ms,segment_indices[]}.\n"
+)
+
+_SECTION_SYSTEM_PROMPT = (
+    "You summarize one section of a longer transcript.\n"
+    "Each transcript line is [index, text]; indices are global, cite them as given.\n"
+    "Return ONLY a JSON object:\n"
+    '{"key_points": [string], '
+    '"outline": [{"title": string, "segment_indices": [int]}], '
+    '"entities": [{"name": string, "type": string, "description": string}], '
+    '"timestamps": [{"segment_indices": [int], "note": string}]}\n'
+)
+
+_REDUCE_SYSTEM_PROMPT = (
+    "You merge section summaries of one transcript into a single structured JSON object.\n"
+    "Return ONLY valid JSON matching the provided JSON Schema.\n"
+    "Deduplicate key points and entities; keep the outline in time order.\n"
+    "Reuse the sections' segment_indices and times; do not invent new indices.\n"
+)
+
 
 def default_summary() -> dict[str, Any]:
     return {
@@ -39,67 +72,237 @@ class SummarizeAgent:
         mode: Mode = "anthropic",
         model: str = "claude-3-5-sonnet-latest",
         api_key: str | None = None,
+        client: Any | None = None,
+        response_cache: ResponseCache | None = None,
+        map_reduce_threshold_tokens: int = 12000,
+        section_tokens: int = 6000,
+        max_workers: int = 4,
     ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1.")
         self._mode = mode
         self._model = model
         self._api_key = api_key
+        self._injected_client = client
+        self._response_cache = response_cache
+        self._map_reduce_threshold_tokens = map_reduce_threshold_tokens
+        self._section_tokens = section_tokens
+        self._max_workers = max_workers
+
+    @property
+    def model(self) -> str:
+        return self._model
+
+    @property
+    def prompt_hash(self) -> str:
+        """Hash of the system prompts, for cache keys that must change with them."""
+        return hash_inputs(_SYSTEM_PROMPT, _SECTION_SYSTEM_PROMPT, _REDUCE_SYSTEM_PROMPT)
 
     def summarize(self, segments: list[Segment], *, title: str | None = None) -> SummarizeResult:
+        """Summarize in one call, or map-reduce over sections for long transcripts."""
         if self._mode == "noop":
             return SummarizeResult(summary=default_summary(), raw_text=None)
 
-        api_key = self._api_key or os.environ.get("ANTHROPIC_API_KEY")
-        if not api_key:
-            raise RuntimeError("Missing ANTHROPIC_API_KEY (or pass api_key=...).")
-
-        try:
-            from anthropic import Anthropic  # type: ignore[import-not-found]
-        except Exception as e:  # pragma: no cover
-            raise RuntimeError("anthropic package is required for summarization. Install: pip install anthropic") from e
-
-        client = Anthropic(api_key=api_key)
+        client = self._client()
         schema = load_summary_schema()
 
+        costs = [estimate_tokens(s.text) + _PER_SEGMENT_OVERHEAD for s in segments]
+        if sum(costs) > self._map_reduce_threshold_tokens:
+            return self._summarize_map_reduce(client, schema, segments, costs, title)
+
         transcript = [
             {"index": i, "start_ms": s.start_ms, "end_ms": s.end_ms, "text": s.text}
             for i, s in enumerate(segments)
         ]
 
-        system = (
-            "You summarize transcripts into a structured JSON object.\n"
-            "Return ONLY valid JSON matching the provided JSON Schema.\n"
-            "Include timestamp references using {start_ms,end_ms,segment_indices[]}.\n"
-        )
         user = {
             "title": title,
             "schema": schema,
             "transcript": transcript,
         }
 
-        msg = client.messages.create(
-            model=self._model,
-            max_tokens=4096,
-            system=system,
-            messages=[{"role": "user", "content": json.dumps(user, ensure_ascii=False)}],
-        )
-
-        content = ""
-        for block in msg.content:
-            if getattr(block, "type", None) == "text":
-                content += block.text
-
-        text = content.strip()
-        try:
-            summary = json.loads(text)
-        except json.JSONDecodeError:
-            start = text.find("{")
-            end = text.rfind("}")
-            if start == -1 or end == -1 or end <= start:
-                raise ValueError("Model output did not contain a JSON object.")
-            summary = json.loads(text[start : end + 1])
-
-        if not isinstance(summary, dict):
-            raise ValueError("Model output was not a JSON object.")
+        text = self._complete(client, _SYSTEM_PROMPT, json.dumps(user, ensure_ascii=False))
+        return SummarizeResult(summary=_extract_json_object(text), raw_text=text)
 
+    def _client(self) -> Any:
+        if self._injected_client is not None:
+            return self._injected_client
+        return get_anthropic_client(api_key=self._api_key)
+
+    def _complete(self, client: Any, system: str, user: str) -> str:
+        with tracing.span("summarize.call"):
+            content = complete(
+                client,
+                model=self._model,
+                system=system,
+                user=user,
+                usage_prefix="llm.summarize",
+                cache=self._response_cache,
+                validate=_is_json_object,
+            )
+        return content.strip()
+
+    def _summarize_map_reduce(
+        self,
+        client: Any,
+        schema: dict[str, Any],
+        segments: list[Segment],
+        costs: list[int],
+        title: str | None,
+    ) -> SummarizeResult:
+        """Summarize token-budgeted time sections in parallel, then reduce.
+
+        Sections cite global segment indices only; start_ms/end_ms are derived
+        from those indices locally, so references stay correct across sections.
+        """
+        sections = pack_by_budget(costs, self._section_tokens)
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            partials = list(
+                pool.map(
+                    tracing.propagate(lambda r: self._summarize_section(client, segments, r, title)),
+                    sections,
+                )
+            )
+
+        user = {"title": title, "schema": schema, "sections": partials}
+        text = self._complete(client, _REDUCE_SYSTEM_PROMPT, json.dumps(user, ensure_ascii=False))
+        summary = fix_summary_references(_extract_json_object(text), segments)
         return SummarizeResult(summary=summary, raw_text=text)
 
+    def _summarize_section(
+        self, client: Any, segments: list[Segment], section: range, title: str | None
+    ) -> dict[str, Any]:
+        user = {
+            "title": title,
+            "section": {
+                "start_ms": segments[section.start].start_ms,
+                "end_ms": segments[section.stop - 1].end_ms,
+            },
+            "transcript": [[i, segments[i].text] for i in section],
+        }
+        text = self._complete(client, _SECTION_SYSTEM_PROMPT, json.dumps(user, ensure_ascii=False))
+        partial = _extract_json_object(text)
+
+        # Resolve index references to times before the reduce step sees them.
+        outline = []
+        for item in partial.get("outline") or []:
+            span = _span_for_indices(item, segments, section)
+            if isinstance(item, dict) and span:
+                outline.append({"title": str(item.get("title", "")), **span})
+        timestamps = []
+        for item in partial.get("timestamps") or []:
+            span = _span_for_indices(item, segments, section)
+            if isinstance(item, dict) and span:
+                timestamps.append({**span, "note": str(item.get("note", ""))})
+        return {
+            "start_ms": segments[section.start].start_ms,
+            "end_ms": segments[section.stop - 1].end_ms,
+            "key_points": _clean_key_points(partial.get("key_points")),
+            "outline": outline,
+            "entities": _clean_entities(partial.get("entities")),
+            "timestamps": timestamps,
+        }
+
+
+def _extract_json_object(text: str) -> dict[str, Any]:
+    try:
+        summary = json.loads(text)
+    except json.JSONDecodeError:
+        start = text.find("{")
+        end = text.rfind("}")
+        if start == -1 or end == -1 or end <= start:
+            raise ValueError("Model output did not contain a JSON object.")
+        summary = json.loads(text[start : end + 1])
+
+    if not isinstance(summary, dict):
+        raise ValueError("Model output was not a JSON object.")
+    return summary
+
+
+def _clean_key_points(items: Any) -> list[str]:
+    """Keep the string key points; the schema allows nothing else."""
+    return [p for p in items if isinstance(p, str)] if isinstance(items, list) else []
+
+
+def _clean_entities(items: Any) -> list[dict[str, str]]:
+    """Rebuild entities as ``{name, type[, description]}``; drop ones without a name or type."""
+    entities = []
+    for item in items if isinstance(items, list) else []:
+        if not isinstance(item, dict):
+            continue
+        if not isinstance(item.get("name"), str) or not isinstance(item.get("type"), str):
+            continue
+        entity = {"name": item["name"], "type": item["type"]}
+        if isinstance(item.get("description"), str):
+            entity["description"] = item["description"]
+        entities.append(entity)
+    return entities
+
+
+def _is_json_object(text: str) -> bool:
+    try:
+        _extract_json_object(text)
+    except ValueError:
+        return False
+    return True
+
+
+def _span_for_indices(
+    item: Any, segments: list[Segment], allowed: range | None = None
+) -> dict[str, Any] | None:
+    """Return {start_ms, end_ms, segment_indices} for an item's valid indices, or None."""
+    if not isinstance(item, dict):
+        return None
+    valid = allowed if allowed is not None else range(len(segments))
+    raw = item.get("segment_indices")
+    indices = sorted({i for i in raw if isinstance(i, int) and i in valid}) if isinstance(raw, list) else []
+    if not indices:
+        return None
+    return {
+        "start_ms": segments[indices[0]].start_ms,
+        "end_ms": segments[indices[-1]].end_ms,
+        "segment_indices": indices,
+    }
+
+
+def fix_summary_references(summary: dict[str, Any], segments: list[Segment]) -> dict[str, Any]:
+    """Make ``timestamps`` and ``outline`` agree with the global segment numbering.
+
+    Out-of-range indices are dropped and start_ms/end_ms are recomputed from
+    the remaining indices; timestamp entries with no valid index are removed.
+    Outline items are rebuilt as ``{title, start_ms, end_ms}`` (the schema
+    allows no other keys), with times taken from their ``segment_indices``
+    when present, else clamped to the transcript duration. ``key_points`` and
+    ``entities`` are cut down to what the summary schema allows, and any other
+    top-level keys are dropped.
+    """
+    timestamps = []
+    for item in summary.get("timestamps") or []:
+        span = _span_for_indices(item, segments)
+        if span is None:
+            continue
+        fixed = {**span}
+        if isinstance(item.get("note"), str):
+            fixed["note"] = item["note"]
+        timestamps.append(fixed)
+
+    duration_ms = segments[-1].end_ms if segments else 0
+    outline = []
+    for item in summary.get("outline") or []:
+        if not isinstance(item, dict):
+            continue
+        span = _span_for_indices(item, segments)
+        if span is not None:
+            start_ms, end_ms = span["start_ms"], span["end_ms"]
+        elif isinstance(item.get("start_ms"), int) and isinstance(item.get("end_ms"), int):
+            start_ms = min(max(item["start_ms"], 0), duration_ms)
+            end_ms = min(max(item["end_ms"], 0), duration_ms)
+        else:
+            continue
+        outline.append({"title": str(item.get("title", "")), "start_ms": start_ms, "end_ms": end_ms})
+    return {
+        "key_points": _clean_key_points(summary.get("key_points")),
+        "outline": outline,
+        "entities": _clean_entities(summary.get("entities")),
+        "timestamps": timestamps,
+    }
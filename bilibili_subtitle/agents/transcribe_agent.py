@@ -1,16 +1,26 @@
 from __future__ import annotations
 
+import base64
+import difflib
 import os
 import subprocess
 import tempfile
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from collections.abc import Callable
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Literal
 
+from .. import tracing
 from ..segment import Segment
 
+if TYPE_CHECKING:
+    from ..chunker import AudioChunk, PcmWindow
+
 Mode = Literal["noop", "openai", "qwen"]
 
+DEFAULT_CHUNK_SECONDS = 60
+
 
 @dataclass(frozen=True, slots=True)
 class TranscribeResult:
@@ -18,6 +28,100 @@ class TranscribeResult:
     raw: Any | None = None
 
 
+SegmentsCallback = Callable[[list[Segment]], None]
+
+# Shortest shared run of characters accepted as the same speech in an overlap.
+_MIN_OVERLAP_MATCH = 3
+# ASR often garbles the word cut at a chunk edge; tolerate this many
+# characters between the matched text and the edge.
+_EDGE_SLACK = 3
+
+
+def duplicated_prefix_len(prev: str, text: str, *, overlap_fraction: float) -> int:
+    """Length of the head of ``text`` that repeats the tail of ``prev``.
+
+    Neighbouring chunks share ``overlap_fraction`` of the earlier chunk's
+    audio, so the end of ``prev`` is transcribed again at the start of
+    ``text``. Only windows about twice the expected overlap are compared,
+    and the match must end near the end of ``prev`` and start near the
+    start of ``text``. Returns 0 if there is no such match.
+    """
+    if not prev or not text or overlap_fraction <= 0:
+        return 0
+    window = int(len(prev) * min(overlap_fraction, 1.0) * 2) + 2 * _EDGE_SLACK
+    tail = prev[-window:]
+    head = text[:window]
+    match = difflib.SequenceMatcher(None, tail, head, autojunk=False).find_longest_match(
+        0, len(tail), 0, len(head)
+    )
+    if (
+        match.size >= _MIN_OVERLAP_MATCH
+        and match.a + match.size >= len(tail) - _EDGE_SLACK
+        and match.b <= _EDGE_SLACK
+    ):
+        return match.b + match.size
+    return 0
+
+
+class _ChunkTextMerger:
+    """Feed per-chunk ASR text into a ChunkMerger as chunks complete.
+
+    Each chunk is one whole-chunk text, so the merger's per-segment overlap
+    dedup cannot see speech repeated in the audio overlap. Chunks are
+    therefore released in index order, and the head of each chunk's text
+    that repeats the tail of the previous chunk's text is cut first.
+    """
+
+    def __init__(self, *, overlap_ms: int, on_segments: SegmentsCallback | None) -> None:
+        from ..merger import ChunkMerger
+
+        self._merger = ChunkMerger(overlap_ms=overlap_ms)
+        self._on_segments = on_segments
+        self._raw_chunks: list[dict[str, Any]] = []
+        self._segments: list[Segment] = []
+        self._waiting: dict[int, tuple[int, int, str]] = {}
+        self._next_index = 0
+        self._prev: tuple[int, int, str] | None = None
+
+    def add(self, index: int, start_ms: int, end_ms: int, text: str) -> None:
+        text = text.strip()
+        self._raw_chunks.append({"start_ms": start_ms, "end_ms": end_ms, "text": text})
+        self._waiting[index] = (start_ms, end_ms, text)
+        while self._next_index in self._waiting:
+            self._release(self._next_index, *self._waiting.pop(self._next_index))
+            self._next_index += 1
+
+    def _release(self, index: int, start_ms: int, end_ms: int, text: str) -> None:
+        from ..merger import ChunkTranscript
+
+        raw = text
+        if self._prev is not None:
+            prev_start, prev_end, prev_text = self._prev
+            overlap_ms = prev_end - start_ms
+            if overlap_ms > 0 and prev_end > prev_start:
+                cut = duplicated_prefix_len(
+                    prev_text, text, overlap_fraction=overlap_ms / (prev_end - prev_start)
+                )
+                text = text[cut:].strip()
+        self._prev = (start_ms, end_ms, raw)
+        segments = [Segment(start_ms=0, end_ms=end_ms - start_ms, text=text)] if text else []
+        self._emit(self._merger.add(index, ChunkTranscript(chunk_start_ms=start_ms, segments=segments)))
+
+    def result(self) -> TranscribeResult:
+        for index in sorted(self._waiting):  # only if indices had gaps
+            self._release(index, *self._waiting.pop(index))
+        self._emit(self._merger.finish())
+        self._raw_chunks.sort(key=lambda c: c["start_ms"])
+        return TranscribeResult(segments=self._segments, raw={"chunks": self._raw_chunks})
+
+    def _emit(self, segments: list[Segment]) -> None:
+        if not segments:
+            return
+        self._segments.extend(segments)
+        if self._on_segments is not None:
+            self._on_segments(segments)
+
+
 class TranscribeAgent:
     def __init__(
         self,
@@ -25,20 +129,59 @@ class TranscribeAgent:
         mode: Mode = "qwen",
         model: str = "qwen3-asr-flash",
         api_key: str | None = None,
+        chunk_seconds: int | None = None,
+        overlap_seconds: int = 2,
+        max_workers: int = 4,
+        stream: bool = False,
     ) -> None:
+        if stream and chunk_seconds is None:
+            chunk_seconds = DEFAULT_CHUNK_SECONDS
+        if chunk_seconds is not None and chunk_seconds <= 0:
+            raise ValueError("chunk_seconds must be > 0 (or None to disable chunking).")
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1.")
         self._mode = mode
         self._model = model
         self._api_key = api_key
+        self._chunk_seconds = chunk_seconds
+        self._overlap_seconds = overlap_seconds
+        self._max_workers = max_workers
+        self._stream = stream
+
+    @property
+    def model(self) -> str:
+        return self._model
+
+    @property
+    def chunk_seconds(self) -> int | None:
+        return self._chunk_seconds
+
+    @property
+    def overlap_seconds(self) -> int:
+        return self._overlap_seconds
+
+    def transcribe(
+        self, audio_path: str, *, on_segments: SegmentsCallback | None = None
+    ) -> TranscribeResult:
+        """Transcribe ``audio_path``.
 
-    def transcribe(self, audio_path: str) -> TranscribeResult:
+        With chunking enabled, ``on_segments`` is called with each batch of final,
+        monotonic segments while later chunks are still being transcribed; other
+        modes call it once with the full result.
+        """
         if self._mode == "noop":
-            return TranscribeResult(segments=[], raw=None)
+            result = TranscribeResult(segments=[], raw=None)
         elif self._mode == "qwen":
-            return self._transcribe_qwen(audio_path)
+            return self._transcribe_qwen(audio_path, on_segments)
         else:
-            return self._transcribe_openai(audio_path)
+            result = self._transcribe_openai(audio_path)
+        if on_segments is not None and result.segments:
+            on_segments(result.segments)
+        return result
 
-    def _transcribe_qwen(self, audio_path: str) -> TranscribeResult:
+    def _transcribe_qwen(
+        self, audio_path: str, on_segments: SegmentsCallback | None
+    ) -> TranscribeResult:
         import dashscope
 
         api_key = self._api_key or os.environ.get("DASHSCOPE_API_KEY")
@@ -47,6 +190,11 @@ class TranscribeAgent:
 
         dashscope.api_key = api_key
 
+        if self._stream:
+            return self._transcribe_qwen_streaming(audio_path, on_segments)
+        if self._chunk_seconds:
+            return self._transcribe_qwen_chunked(audio_path, on_segments)
+
         # Convert to wav if needed
         wav_path = self._ensure_wav(audio_path)
 
@@ -64,8 +212,88 @@ class TranscribeAgent:
         else:
             segments = []
 
+        if on_segments is not None and segments:
+            on_segments(segments)
         return TranscribeResult(segments=segments, raw={"text": text})
 
+    def _transcribe_qwen_chunked(
+        self, audio_path: str, on_segments: SegmentsCallback | None
+    ) -> TranscribeResult:
+        """Split audio into overlapping chunks, transcribe them concurrently, then merge."""
+        from ..chunker import chunk_audio_ffmpeg
+
+        merger = _ChunkTextMerger(
+            overlap_ms=self._overlap_seconds * 1000, on_segments=on_segments
+        )
+        with tempfile.TemporaryDirectory(
+            prefix="asr_chunks_", dir=Path(audio_path).parent
+        ) as tmp:
+            chunks = chunk_audio_ffmpeg(
+                audio_path,
+                tmp,
+                chunk_seconds=self._chunk_seconds or DEFAULT_CHUNK_SECONDS,
+                overlap_seconds=self._overlap_seconds,
+            )
+            with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+                texts = pool.map(tracing.propagate(self._transcribe_chunk), chunks)
+                for idx, (chunk, text) in enumerate(zip(chunks, texts)):
+                    merger.add(idx, chunk.start_ms, chunk.end_ms, text)
+
+        return merger.result()
+
+    def _transcribe_qwen_streaming(
+        self, audio_path: str, on_segments: SegmentsCallback | None
+    ) -> TranscribeResult:
+        """Decode to 16 kHz PCM on a pipe and send windows from memory; no WAV is written.
+
+        At most ``2 * max_workers`` windows are buffered, so memory stays bounded
+        regardless of audio length. Windows are merged as they complete, out of
+        order if need be.
+        """
+        from ..chunker import stream_pcm_windows
+
+        windows = stream_pcm_windows(
+            audio_path,
+            chunk_seconds=self._chunk_seconds or DEFAULT_CHUNK_SECONDS,
+            overlap_seconds=self._overlap_seconds,
+        )
+        merger = _ChunkTextMerger(
+            overlap_ms=self._overlap_seconds * 1000, on_segments=on_segments
+        )
+        max_pending = self._max_workers * 2
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            pending: dict[Future[str], tuple[int, PcmWindow]] = {}
+
+            def drain(return_when: str) -> None:
+                done, _ = wait(pending, return_when=return_when)
+                for fut in done:
+                    idx, w = pending.pop(fut)
+                    merger.add(idx, w.start_ms, w.end_ms, fut.result())
+
+            for idx, window in enumerate(windows):
+                pending[pool.submit(tracing.propagate(self._transcribe_pcm), window)] = (idx, window)
+                if len(pending) >= max_pending:
+                    drain(FIRST_COMPLETED)
+            if pending:
+                drain(ALL_COMPLETED)
+
+        return merger.result()
+
+    def _transcribe_pcm(self, window: PcmWindow) -> str:
+        from ..chunker import wav_bytes
+
+        encoded = base64.b64encode(wav_bytes(window.pcm)).decode("ascii")
+        tracing.count("asr.upload_bytes", len(encoded))
+        return self._call_asr(f"data:audio/wav;base64,{encoded}")
+
+    def _transcribe_chunk(self, chunk: AudioChunk) -> str:
+        wav_path = self._ensure_wav(str(chunk.path))
+        try:
+            return self._call_asr(wav_path)
+        finally:
+            if wav_path != str(chunk.path):
+                Path(wav_path).unlink(missing_ok=True)
+
     def _ensure_wav(self, audio_path: str) -> str:
         """Convert audio to wav format if needed."""
         path = Path(audio_path)
@@ -82,21 +310,23 @@ class TranscribeAgent:
         subprocess.run(cmd, check=True)
         return str(wav_path)
 
-    def _call_asr(self, wav_path: str) -> str:
-        """Call Qwen ASR API."""
+    def _call_asr(self, audio: str) -> str:
+        """Call Qwen ASR API with a local file path or a base64 ``data:`` URI."""
         from dashscope import MultiModalConversation
 
         messages = [
             {"role": "system", "content": [{"text": ""}]},
-            {"role": "user", "content": [{"audio": wav_path}]}
+            {"role": "user", "content": [{"audio": audio}]}
         ]
 
-        response = MultiModalConversation.call(
-            model=self._model,
-            messages=messages,
-            result_format="message",
-            asr_options={"language": "zh", "enable_itn": True}
-        )
+        tracing.count("asr.calls")
+        with tracing.span("asr.call"):
+            response = MultiModalConversation.call(
+                model=self._model,
+                messages=messages,
+                result_format="message",
+                asr_options={"language": "zh", "enable_itn": True}
+            )
 
         if response.status_code != 200:
             raise RuntimeError(f"ASR failed: {response.message}")
@@ -1,15 +1,28 @@
 from __future__ import annotations
 
 import json
-import os
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Literal
+from typing import TYPE_CHECKING, Any, Literal
 
+from .. import tracing
 from ..segment import Segment
+from ._batching import estimate_tokens, pack_by_budget
+from .clients import complete, get_anthropic_client
 
+if TYPE_CHECKING:
+    from ..cache import ResponseCache
+
+logger = logging.getLogger(__name__)
 
 Mode = Literal["noop", "anthropic"]
 
+# JSON framing per segment ({"index": N, "text": ...}).
+_PER_SEGMENT_OVERHEAD = 12
+# English output runs longer than the Chinese source in tokens.
+_OUTPUT_EXPANSION = 1.5
+
 
 def _extract_json_array(text: str) -> Any:
     text = text.strip()
@@ -24,6 +37,13 @@ def _extract_json_array(text: str) -> Any:
     return json.loads(text[start : end + 1])
 
 
+def _is_json_array(text: str) -> bool:
+    try:
+        return isinstance(_extract_json_array(text), list)
+    except ValueError:
+        return False
+
+
 @dataclass(frozen=True, slots=True)
 class TranslateResult:
     segments: list[Segment]
@@ -37,72 +57,128 @@ class TranslateAgent:
         mode: Mode = "anthropic",
         model: str = "claude-3-5-sonnet-latest",
         api_key: str | None = None,
+        client: Any | None = None,
+        response_cache: ResponseCache | None = None,
+        max_batch_tokens: int = 4000,
+        max_workers: int = 4,
+        max_rounds: int = 3,
     ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1.")
         self._mode = mode
         self._model = model
         self._api_key = api_key
+        self._injected_client = client
+        self._response_cache = response_cache
+        self._max_batch_tokens = max_batch_tokens
+        self._max_workers = max_workers
+        self._max_rounds = max_rounds
+
+    @property
+    def model(self) -> str:
+        return self._model
 
     def translate_segments(self, segments: list[Segment]) -> list[Segment]:
         return self.translate(segments).segments
 
     def translate(self, segments: list[Segment]) -> TranslateResult:
-        if self._mode == "noop":
+        """Translate in parallel batches sized by estimated input + output tokens.
+
+        Indices the model leaves out are re-requested (up to ``max_rounds`` passes
+        in total); only indices still missing after that keep the source text.
+        """
+        if self._mode == "noop" or not segments:
             return TranslateResult(segments=segments, raw_text=None)
 
-        api_key = self._api_key or os.environ.get("ANTHROPIC_API_KEY")
-        if not api_key:
-            raise RuntimeError("Missing ANTHROPIC_API_KEY (or pass api_key=...).")
+        client = self._client()
+        translated_by_index: dict[int, str] = {}
+        raw_parts: list[str] = []
+        pending = list(range(len(segments)))
+
+        with ThreadPoolExecutor(max_workers=self._max_workers) as pool:
+            for round_no in range(self._max_rounds):
+                if not pending:
+                    break
+                if round_no:
+                    logger.info("Re-requesting %d untranslated segment(s)", len(pending))
+                # A re-sent batch may be identical to the first one; skip the
+                # response cache so it gets a fresh reply.
+                use_cache = round_no == 0
+                batches = self._plan_batches(segments, pending)
+                for part, raw in pool.map(
+                    tracing.propagate(
+                        lambda b: self._translate_batch(client, segments, b, use_cache=use_cache)
+                    ),
+                    batches,
+                ):
+                    translated_by_index.update(part)
+                    raw_parts.append(raw)
+                pending = [i for i in pending if i not in translated_by_index]
+
+        if pending:
+            logger.warning("No translation for %d segment(s); kept source text", len(pending))
 
-        try:
-            from anthropic import Anthropic  # type: ignore[import-not-found]
-        except Exception as e:  # pragma: no cover
-            raise RuntimeError("anthropic package is required for translation. Install: pip install anthropic") from e
+        out: list[Segment] = []
+        for i, seg in enumerate(segments):
+            text = translated_by_index.get(i, seg.text)
+            out.append(Segment(start_ms=seg.start_ms, end_ms=seg.end_ms, text=text))
 
-        client = Anthropic(api_key=api_key)
+        return TranslateResult(segments=out, raw_text="\n".join(raw_parts))
 
-        payload = [
-            {"index": i, "start_ms": s.start_ms, "end_ms": s.end_ms, "text": s.text}
-            for i, s in enumerate(segments)
-        ]
+    def _client(self) -> Any:
+        if self._injected_client is not None:
+            return self._injected_client
+        return get_anthropic_client(api_key=self._api_key)
+
+    def _plan_batches(self, segments: list[Segment], indices: list[int]) -> list[list[int]]:
+        costs = []
+        for i in indices:
+            tokens_in = estimate_tokens(segments[i].text) + _PER_SEGMENT_OVERHEAD
+            tokens_out = int(tokens_in * _OUTPUT_EXPANSION) + _PER_SEGMENT_OVERHEAD
+            costs.append(tokens_in + tokens_out)
+        return [[indices[j] for j in r] for r in pack_by_budget(costs, self._max_batch_tokens)]
+
+    def _translate_batch(
+        self, client: Any, segments: list[Segment], batch: list[int], *, use_cache: bool = True
+    ) -> tuple[dict[int, str], str]:
+        payload = [{"index": i, "text": segments[i].text} for i in batch]
 
         system = (
             "Translate Chinese subtitles to natural English.\n"
             "Rules:\n"
-            "- Do NOT change timestamps.\n"
-            "- Do NOT add or remove segments.\n"
+            "- Translate every segment; keep each index.\n"
+            "- Do NOT add, remove, merge or split segments.\n"
             "- Output ONLY a JSON array: {\"index\": number, \"text\": string}.\n"
         )
         user = "Translate these segments to English:\n\n" + json.dumps(payload, ensure_ascii=False)
 
-        msg = client.messages.create(
-            model=self._model,
-            max_tokens=4096,
-            system=system,
-            messages=[{"role": "user", "content": user}],
-        )
-
-        content = ""
-        for block in msg.content:
-            if getattr(block, "type", None) == "text":
-                content += block.text
+        with tracing.span("translate.batch", segments=len(batch)):
+            content = complete(
+                client,
+                model=self._model,
+                system=system,
+                user=user,
+                usage_prefix="llm.translate",
+                cache=self._response_cache if use_cache else None,
+                validate=_is_json_array,
+            )
 
-        items = _extract_json_array(content)
+        try:
+            items = _extract_json_array(content)
+        except ValueError:
+            # Usually a reply cut off at max_tokens; its indices are retried.
+            logger.warning("Unparseable translation reply for %d segment(s)", len(batch))
+            return {}, content.strip()
         if not isinstance(items, list):
             raise ValueError("Model output was not a JSON array.")
 
-        translated_by_index: dict[int, str] = {}
+        wanted = set(batch)
+        translated: dict[int, str] = {}
         for item in items:
             if not isinstance(item, dict):
                 continue
             idx = item.get("index")
             text = item.get("text")
-            if isinstance(idx, int) and isinstance(text, str):
-                translated_by_index[idx] = text
-
-        out: list[Segment] = []
-        for i, seg in enumerate(segments):
-            text = translated_by_index.get(i, seg.text)
-            out.append(Segment(start_ms=seg.start_ms, end_ms=seg.end_ms, text=text))
-
-        return TranslateResult(segments=out, raw_text=content.strip())
-
+            if isinstance(idx, int) and idx in wanted and isinstance(text, str) and text.strip():
+                translated[idx] = text
+        return translated, content.strip()
@@ -0,0 +1,74 @@
+"""
+Batch extraction over many URLs / BV IDs with a bounded worker pool.
+
+Usage:
+    pixi run python -m bilibili_subtitle --batch ids.txt -j 8
+    cat ids.txt | pixi run python -m bilibili_subtitle --batch - --skip-summary
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TextIO
+
+from .contract import ExecutionResult, execution_result_for_error
+
+
+def iter_batch_inputs(stream: TextIO) -> Iterator[str]:
+    """Yield one URL/BV ID per non-empty line, skipping ``#`` comments."""
+    for line in stream:
+        value = line.strip()
+        if value and not value.startswith("#"):
+            yield value
+
+
+def run_batch(
+    urls: Iterable[str],
+    extract: Callable[[str], ExecutionResult],
+    *,
+    max_workers: int = 4,
+) -> Iterator[ExecutionResult]:
+    """Run ``extract`` for every URL on a thread pool, yielding results as they finish.
+
+    At most ``max_workers * 2`` URLs are in flight at once, so ``urls`` may be a
+    lazy stream (e.g. stdin). Exceptions are converted into failed results
+    instead of aborting the batch.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be >= 1.")
+
+    def _run(url: str) -> ExecutionResult:
+        try:
+            return extract(url)
+        except Exception as e:
+            return execution_result_for_error(e, url=url)
+
+    max_pending = max_workers * 2
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        pending: set[Future[ExecutionResult]] = set()
+        for url in urls:
+            pending.add(pool.submit(_run, url))
+            if len(pending) >= max_pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in done:
+                    yield fut.result()
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for fut in done:
+                yield fut.result()
+
+
+def batch_exit_code(succeeded: int, total: int) -> int:
+    """0 if every video succeeded, 1 if none did, 3 (partial) otherwise."""
+    if succeeded == total:
+        return 0
+    if succeeded == 0:
+        return 1
+    return 3
+
+
+def result_line(result: ExecutionResult) -> str:
+    """Serialize a result as a single JSON Lines record."""
+    return json.dumps(result.to_dict(), ensure_ascii=False)
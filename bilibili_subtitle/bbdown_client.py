@@ -1,12 +1,21 @@
 from __future__ import annotations
 
+import asyncio
+import contextlib
+import json
 import logging
 import re
 import shutil
 import subprocess
 import time
+import weakref
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
+
+from ._defaults import DEFAULT_INFO_TTL_SECONDS
+from .cache import _write_json_atomic
+from .tracing import count, span
 
 logger = logging.getLogger(__name__)
 
@@ -51,9 +60,75 @@ class BBDownError(Exception):
     pass
 
 
-class BBDownClient:
-    def __init__(self) -> None:
+class VideoInfoCache:
+    """On-disk cache of parsed BBDown metadata, keyed by video ID and language.
+
+    Entries live next to the subtitle files in ``work_dir``. An entry is a miss
+    once it is older than ``ttl_seconds`` or any recorded subtitle file is gone
+    (e.g. deleted by a crosstalk retry).
+    """
+
+    def __init__(self, work_dir: Path, *, ttl_seconds: float = DEFAULT_INFO_TTL_SECONDS) -> None:
+        self._dir = work_dir
+        self._ttl = ttl_seconds
+
+    def _path(self, video_id: str, lang: str | None) -> Path:
+        return self._dir / f"{video_id}.{lang or 'all'}.info.json"
+
+    def get(self, video_id: str, lang: str | None) -> VideoInfo | None:
+        path = self._path(video_id, lang)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            if time.time() - float(entry["fetched_at"]) > self._ttl:
+                return None
+            files = [self._dir / name for name in entry["subtitle_files"]]
+            sub = entry["subtitle_info"]
+            info = VideoInfo(
+                video_id=entry["video_id"],
+                title=entry["title"],
+                subtitle_info=SubtitleInfo(
+                    has_subtitle=sub["has_subtitle"],
+                    has_ai_subtitle=sub["has_ai_subtitle"],
+                    languages=list(sub["languages"]),
+                ),
+                subtitle_files=files,
+            )
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        if not all(f.is_file() for f in files):
+            return None
+        return info
+
+    def put(self, info: VideoInfo, lang: str | None) -> None:
+        # Subtitle files reported by BBDown but not found locally can't be
+        # validated later, so don't cache that state.
+        if info.subtitle_info.has_subtitle and not info.subtitle_files:
+            return
+        entry = {
+            "fetched_at": time.time(),
+            "video_id": info.video_id,
+            "title": info.title,
+            "subtitle_info": {
+                "has_subtitle": info.subtitle_info.has_subtitle,
+                "has_ai_subtitle": info.subtitle_info.has_ai_subtitle,
+                "languages": info.subtitle_info.languages,
+            },
+            "subtitle_files": [f.name for f in info.subtitle_files],
+        }
+        try:
+            # Atomic, so concurrent batch workers never see a torn entry.
+            _write_json_atomic(self._path(info.video_id, lang), entry)
+        except OSError as e:
+            logger.warning("Could not write video info cache: %s", e)
+
+
+class _BBDownBase:
+    """BBDown discovery, argument building and output parsing shared by both clients."""
+
+    def __init__(self, *, info_cache_ttl: float | None = DEFAULT_INFO_TTL_SECONDS) -> None:
+        """``info_cache_ttl`` is in seconds; None or 0 disables the metadata cache."""
         self._bbdown = self._find_bbdown()
+        self._info_cache_ttl = info_cache_ttl
 
     def _find_bbdown(self) -> str:
         path = shutil.which("BBDown")
@@ -69,70 +144,32 @@ class BBDownClient:
     def _base_args(self) -> list[str]:
         return [self._bbdown]
 
-    def _run(
-        self,
-        args: list[str],
-        *,
-        check: bool = True,
-        max_retries: int = 3,
-        retry_delay: float = 1.0,
-        timeout: int = 120,
-    ) -> subprocess.CompletedProcess[str]:
-        """Run BBDown with retry + timeout (Fix 1)."""
-        last_exc: Exception | None = None
-
-        for attempt in range(max_retries):
-            try:
-                result = subprocess.run(
-                    args,
-                    capture_output=True,
-                    text=True,
-                    check=False,
-                    timeout=timeout,
-                )
-                # If check requested and non-zero, see if it's fatal
-                if check and result.returncode != 0:
-                    combined = result.stdout + result.stderr
-                    if _FATAL_PATTERNS.search(combined):
-                        raise BBDownError(f"BBDown failed (non-retryable): {result.stderr}")
-                    # Retryable error
-                    last_exc = BBDownError(f"BBDown failed (rc={result.returncode}): {result.stderr}")
-                    logger.warning(
-                        "BBDown attempt %d/%d failed (rc=%d), retrying in %.1fs",
-                        attempt + 1, max_retries, result.returncode, retry_delay * (2 ** attempt),
-                    )
-                    time.sleep(retry_delay * (2 ** attempt))
-                    continue
-                return result
-
-            except subprocess.TimeoutExpired:
-                last_exc = BBDownError(f"BBDown timed out after {timeout}s")
-                logger.warning(
-                    "BBDown attempt %d/%d timed out, retrying in %.1fs",
-                    attempt + 1, max_retries, retry_delay * (2 ** attempt),
-                )
-                time.sleep(retry_delay * (2 ** attempt))
-                continue
-
-            except BBDownError:
-                raise
-
-            except Exception as e:
-                raise BBDownError(f"BBDown failed: {e}") from e
-
-        raise last_exc or BBDownError("BBDown failed after retries")
-
-    def get_video_info(
-        self, url: str, work_dir: Path, *, lang: str | None = "zh-Hans"
-    ) -> VideoInfo:
-        """Download subtitles and return video info (Fix 4, 7)."""
-        work_dir.mkdir(parents=True, exist_ok=True)
-        video_id = self._extract_video_id(url)
-
-        existing_files = set(work_dir.glob(f"{video_id}*.srt")) | set(
-            work_dir.glob(f"{video_id}*.vtt")
-        )
-
+    @staticmethod
+    def _retry_delay(retry_delay: float, attempt: int) -> float:
+        return retry_delay * (2 ** attempt)
+
+    @staticmethod
+    def _failure(result: subprocess.CompletedProcess[str]) -> BBDownError | None:
+        """Return a retryable error for a failed run; raise if it is fatal."""
+        if result.returncode == 0:
+            return None
+        combined = result.stdout + result.stderr
+        if _FATAL_PATTERNS.search(combined):
+            raise BBDownError(f"BBDown failed (non-retryable): {result.stderr}")
+        return BBDownError(f"BBDown failed (rc={result.returncode}): {result.stderr}")
+
+    def _info_cache(self, work_dir: Path) -> VideoInfoCache | None:
+        if not self._info_cache_ttl:
+            return None
+        return VideoInfoCache(work_dir, ttl_seconds=self._info_cache_ttl)
+
+    @staticmethod
+    def _subtitle_files(work_dir: Path, video_id: str) -> set[Path]:
+        return set(work_dir.glob(f"{video_id}*.srt")) | set(work_dir.glob(f"{video_id}*.vtt"))
+
+    def _video_info_args(
+        self, url: str, video_id: str, work_dir: Path, lang: str | None
+    ) -> list[str]:
         args = self._base_args() + [
             "--sub-only",
             "--skip-ai",
@@ -145,15 +182,18 @@ class BBDownClient:
         if lang is not None:
             args += ["--select-lang", lang]
         args.append(url)
+        return args
 
-        result = self._run(args, check=False)
+    def _build_video_info(
+        self,
+        video_id: str,
+        result: subprocess.CompletedProcess[str],
+        new_files: list[Path],
+        info_cache: VideoInfoCache | None,
+        lang: str | None,
+    ) -> VideoInfo:
         output = result.stdout + result.stderr
 
-        new_files = sorted(
-            (set(work_dir.glob(f"{video_id}*.srt")) | set(work_dir.glob(f"{video_id}*.vtt")))
-            - existing_files
-        )
-
         # Fix 7: raise on non-zero exit when no files were produced
         if result.returncode != 0 and not new_files:
             logger.error("BBDown exited %d with no subtitle files", result.returncode)
@@ -163,12 +203,39 @@ class BBDownClient:
 
         title = self._extract_title(output)
         subtitle_info = self._extract_subtitle_info(output)
-        return VideoInfo(
+        info = VideoInfo(
             video_id=video_id,
             title=title,
             subtitle_info=subtitle_info,
             subtitle_files=new_files,
         )
+        if info_cache is not None and result.returncode == 0:
+            info_cache.put(info, lang)
+        return info
+
+    def _audio_args(self, url: str, video_id: str, work_dir: Path) -> list[str]:
+        return self._base_args() + [
+            "--audio-only",
+            "-F",
+            video_id,
+            "--work-dir",
+            str(work_dir),
+            url,
+        ]
+
+    @staticmethod
+    def _find_audio(work_dir: Path, video_id: str) -> Path:
+        audio_files = list(work_dir.glob(f"{video_id}.*"))
+        audio_exts = (".m4a", ".aac", ".mp3", ".flac", ".wav")
+        for f in audio_files:
+            if f.suffix.lower() in audio_exts:
+                return f
+
+        all_audio = [f for f in work_dir.iterdir() if f.suffix.lower() in audio_exts]
+        if all_audio:
+            return sorted(all_audio, key=lambda p: p.stat().st_mtime, reverse=True)[0]
+
+        raise BBDownError("Audio download produced no output.")
 
     def _extract_video_id(self, url: str) -> str:
         bv_match = re.search(r"(BV[0-9A-Za-z]{10})", url)
@@ -212,28 +279,236 @@ class BBDownClient:
             languages=languages,
         )
 
+
+class BBDownClient(_BBDownBase):
+    def _run(
+        self,
+        args: list[str],
+        *,
+        check: bool = True,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        timeout: int = 120,
+    ) -> subprocess.CompletedProcess[str]:
+        """Run BBDown with retry + timeout (Fix 1)."""
+        with span("bbdown.run") as trace:
+            return self._run_attempts(args, trace, check, max_retries, retry_delay, timeout)
+
+    def _run_attempts(
+        self,
+        args: list[str],
+        trace: dict[str, Any],
+        check: bool,
+        max_retries: int,
+        retry_delay: float,
+        timeout: int,
+    ) -> subprocess.CompletedProcess[str]:
+        last_exc: Exception | None = None
+
+        for attempt in range(max_retries):
+            delay = self._retry_delay(retry_delay, attempt)
+            trace["attempts"] = attempt + 1
+            if attempt:
+                count("bbdown.retries")
+            count("bbdown.subprocesses")
+            try:
+                result = subprocess.run(
+                    args,
+                    capture_output=True,
+                    text=True,
+                    check=False,
+                    timeout=timeout,
+                )
+                count("bbdown.output_bytes", len(result.stdout or "") + len(result.stderr or ""))
+                # If check requested and non-zero, see if it's fatal
+                if check and (failure := self._failure(result)) is not None:
+                    last_exc = failure
+                    logger.warning(
+                        "BBDown attempt %d/%d failed (rc=%d), retrying in %.1fs",
+                        attempt + 1, max_retries, result.returncode, delay,
+                    )
+                    time.sleep(delay)
+                    continue
+                return result
+
+            except subprocess.TimeoutExpired:
+                count("bbdown.timeouts")
+                last_exc = BBDownError(f"BBDown timed out after {timeout}s")
+                logger.warning(
+                    "BBDown attempt %d/%d timed out, retrying in %.1fs",
+                    attempt + 1, max_retries, delay,
+                )
+                time.sleep(delay)
+                continue
+
+            except BBDownError:
+                raise
+
+            except Exception as e:
+                raise BBDownError(f"BBDown failed: {e}") from e
+
+        raise last_exc or BBDownError("BBDown failed after retries")
+
+    def get_video_info(
+        self, url: str, work_dir: Path, *, lang: str | None = "zh-Hans"
+    ) -> VideoInfo:
+        """Download subtitles and return video info (Fix 4, 7).
+
+        A fresh entry in the metadata cache skips the BBDown run entirely.
+        """
+        work_dir.mkdir(parents=True, exist_ok=True)
+        video_id = self._extract_video_id(url)
+
+        info_cache = self._info_cache(work_dir) if video_id != "unknown" else None
+        if info_cache is not None:
+            cached = info_cache.get(video_id, lang)
+            if cached is not None:
+                logger.debug("Video info cache hit for %s", video_id)
+                count("bbdown.info_cache_hits")
+                return cached
+
+        existing_files = self._subtitle_files(work_dir, video_id)
+        result = self._run(self._video_info_args(url, video_id, work_dir, lang), check=False)
+        new_files = sorted(self._subtitle_files(work_dir, video_id) - existing_files)
+        return self._build_video_info(video_id, result, new_files, info_cache, lang)
+
     def download_audio(self, url: str, work_dir: Path) -> Path:
         work_dir.mkdir(parents=True, exist_ok=True)
         video_id = self._extract_video_id(url)
+        self._run(self._audio_args(url, video_id, work_dir))
+        return self._find_audio(work_dir, video_id)
 
-        args = self._base_args() + [
-            "--audio-only",
-            "-F",
-            video_id,
-            "--work-dir",
-            str(work_dir),
-            url,
-        ]
-        self._run(args)
 
-        audio_files = list(work_dir.glob(f"{video_id}.*"))
-        audio_exts = (".m4a", ".aac", ".mp3", ".flac", ".wav")
-        for f in audio_files:
-            if f.suffix.lower() in audio_exts:
-                return f
+# BBDown processes allowed at once per event loop, across all async clients.
+MAX_CONCURRENT_PROCESSES = 8
 
-        all_audio = [f for f in work_dir.iterdir() if f.suffix.lower() in audio_exts]
-        if all_audio:
-            return sorted(all_audio, key=lambda p: p.stat().st_mtime, reverse=True)[0]
+_loop_slots: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+    weakref.WeakKeyDictionary()
+)
 
-        raise BBDownError("Audio download produced no output.")
+
+def _process_slots() -> asyncio.Semaphore:
+    """The running loop's BBDown process semaphore, created on first use."""
+    loop = asyncio.get_running_loop()
+    slots = _loop_slots.get(loop)
+    if slots is None:
+        slots = _loop_slots[loop] = asyncio.Semaphore(MAX_CONCURRENT_PROCESSES)
+    return slots
+
+
+class AsyncBBDownClient(_BBDownBase):
+    """asyncio BBDown client: same retry and fatal-error semantics as BBDownClient.
+
+    At most ``MAX_CONCURRENT_PROCESSES`` BBDown processes run at once per
+    event loop, however many clients and coroutines share it, so one loop
+    can drive many fetches without a thread per job. A cancelled fetch kills
+    its BBDown process.
+    """
+
+    async def _exec(self, args: list[str], timeout: float) -> subprocess.CompletedProcess[str]:
+        async with _process_slots():
+            proc = await asyncio.create_subprocess_exec(
+                *args, stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.PIPE
+            )
+            try:
+                stdout, stderr = await asyncio.wait_for(proc.communicate(), timeout)
+            except (asyncio.TimeoutError, asyncio.CancelledError):
+                with contextlib.suppress(ProcessLookupError):
+                    proc.kill()
+                await proc.wait()
+                raise
+        return subprocess.CompletedProcess(
+            args,
+            proc.returncode if proc.returncode is not None else -1,
+            stdout.decode("utf-8", errors="replace"),
+            stderr.decode("utf-8", errors="replace"),
+        )
+
+    async def _run(
+        self,
+        args: list[str],
+        *,
+        check: bool = True,
+        max_retries: int = 3,
+        retry_delay: float = 1.0,
+        timeout: int = 120,
+    ) -> subprocess.CompletedProcess[str]:
+        with span("bbdown.run") as trace:
+            return await self._run_attempts(args, trace, check, max_retries, retry_delay, timeout)
+
+    async def _run_attempts(
+        self,
+        args: list[str],
+        trace: dict[str, Any],
+        check: bool,
+        max_retries: int,
+        retry_delay: float,
+        timeout: int,
+    ) -> subprocess.CompletedProcess[str]:
+        last_exc: Exception | None = None
+
+        for attempt in range(max_retries):
+            delay = self._retry_delay(retry_delay, attempt)
+            trace["attempts"] = attempt + 1
+            if attempt:
+                count("bbdown.retries")
+            count("bbdown.subprocesses")
+            try:
+                result = await self._exec(args, timeout)
+                count("bbdown.output_bytes", len(result.stdout or "") + len(result.stderr or ""))
+                if check and (failure := self._failure(result)) is not None:
+                    last_exc = failure
+                    logger.warning(
+                        "BBDown attempt %d/%d failed (rc=%d), retrying in %.1fs",
+                        attempt + 1, max_retries, result.returncode, delay,
+                    )
+                    await asyncio.sleep(delay)
+                    continue
+                return result
+
+            except asyncio.TimeoutError:
+                count("bbdown.timeouts")
+                last_exc = BBDownError(f"BBDown timed out after {timeout}s")
+                logger.warning(
+                    "BBDown attempt %d/%d timed out, retrying in %.1fs",
+                    attempt + 1, max_retries, delay,
+                )
+                await asyncio.sleep(delay)
+                continue
+
+            except BBDownError:
+                raise
+
+            except Exception as e:
+                raise BBDownError(f"BBDown failed: {e}") from e
+
+        raise last_exc or BBDownError("BBDown failed after retries")
+
+    async def get_video_info(
+        self, url: str, work_dir: Path, *, lang: str | None = "zh-Hans"
+    ) -> VideoInfo:
+        work_dir.mkdir(parents=True, exist_ok=True)
+        video_id = self._extract_video_id(url)
+
+        info_cache = self._info_cache(work_dir) if video_id != "unknown" else None
+        if info_cache is not None:
+            cached = info_cache.get(video_id, lang)
+            if cached is not None:
+                logger.debug("Video info cache hit for %s", video_id)
+                count("bbdown.info_cache_hits")
+                return cached
+
+        # Globbing a large work dir would block the loop; run it in a thread.
+        existing_files = await asyncio.to_thread(self._subtitle_files, work_dir, video_id)
+        result = await self._run(
+            self._video_info_args(url, video_id, work_dir, lang), check=False
+        )
+        files = await asyncio.to_thread(self._subtitle_files, work_dir, video_id)
+        new_files = sorted(files - existing_files)
+        return self._build_video_info(video_id, result, new_files, info_cache, lang)
+
+    async def download_audio(self, url: str, work_dir: Path) -> Path:
+        work_dir.mkdir(parents=True, exist_ok=True)
+        video_id = self._extract_video_id(url)
+        await self._run(self._audio_args(url, video_id, work_dir))
+        return await asyncio.to_thread(self._find_audio, work_dir, video_id)
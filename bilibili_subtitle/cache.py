@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import os
 import re
+import tempfile
+import threading
+import time
 from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any
@@ -14,6 +19,46 @@ def _safe_name(value: str) -> str:
     return re.sub(r"[^A-Za-z0-9._-]+", "_", value)
 
 
+def hash_inputs(*parts: Any) -> str:
+    """Stable SHA-256 over JSON-serializable stage inputs."""
+    blob = json.dumps(parts, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def segments_digest(segments: list[Segment]) -> str:
+    return hash_inputs([[s.start_ms, s.end_ms, s.text] for s in segments])
+
+
+def segments_to_json(segments: list[Segment]) -> list[dict[str, Any]]:
+    return [asdict(s) for s in segments]
+
+
+def segments_from_json(data: Any) -> list[Segment] | None:
+    if not isinstance(data, list):
+        return None
+    out: list[Segment] = []
+    for item in data:
+        if not isinstance(item, dict):
+            continue
+        out.append(Segment(start_ms=item["start_ms"], end_ms=item["end_ms"], text=item["text"]))
+    return out
+
+
+def _write_bytes_atomic(path: Path, data: bytes) -> None:
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+
+
+def _write_json_atomic(path: Path, data: Any) -> None:
+    _write_bytes_atomic(path, json.dumps(data, ensure_ascii=False, indent=2).encode("utf-8"))
+
+
 @dataclass(frozen=True, slots=True)
 class CachedSegments:
     video_id: str
@@ -33,18 +78,275 @@ class Cache:
         if not path.exists():
             return None
         data = json.loads(path.read_text(encoding="utf-8"))
-        if not isinstance(data, list):
-            return None
-        out: list[Segment] = []
-        for item in data:
-            if not isinstance(item, dict):
-                continue
-            out.append(Segment(start_ms=item["start_ms"], end_ms=item["end_ms"], text=item["text"]))
-        return out
+        return segments_from_json(data)
 
     def save_segments(self, video_id: str, name: str, segments: list[Segment]) -> Path:
         path = self._path(video_id, name)
-        data: list[dict[str, Any]] = [asdict(s) for s in segments]
-        path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        _write_json_atomic(path, segments_to_json(segments))
         return path
 
+    # --- Content-addressed pipeline stages ---
+
+    def stage_path(self, video_id: str, stage: str, *, model: str, input_hash: str) -> Path:
+        return self._path(video_id, f"{stage}.{model or 'none'}.{input_hash[:16]}")
+
+    def load_stage(
+        self,
+        video_id: str,
+        stage: str,
+        *,
+        model: str,
+        input_hash: str,
+        max_age_seconds: float | None = None,
+    ) -> Any | None:
+        """Return the cached payload for a stage, or None on a miss.
+
+        The full input hash is stored alongside the payload and compared on load,
+        so a truncated-filename collision or a corrupt file is treated as a miss.
+        With ``max_age_seconds``, entries at least that old are misses (0: always).
+        """
+        path = self.stage_path(video_id, stage, model=model, input_hash=input_hash)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not isinstance(entry, dict) or entry.get("input_hash") != input_hash:
+            return None
+        if max_age_seconds is not None and time.time() - entry.get("created", 0) >= max_age_seconds:
+            return None
+        return entry.get("data")
+
+    def save_stage(
+        self, video_id: str, stage: str, data: Any, *, model: str, input_hash: str
+    ) -> Path:
+        path = self.stage_path(video_id, stage, model=model, input_hash=input_hash)
+        _write_json_atomic(
+            path,
+            {
+                "stage": stage,
+                "model": model,
+                "input_hash": input_hash,
+                "created": time.time(),
+                "data": data,
+            },
+        )
+        return path
+
+    def load_stage_segments(
+        self, video_id: str, stage: str, *, model: str, input_hash: str
+    ) -> list[Segment] | None:
+        data = self.load_stage(video_id, stage, model=model, input_hash=input_hash)
+        segments = segments_from_json(data)
+        return segments or None
+
+    def save_stage_segments(
+        self, video_id: str, stage: str, segments: list[Segment], *, model: str, input_hash: str
+    ) -> Path:
+        return self.save_stage(
+            video_id, stage, segments_to_json(segments), model=model, input_hash=input_hash
+        )
+
+
+class ResponseCache:
+    """Disk cache of LLM replies keyed by a hash of the whole request.
+
+    One JSON file per entry. A hit refreshes the file's mtime; when the
+    entries outgrow ``max_bytes`` the least recently used (oldest mtime) are
+    evicted. Entries older than ``ttl_seconds`` are misses. Safe to share
+    between threads; hit/miss counts are kept per instance.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str | Path,
+        *,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl_seconds: float | None = None,
+    ) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be > 0.")
+        self._dir = Path(cache_dir)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        self._max_bytes = max_bytes
+        self._ttl = ttl_seconds
+        self._lock = threading.Lock()
+        self._size: int | None = None  # total entry bytes, scanned on first put
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(*, model: str, system: str, user: str, max_tokens: int) -> str:
+        return hash_inputs(model, system, user, max_tokens)
+
+    def _path(self, key: str) -> Path:
+        return self._dir / f"{key}.json"
+
+    def get(self, key: str) -> str | None:
+        path = self._path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            entry = None
+        valid = (
+            isinstance(entry, dict)
+            and entry.get("key") == key
+            and isinstance(entry.get("text"), str)
+            and (self._ttl is None or time.time() - entry.get("created", 0) <= self._ttl)
+        )
+        with self._lock:
+            if valid:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if not valid:
+            return None
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            pass
+        return entry["text"]
+
+    def put(self, key: str, text: str) -> None:
+        path = self._path(key)
+        _write_json_atomic(path, {"key": key, "created": time.time(), "text": text})
+        try:
+            size = path.stat().st_size
+        except OSError:
+            return
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += size
+            if self._size > self._max_bytes:
+                self._evict()
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        out = []
+        for path in self._dir.glob("*.json"):
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            out.append((st.st_mtime, st.st_size, path))
+        return out
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self) -> None:
+        # Evict down to 90% of the budget so a full cache doesn't rescan on every put.
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _ in entries)
+        target = self._max_bytes * 9 // 10
+        for _, size, path in entries:
+            if total <= target:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+        self._size = total
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": round(hits / lookups, 4) if lookups else None,
+        }
+
+
+class TextMemo:
+    """Append-only JSONL map from a key to a text, e.g. a proofread segment.
+
+    The file is read once, on first use; corrupt lines are skipped, and a
+    key written twice keeps its last value. ``put_many`` appends one line per
+    entry in a single write, so several instances can share one file.
+
+    Once the file outgrows ``max_bytes`` (on load, or after a write) it is
+    compacted: rewritten without stale or corrupt lines and, if still too
+    big, with only the most recently written entries that fit in half the
+    cap. Lines another process appends during a compaction may be lost,
+    which only costs a re-computation. Create one instance per process and
+    share it between runs, so the file is read once.
+    """
+
+    def __init__(self, path: str | Path, *, max_bytes: int = 16 * 1024 * 1024) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be > 0.")
+        self._path = Path(path)
+        self._max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # Oldest write first, so compaction can keep the newest entries.
+        self._entries: dict[str, str] | None = None
+        self._file_bytes = 0
+
+    @staticmethod
+    def _line(key: str, value: str) -> str:
+        return json.dumps({"k": key, "v": value}, ensure_ascii=False) + "\n"
+
+    def _load(self) -> dict[str, str]:
+        entries: dict[str, str] = {}
+        size = 0
+        try:
+            with self._path.open("rb") as f:
+                for raw in f:
+                    size += len(raw)
+                    try:
+                        item = json.loads(raw)
+                    except (UnicodeDecodeError, json.JSONDecodeError):
+                        continue
+                    if isinstance(item, dict) and isinstance(item.get("k"), str) and isinstance(item.get("v"), str):
+                        entries.pop(item["k"], None)
+                        entries[item["k"]] = item["v"]
+        except FileNotFoundError:
+            pass
+        self._file_bytes = size
+        return entries
+
+    def _ensure_loaded(self) -> dict[str, str]:
+        if self._entries is None:
+            self._entries = self._load()
+            if self._file_bytes > self._max_bytes:
+                self._compact()
+        return self._entries
+
+    def _compact(self) -> None:
+        assert self._entries is not None
+        lines = [self._line(k, v).encode("utf-8") for k, v in self._entries.items()]
+        if sum(map(len, lines)) > self._max_bytes:
+            budget = self._max_bytes // 2
+            keep = 0
+            for line in reversed(lines):
+                if budget < len(line):
+                    break
+                budget -= len(line)
+                keep += 1
+            for key in list(self._entries)[: len(lines) - keep]:
+                del self._entries[key]
+            lines = lines[len(lines) - keep :]
+        data = b"".join(lines)
+        self._path.parent.mkdir(parents=True, exist_ok=True)
+        _write_bytes_atomic(self._path, data)
+        self._file_bytes = len(data)
+
+    def get(self, key: str) -> str | None:
+        with self._lock:
+            return self._ensure_loaded().get(key)
+
+    def put_many(self, items: dict[str, str]) -> None:
+        if not items:
+            return
+        data = "".join(self._line(k, v) for k, v in items.items()).encode("utf-8")
+        with self._lock:
+            entries = self._ensure_loaded()
+            for key, value in items.items():
+                entries.pop(key, None)
+                entries[key] = value
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            with self._path.open("ab") as f:
+                f.write(data)
+            self._file_bytes += len(data)
+            if self._file_bytes > self._max_bytes:
+                self._compact()
@@ -1,9 +1,20 @@
 from __future__ import annotations
 
+import contextlib
+import io
 import json
 import subprocess
+import wave
+from collections.abc import Iterator
 from dataclasses import dataclass
 from pathlib import Path
+from typing import BinaryIO
+
+from .tracing import count, span
+
+SAMPLE_RATE = 16000
+_SAMPLE_WIDTH = 2  # s16le mono
+_READ_SIZE = 1 << 16
 
 
 @dataclass(frozen=True, slots=True)
@@ -13,6 +24,13 @@ class AudioChunk:
     path: Path
 
 
+@dataclass(frozen=True, slots=True)
+class PcmWindow:
+    start_ms: int
+    end_ms: int
+    pcm: bytes
+
+
 def probe_duration_ms(input_path: str | Path) -> int:
     input_path = Path(input_path)
     cmd = [
@@ -34,55 +52,166 @@ def probe_duration_ms(input_path: str | Path) -> int:
     return int(round(dur * 1000))
 
 
-def chunk_audio_ffmpeg(
-    input_path: str | Path,
-    output_dir: str | Path,
-    *,
-    chunk_seconds: int = 60,
-    overlap_seconds: int = 2,
-) -> list[AudioChunk]:
-    input_path = Path(input_path)
-    output_dir = Path(output_dir)
-    output_dir.mkdir(parents=True, exist_ok=True)
-
-    duration_ms = probe_duration_ms(input_path)
+def _validate_window(chunk_seconds: int, overlap_seconds: int) -> tuple[int, int]:
     chunk_ms = chunk_seconds * 1000
     overlap_ms = overlap_seconds * 1000
     if chunk_ms <= 0:
         raise ValueError("chunk_seconds must be > 0.")
     if overlap_ms < 0 or overlap_ms >= chunk_ms:
         raise ValueError("overlap_seconds must be >= 0 and < chunk_seconds.")
+    return chunk_ms, overlap_ms
+
+
+def iter_pcm_windows(
+    stream: BinaryIO,
+    *,
+    chunk_ms: int,
+    overlap_ms: int,
+    sample_rate: int = SAMPLE_RATE,
+) -> Iterator[PcmWindow]:
+    """Slice a mono s16le PCM stream into overlapping windows in one pass.
 
+    Windows start at ``0, step, 2*step, ...`` (``step = chunk_ms - overlap_ms``)
+    and are clipped to the stream duration, matching the old per-chunk ffmpeg
+    seeks. Only about one window of audio is held in memory at a time.
+    """
     step_ms = chunk_ms - overlap_ms
-    chunks: list[AudioChunk] = []
+
+    def to_byte(ms: int) -> int:
+        return ms * sample_rate // 1000 * _SAMPLE_WIDTH
+
+    buf = bytearray()
+    buf_offset = 0  # absolute byte offset of buf[0]
     start_ms = 0
-    idx = 0
+
+    while True:
+        block = stream.read(_READ_SIZE)
+        if not block:
+            break
+        buf += block
+        available = buf_offset + len(buf)
+        while to_byte(start_ms + chunk_ms) <= available:
+            lo, hi = to_byte(start_ms) - buf_offset, to_byte(start_ms + chunk_ms) - buf_offset
+            yield PcmWindow(start_ms=start_ms, end_ms=start_ms + chunk_ms, pcm=bytes(buf[lo:hi]))
+            start_ms += step_ms
+            drop = to_byte(start_ms) - buf_offset
+            del buf[:drop]
+            buf_offset += drop
+
+    total_bytes = buf_offset + len(buf)
+    count("ffmpeg.pcm_bytes", total_bytes)
+    duration_ms = int(round(total_bytes / _SAMPLE_WIDTH * 1000 / sample_rate))
     while start_ms < duration_ms:
         end_ms = min(duration_ms, start_ms + chunk_ms)
-        out_path = output_dir / f"chunk_{idx:04d}_{start_ms}_{end_ms}{input_path.suffix}"
-        cmd = [
-            "ffmpeg",
-            "-y",
-            "-v",
-            "error",
-            "-ss",
-            f"{start_ms / 1000:.3f}",
-            "-t",
-            f"{(end_ms - start_ms) / 1000:.3f}",
-            "-i",
-            str(input_path),
-            "-c",
-            "copy",
-            str(out_path),
-        ]
+        lo, hi = to_byte(start_ms) - buf_offset, to_byte(end_ms) - buf_offset
+        yield PcmWindow(start_ms=start_ms, end_ms=end_ms, pcm=bytes(buf[lo:hi]))
+        start_ms += step_ms
+
+
+def _write_wav_to(target: str | BinaryIO, pcm: bytes, sample_rate: int) -> None:
+    with wave.open(target, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(_SAMPLE_WIDTH)
+        w.setframerate(sample_rate)
+        w.writeframes(pcm)
+
+
+def write_wav(path: str | Path, pcm: bytes, *, sample_rate: int = SAMPLE_RATE) -> None:
+    _write_wav_to(str(path), pcm, sample_rate)
+
+
+def wav_bytes(pcm: bytes, *, sample_rate: int = SAMPLE_RATE) -> bytes:
+    """Wrap raw PCM in an in-memory WAV container."""
+    buf = io.BytesIO()
+    _write_wav_to(buf, pcm, sample_rate)
+    return buf.getvalue()
+
+
+def decode_pcm_ffmpeg(input_path: str | Path, *, sample_rate: int = SAMPLE_RATE) -> subprocess.Popen[bytes]:
+    """Start ffmpeg decoding ``input_path`` to mono s16le PCM on stdout."""
+    cmd = [
+        "ffmpeg",
+        "-v",
+        "error",
+        "-i",
+        str(input_path),
+        "-f",
+        "s16le",
+        "-acodec",
+        "pcm_s16le",
+        "-ac",
+        "1",
+        "-ar",
+        str(sample_rate),
+        "-",
+    ]
+    count("ffmpeg.subprocesses")
+    try:
+        return subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+    except FileNotFoundError as e:  # pragma: no cover
+        raise RuntimeError("ffmpeg not found. Install ffmpeg.") from e
+
+
+def finish_decode(proc: subprocess.Popen[bytes]) -> None:
+    """Wait for a decoder started by decode_pcm_ffmpeg and raise if it failed."""
+    stderr = proc.stderr.read() if proc.stderr else b""
+    if proc.wait() != 0:
+        raise RuntimeError(
+            f"ffmpeg decode failed (rc={proc.returncode}): {stderr.decode(errors='replace')}"
+        )
+
+
+def stream_pcm_windows(
+    input_path: str | Path,
+    *,
+    chunk_seconds: int = 60,
+    overlap_seconds: int = 2,
+    sample_rate: int = SAMPLE_RATE,
+) -> Iterator[PcmWindow]:
+    """Decode ``input_path`` once with ffmpeg and yield overlapping PCM windows."""
+    chunk_ms, overlap_ms = _validate_window(chunk_seconds, overlap_seconds)
+    with span("ffmpeg.decode") as trace:
+        with contextlib.suppress(OSError):
+            trace["input_bytes"] = Path(input_path).stat().st_size
+        proc = decode_pcm_ffmpeg(input_path, sample_rate=sample_rate)
         try:
-            subprocess.check_call(cmd)
-        except FileNotFoundError as e:  # pragma: no cover
-            raise RuntimeError("ffmpeg not found. Install ffmpeg.") from e
+            assert proc.stdout is not None
+            yield from iter_pcm_windows(
+                proc.stdout, chunk_ms=chunk_ms, overlap_ms=overlap_ms, sample_rate=sample_rate
+            )
+        except BaseException:
+            proc.kill()
+            proc.wait()
+            raise
+        finish_decode(proc)
 
-        chunks.append(AudioChunk(start_ms=start_ms, end_ms=end_ms, path=out_path))
-        idx += 1
-        start_ms += step_ms
 
-    return chunks
+def chunk_audio_ffmpeg(
+    input_path: str | Path,
+    output_dir: str | Path,
+    *,
+    chunk_seconds: int = 60,
+    overlap_seconds: int = 2,
+) -> list[AudioChunk]:
+    """Split audio into overlapping 16 kHz mono WAV chunks.
+
+    The input is decoded by a single ffmpeg process and windows are sliced
+    in-process, instead of one seeking ffmpeg (plus an ffprobe) per chunk.
+    """
+    input_path = Path(input_path)
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    _validate_window(chunk_seconds, overlap_seconds)
 
+    chunks: list[AudioChunk] = []
+    with span("ffmpeg.chunk_audio") as trace:
+        windows = stream_pcm_windows(
+            input_path, chunk_seconds=chunk_seconds, overlap_seconds=overlap_seconds
+        )
+        for idx, window in enumerate(windows):
+            out_path = output_dir / f"chunk_{idx:04d}_{window.start_ms}_{window.end_ms}.wav"
+            write_wav(out_path, window.pcm)
+            chunks.append(AudioChunk(start_ms=window.start_ms, end_ms=window.end_ms, path=out_path))
+        trace["chunks"] = len(chunks)
+    count("ffmpeg.wav_bytes_written", sum(c.path.stat().st_size for c in chunks))
+    return chunks
@@ -7,11 +7,14 @@ Standardized interface for parent skills to invoke this skill.
 from __future__ import annotations
 
 import json
+import os
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
 from typing import Any, Literal
 
+from .errors import SkillError, exit_code_for_error
+
 
 class ExitCode(Enum):
     SUCCESS = 0
@@ -43,6 +46,24 @@ class SubtitleOutput:
             },
         }
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> SubtitleOutput:
+        files = data.get("files") or {}
+
+        def path(key: str) -> Path | None:
+            value = files.get(key)
+            return Path(value) if value else None
+
+        return cls(
+            video_id=data["video_id"],
+            title=data.get("title"),
+            transcript_md=path("transcript"),
+            srt_file=path("srt"),
+            vtt_file=path("vtt"),
+            summary_json=path("summary_json"),
+            summary_md=path("summary_md"),
+        )
+
 
 @dataclass
 class ExecutionResult:
@@ -69,10 +90,43 @@ class ExecutionResult:
     def to_json(self) -> str:
         return json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
 
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ExecutionResult:
+        """Inverse of :meth:`to_dict`; also accepts the CLI's ``{"exit_code", "error"}`` payload."""
+        code = data.get("exit_code")
+        exit_code = ExitCode(code) if code in (0, 1, 2, 3) else ExitCode.FATAL_ERROR
+        errors = list(data.get("errors") or [])
+        if data.get("error"):
+            errors.append(data["error"])
+        return cls(
+            exit_code=exit_code,
+            output=SubtitleOutput.from_dict(data["output"]) if data.get("output") else None,
+            errors=errors,
+            warnings=list(data.get("warnings") or []),
+            metadata=dict(data.get("metadata") or {}),
+        )
+
     def write_manifest(self, path: Path) -> None:
         path.write_text(self.to_json(), encoding="utf-8")
 
 
+def execution_result_for_error(
+    error: Exception, *, url: str | None = None
+) -> ExecutionResult:
+    """Wrap a failed extraction in an ExecutionResult (used by batch mode)."""
+    if isinstance(error, SkillError):
+        exit_code = ExitCode(exit_code_for_error(error))
+        payload = error.to_json()
+    else:
+        exit_code = ExitCode.FATAL_ERROR
+        payload = {"code": "E999", "message": str(error)}
+    return ExecutionResult(
+        exit_code=exit_code,
+        errors=[payload],
+        metadata={"url": url} if url else {},
+    )
+
+
 def build_cli_command(
     url_or_id: str,
     output_dir: str | Path,
@@ -106,6 +160,99 @@ def build_cli_command(
     return cmd
 
 
+SERVER_URL_ENV = "BILIBILI_SUBTITLE_SERVER"
+DEFAULT_SERVER_URL = "http://127.0.0.1:8765"
+
+
+def extract_video(
+    url_or_id: str,
+    output_dir: str | Path,
+    *,
+    skip_proofread: bool = False,
+    skip_summary: bool = True,
+    output_lang: Literal["zh", "en", "zh+en"] = "zh",
+    cache_dir: str | Path | None = None,
+    server_url: str | None = None,
+    fallback: bool = True,
+    timeout: float | None = None,
+) -> ExecutionResult:
+    """Extract one video via the resident service, else via a CLI subprocess.
+
+    Takes the same options as :func:`build_cli_command`. The service at
+    ``server_url`` (default ``$BILIBILI_SUBTITLE_SERVER`` or
+    ``http://127.0.0.1:8765``, see ``--serve``) is tried first; if it cannot
+    be reached and ``fallback`` is true, the CLI is run with ``--json-output``.
+    Either way the result is the same ``ExecutionResult``. If either takes
+    longer than ``timeout`` seconds, a recoverable-error result is returned;
+    a service that accepted the job and then timed out is not retried via
+    the CLI, since it is still working on the same video.
+    """
+    import urllib.error
+    import urllib.request
+
+    payload: dict[str, Any] = {
+        "url": url_or_id,
+        "output_dir": str(output_dir),
+        "output_lang": output_lang,
+        "skip_proofread": skip_proofread,
+        "skip_summary": skip_summary,
+    }
+    if cache_dir:
+        payload["cache_dir"] = str(cache_dir)
+
+    base = (server_url or os.environ.get(SERVER_URL_ENV) or DEFAULT_SERVER_URL).rstrip("/")
+    request = urllib.request.Request(
+        f"{base}/extract",
+        data=json.dumps(payload, ensure_ascii=False).encode("utf-8"),
+        headers={"Content-Type": "application/json"},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as resp:
+            return ExecutionResult.from_dict(json.loads(resp.read()))
+    except urllib.error.HTTPError as e:
+        # The service is up but rejected the request: don't retry via the CLI.
+        detail = e.read().decode("utf-8", errors="replace")
+        return ExecutionResult(
+            exit_code=ExitCode.FATAL_ERROR,
+            errors=[{"code": "E999", "message": f"HTTP {e.code}: {detail}"}],
+            metadata={"url": url_or_id},
+        )
+    except TimeoutError:
+        # Connect timeouts arrive as URLError; this is a reply that never came.
+        return _timeout_result(url_or_id, f"the service at {base}", timeout)
+    except (urllib.error.URLError, ConnectionError):
+        if not fallback:
+            raise
+
+    import subprocess
+
+    cmd = build_cli_command(
+        url_or_id,
+        output_dir,
+        skip_proofread=skip_proofread,
+        skip_summary=skip_summary,
+        output_lang=output_lang,
+        cache_dir=cache_dir,
+    )
+    try:
+        proc = subprocess.run(cmd + ["--json-output"], capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        return _timeout_result(url_or_id, "the CLI", timeout)
+    try:
+        return ExecutionResult.from_dict(json.loads(proc.stdout))
+    except (json.JSONDecodeError, KeyError, TypeError):
+        return parse_execution_result(Path(output_dir), proc.returncode, proc.stderr)
+
+
+def _timeout_result(url_or_id: str, what: str, timeout: float | None) -> ExecutionResult:
+    return ExecutionResult(
+        exit_code=ExitCode.RECOVERABLE_ERROR,
+        errors=[{"code": "E999", "message": f"Timed out after {timeout}s waiting for {what}"}],
+        metadata={"url": url_or_id},
+    )
+
+
 def parse_execution_result(
     output_dir: Path, exit_code: int, stderr: str = ""
 ) -> ExecutionResult:
@@ -1,39 +1,125 @@
 from __future__ import annotations
 
-import re
+from collections.abc import Iterable, Iterator
+from itertools import chain
 
 from ..segment import Segment
+from ..segment_table import _segment_unchecked
 
+_VTT_NON_CUE_BLOCKS = ("NOTE", "STYLE", "REGION")
 
-_TIME_RE = re.compile(
-    r"(?P<sh>\d{2}):(?P<sm>\d{2}):(?P<ss>\d{2}),(?P<sms>\d{3})\s*-->\s*"
-    r"(?P<eh>\d{2}):(?P<em>\d{2}):(?P<es>\d{2}),(?P<ems>\d{3})"
-)
 
+def _parse_timestamp(ts: str) -> int | None:
+    """Parse ``[H+:]MM:SS(,|.)mmm`` into milliseconds, or None if malformed.
 
-def _to_ms(h: str, m: str, s: str, ms: str) -> int:
-    return (int(h) * 3600 + int(m) * 60 + int(s)) * 1000 + int(ms)
+    Fields sit at fixed offsets from the end of the string, so the digits are
+    sliced into a single ``HMMSSmmm`` integer and split with integer
+    arithmetic instead of matching a regex.
+    """
+    n = len(ts)
+    if n < 9 or ts[-4] not in ",." or ts[-7] != ":" or (n > 9 and (n == 10 or ts[-10] != ":")):
+        return None
+    digits = ts[:-10] + ts[-9:-7] + ts[-6:-4] + ts[-3:]
+    if not (digits.isascii() and digits.isdigit()):
+        return None
+    return _packed_to_ms(int(digits))
+
+
+def _packed_to_ms(v: int) -> int:
+    """``HHMMSSmmm`` packed decimal -> milliseconds.
+
+    Each hour is worth 10_000_000 packed but 3_600_000 ms, each minute 100_000
+    packed but 60_000 ms; subtract the differences.
+    """
+    return v - v // 10_000_000 * 6_400_000 - v // 100_000 % 100 * 40_000
+
+
+def _parse_timing(line: str) -> tuple[int, int] | None:
+    """Parse ``start --> end [cue settings]``."""
+    if len(line) == 29 and line[12:17] == " --> ":
+        # Canonical ``HH:MM:SS,mmm --> HH:MM:SS,mmm``: both timestamps in one int.
+        digits = (
+            line[0:2] + line[3:5] + line[6:8] + line[9:12]
+            + line[17:19] + line[20:22] + line[23:25] + line[26:29]
+        )
+        if (
+            line[2] == line[5] == line[19] == line[22] == ":"
+            and line[8] in ",."
+            and line[25] in ",."
+            and digits.isascii()
+            and digits.isdigit()
+        ):
+            s, e = divmod(int(digits), 1_000_000_000)
+            return (
+                s - s // 10_000_000 * 6_400_000 - s // 100_000 % 100 * 40_000,
+                e - e // 10_000_000 * 6_400_000 - e // 100_000 % 100 * 40_000,
+            )
+
+    left, sep, right = line.partition("-->")
+    if not sep:
+        return None
+    left_tokens = left.split()
+    right_tokens = right.split(None, 1)
+    if not left_tokens or not right_tokens:
+        return None
+    start_ms = _parse_timestamp(left_tokens[-1])
+    end_ms = _parse_timestamp(right_tokens[0])
+    if start_ms is None or end_ms is None:
+        return None
+    return start_ms, end_ms
+
+
+def _parse_block(block: list[str]) -> Segment | None:
+    head = block[0]
+    if "-->" in head:
+        timing_line, body = head, block[1:]
+    elif len(block) >= 2 and "-->" in block[1] and not head.startswith(_VTT_NON_CUE_BLOCKS):
+        # Numeric SRT index or VTT cue identifier.
+        timing_line, body = block[1], block[2:]
+    else:
+        return None  # WEBVTT header, NOTE/STYLE/REGION, or garbage
+
+    timing = _parse_timing(timing_line)
+    if timing is None:
+        return None
+    start_ms, end_ms = timing
+    text = " ".join(" ".join(body).split())
+    if not text or start_ms >= end_ms:
+        return None
+    # Timestamps are non-negative by construction and the checks above cover
+    # the rest of Segment's validation.
+    return _segment_unchecked(start_ms, end_ms, text)
+
+
+def iter_subtitle_segments(lines: Iterable[str]) -> Iterator[Segment]:
+    """Parse SRT or WebVTT cues from an iterable of lines in a single pass.
+
+    Accepts ``,`` or ``.`` before milliseconds, optional hours, VTT cue
+    settings, cue identifiers, NOTE/STYLE/REGION blocks and a leading BOM.
+    Lines may keep their line endings (e.g. a file object). Cues without text
+    or with a non-positive duration are skipped.
+    """
+    it = iter(lines)
+    first = next(it, None)
+    if first is None:
+        return
+    block: list[str] = []
+    # A trailing "" flushes the last block.
+    for line in chain((first.lstrip("\ufeff"),), it, ("",)):
+        line = line.rstrip("\r\n")
+        if not line:
+            if block:
+                seg = _parse_block(block)
+                if seg is not None:
+                    yield seg
+                block = []
+        elif not line.isspace():
+            block.append(line)
 
 
 def srt_to_segments(srt_text: str) -> list[Segment]:
-    blocks = re.split(r"\r?\n\r?\n+", srt_text.strip())
-    segments: list[Segment] = []
-    for block in blocks:
-        lines = [ln.strip("\r") for ln in block.splitlines() if ln.strip("\r").strip()]
-        if len(lines) < 2:
-            continue
-
-        # Optional numeric index line.
-        time_line = lines[1] if lines[0].isdigit() else lines[0]
-        m = _TIME_RE.search(time_line)
-        if not m:
-            continue
-
-        start_ms = _to_ms(m["sh"], m["sm"], m["ss"], m["sms"])
-        end_ms = _to_ms(m["eh"], m["em"], m["es"], m["ems"])
-        text_lines = lines[2:] if lines[0].isdigit() else lines[1:]
-        text = " ".join(" ".join(text_lines).replace("\n", " ").split())
-        segments.append(Segment(start_ms=start_ms, end_ms=end_ms, text=text))
-
-    return segments
+    return list(iter_subtitle_segments(srt_text.split("\n")))
+
 
+def vtt_to_segments(vtt_text: str) -> list[Segment]:
+    return list(iter_subtitle_segments(vtt_text.split("\n")))
@@ -3,7 +3,7 @@ from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
 
-from .bbdown_client import BBDownClient
+from .bbdown_client import DEFAULT_INFO_TTL_SECONDS, BBDownClient
 from .url_parser import VideoRef, parse_bilibili_ref
 
 
@@ -19,12 +19,14 @@ class VideoMetadata:
 def detect_subtitles(
     url_or_id: str,
     output_dir: str | Path,
+    *,
+    info_cache_ttl: float | None = DEFAULT_INFO_TTL_SECONDS,
 ) -> tuple[VideoRef, VideoMetadata]:
     ref = parse_bilibili_ref(url_or_id)
     url = ref.canonical_url or ref.input_value
     output_dir = Path(output_dir)
 
-    client = BBDownClient()
+    client = BBDownClient(info_cache_ttl=info_cache_ttl)
     info = client.get_video_info(url, output_dir)
 
     meta = VideoMetadata(
@@ -4,6 +4,7 @@ import difflib
 from dataclasses import dataclass
 
 from .segment import Segment
+from .segment_table import SegmentTable
 
 
 @dataclass(frozen=True, slots=True)
@@ -24,12 +25,126 @@ def _similarity(a: str, b: str) -> float:
     return difflib.SequenceMatcher(None, a, b).ratio()
 
 
+class _OverlapMatcher:
+    """Similarity test against one existing segment, with cheap upper-bound prefilters.
+
+    ``real_quick_ratio`` (length only) and ``quick_ratio`` (character multiset)
+    are upper bounds of ``ratio``, so rejecting on them never changes the
+    result. The candidate text is set as ``seq2`` once, so difflib's index of
+    it is reused for every new segment compared against it.
+    """
+
+    __slots__ = ("segment", "_matcher")
+
+    def __init__(self, segment: Segment) -> None:
+        self.segment = segment
+        self._matcher: difflib.SequenceMatcher[str] | None = None
+
+    def similar(self, text: str, threshold: float) -> bool:
+        if self._matcher is None:
+            self._matcher = difflib.SequenceMatcher(None, "", self.segment.text)
+        m = self._matcher
+        m.set_seq1(text)
+        return (
+            m.real_quick_ratio() >= threshold
+            and m.quick_ratio() >= threshold
+            and m.ratio() >= threshold
+        )
+
+
 def _shift_segments(segments: list[Segment], offset_ms: int) -> list[Segment]:
     if offset_ms == 0:
         return segments
-    return [
-        Segment(start_ms=s.start_ms + offset_ms, end_ms=s.end_ms + offset_ms, text=s.text) for s in segments
-    ]
+    return SegmentTable.from_segments(segments).shift(offset_ms).to_segments()
+
+
+class ChunkMerger:
+    """Incrementally merge chunk transcripts, emitting segments as soon as they are final.
+
+    Chunks are identified by their position ``index`` (0, 1, 2, ...) and may be
+    added in any order; out-of-order chunks are buffered until every earlier
+    chunk has arrived. Later chunks start at or after the next chunk's start,
+    so once chunk ``k + 1`` is known every pending segment starting before it
+    is settled and is returned sorted and clamped to be strictly monotonic.
+    Feeding all chunks and then calling :meth:`finish` yields exactly what
+    :func:`merge_chunk_transcripts` returns.
+    """
+
+    def __init__(self, *, overlap_ms: int = 2000, similarity_threshold: float = 0.8) -> None:
+        self._overlap_ms = max(0, overlap_ms)
+        self._threshold = similarity_threshold
+        self._buffered: dict[int, ChunkTranscript] = {}
+        self._seen: set[int] = set()
+        self._next_index = 0
+        self._last_start_ms: int | None = None
+        self._active: list[_OverlapMatcher] = []
+        self._pending: list[Segment] = []
+        self._prev_end_ms = 0
+
+    def add(self, index: int, transcript: ChunkTranscript) -> list[Segment]:
+        """Add chunk ``index`` and return the segments that became final."""
+        if index < 0:
+            raise ValueError("index must be >= 0.")
+        if index in self._seen:
+            raise ValueError(f"Chunk {index} was already added.")
+        self._seen.add(index)
+        self._buffered[index] = transcript
+
+        out: list[Segment] = []
+        while self._next_index in self._buffered:
+            out.extend(self._consume(self._buffered.pop(self._next_index)))
+            self._next_index += 1
+        return out
+
+    def finish(self) -> list[Segment]:
+        """Merge any chunks still buffered behind a gap and flush the remaining segments."""
+        out: list[Segment] = []
+        for index in sorted(self._buffered):
+            out.extend(self._consume(self._buffered.pop(index)))
+        out.extend(self._settle(None))
+        validate_strictly_increasing(out)
+        return out
+
+    def _consume(self, t: ChunkTranscript) -> list[Segment]:
+        if self._last_start_ms is not None and t.chunk_start_ms < self._last_start_ms:
+            raise ValueError("Chunk start times must not decrease with the chunk index.")
+        self._last_start_ms = t.chunk_start_ms
+
+        ready = self._settle(t.chunk_start_ms)
+        shifted = _shift_segments(t.segments, t.chunk_start_ms)
+        overlap_start = t.chunk_start_ms
+        overlap_end = overlap_start + self._overlap_ms
+        # Chunk starts only increase, so anything ending at or before the current
+        # chunk start can never be a candidate again.
+        self._active = [m for m in self._active if m.segment.end_ms > overlap_start]
+        candidates = [m for m in self._active if m.segment.start_ms < overlap_end]
+
+        for seg in shifted:
+            if seg.start_ms < overlap_end and any(
+                max(seg.start_ms, c.segment.start_ms) < min(seg.end_ms, c.segment.end_ms)
+                and c.similar(seg.text, self._threshold)
+                for c in candidates
+            ):
+                continue
+            self._pending.append(seg)
+            self._active.append(_OverlapMatcher(seg))
+        return ready
+
+    def _settle(self, boundary_ms: int | None) -> list[Segment]:
+        """Sort, clamp and release pending segments starting before ``boundary_ms`` (all if None)."""
+        if boundary_ms is None:
+            ready, self._pending = self._pending, []
+        else:
+            ready = [s for s in self._pending if s.start_ms < boundary_ms]
+            self._pending = [s for s in self._pending if s.start_ms >= boundary_ms]
+        if not ready:
+            return []
+        ready.sort(key=lambda s: (s.start_ms, s.end_ms))
+        table = SegmentTable.from_segments(ready)
+        # Enforce strict monotonicity by clamping any overlap forward.
+        fixed = table.clamp_monotonic(initial_end_ms=self._prev_end_ms).to_segments()
+        self._prev_end_ms = max(self._prev_end_ms, max(table.ends))
+        return fixed
 
 
 def merge_chunk_transcripts(
@@ -38,51 +153,10 @@ def merge_chunk_transcripts(
     overlap_ms: int = 2000,
     similarity_threshold: float = 0.8,
 ) -> list[Segment]:
-    if not transcripts:
-        return []
-
-    transcripts = sorted(transcripts, key=lambda t: t.chunk_start_ms)
+    merger = ChunkMerger(overlap_ms=overlap_ms, similarity_threshold=similarity_threshold)
     merged: list[Segment] = []
-
-    for t in transcripts:
-        shifted = _shift_segments(t.segments, t.chunk_start_ms)
-        if not merged:
-            merged.extend(shifted)
-            continue
-
-        overlap_start = t.chunk_start_ms
-        overlap_end = overlap_start + max(0, overlap_ms)
-        candidates = [s for s in merged if s.end_ms > overlap_start and s.start_ms < overlap_end]
-
-        def is_duplicate(seg: Segment) -> bool:
-            if seg.start_ms >= overlap_end:
-                return False
-            for cand in candidates:
-                time_overlaps = max(seg.start_ms, cand.start_ms) < min(seg.end_ms, cand.end_ms)
-                if not time_overlaps:
-                    continue
-                if _similarity(seg.text, cand.text) >= similarity_threshold:
-                    return True
-            return False
-
-        for seg in shifted:
-            if is_duplicate(seg):
-                continue
-            merged.append(seg)
-
-    merged.sort(key=lambda s: (s.start_ms, s.end_ms))
-
-    # Enforce strict monotonicity by clamping any overlap forward.
-    fixed: list[Segment] = []
-    prev_end = 0
-    for seg in merged:
-        start_ms = max(seg.start_ms, prev_end)
-        if start_ms >= seg.end_ms:
-            continue
-        if start_ms != seg.start_ms:
-            seg = Segment(start_ms=start_ms, end_ms=seg.end_ms, text=seg.text)
-        fixed.append(seg)
-        prev_end = seg.end_ms
-
-    validate_strictly_increasing(fixed)
-    return fixed
+    for index, t in enumerate(sorted(transcripts, key=lambda t: t.chunk_start_ms)):
+        merged.extend(merger.add(index, t))
+    merged.extend(merger.finish())
+    validate_strictly_increasing(merged)
+    return merged
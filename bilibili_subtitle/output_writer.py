@@ -0,0 +1,155 @@
+"""
+Atomic output files: temp-file-and-rename, hashed while writing.
+
+A crash mid-write leaves only a hidden ``.<name>.*.tmp`` file behind, never a
+truncated artifact under the final name.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from collections.abc import Iterator, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from .errors import OutputWriteError
+
+_FLUSH_SIZE = 1 << 16
+
+
+def _process_umask() -> int:
+    # Linux reports the umask in /proc without changing it. Elsewhere it can
+    # only be read by setting it, which briefly affects files other threads
+    # create: import this module on the main thread before starting workers.
+    try:
+        with open("/proc/self/status", encoding="ascii") as f:
+            for line in f:
+                if line.startswith("Umask:"):
+                    return int(line.split()[1], 8)
+    except (OSError, ValueError, IndexError):
+        pass
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# mkstemp creates 0600 files; give outputs the mode open() would have.
+_FILE_MODE = 0o666 & ~_process_umask()
+
+
+@dataclass(frozen=True, slots=True)
+class WrittenFile:
+    path: Path
+    size: int
+    sha256: str
+
+    def to_json(self) -> dict[str, Any]:
+        return {"path": str(self.path), "size": self.size, "sha256": self.sha256}
+
+
+class AtomicOutput:
+    """UTF-8 text sink backed by a temp file next to ``path``.
+
+    Text is encoded, hashed and counted as it is written. :meth:`commit`
+    fsyncs the temp file and renames it over ``path``; :meth:`discard`
+    removes it. OS errors surface as :class:`OutputWriteError`.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._hash = hashlib.sha256()
+        self._size = 0
+        self._buf: list[bytes] = []
+        self._buffered = 0
+        try:
+            fd, tmp = tempfile.mkstemp(
+                dir=self.path.parent, prefix=f".{self.path.name}.", suffix=".tmp"
+            )
+        except OSError as e:
+            raise OutputWriteError(str(self.path), str(e)) from e
+        self._tmp = Path(tmp)
+        self._file = os.fdopen(fd, "wb", buffering=0)
+        if os.name == "posix":
+            os.fchmod(fd, _FILE_MODE)
+        self.written: WrittenFile | None = None
+
+    def write(self, s: str) -> None:
+        data = s.encode("utf-8")
+        self._hash.update(data)
+        self._size += len(data)
+        self._buf.append(data)
+        self._buffered += len(data)
+        if self._buffered >= _FLUSH_SIZE:
+            self._flush()
+
+    def _flush(self) -> None:
+        if not self._buf:
+            return
+        try:
+            self._file.write(b"".join(self._buf))
+        except OSError as e:
+            raise OutputWriteError(str(self.path), str(e)) from e
+        self._buf.clear()
+        self._buffered = 0
+
+    def commit(self) -> WrittenFile:
+        try:
+            self._flush()
+            os.fsync(self._file.fileno())
+            self._file.close()
+            os.replace(self._tmp, self.path)
+        except OSError as e:
+            self.discard()
+            raise OutputWriteError(str(self.path), str(e)) from e
+        self.written = WrittenFile(path=self.path, size=self._size, sha256=self._hash.hexdigest())
+        return self.written
+
+    def discard(self) -> None:
+        self._file.close()
+        self._tmp.unlink(missing_ok=True)
+
+
+@contextmanager
+def atomic_outputs(*paths: Path) -> Iterator[list[AtomicOutput]]:
+    """Open one AtomicOutput per path; commit them all on success, discard them all on error.
+
+    After the ``with`` block each output's ``written`` holds its size and hash.
+    """
+    outputs: list[AtomicOutput] = []
+    try:
+        for p in paths:
+            outputs.append(AtomicOutput(p))
+        yield outputs
+        for out in outputs:
+            out.commit()
+    except BaseException:
+        for out in outputs:
+            if out.written is None:
+                out.discard()
+        raise
+
+
+def write_text_atomic(path: str | Path, text: str) -> WrittenFile:
+    out = AtomicOutput(path)
+    try:
+        out.write(text)
+    except BaseException:
+        out.discard()
+        raise
+    return out.commit()
+
+
+def write_texts_atomic(
+    files: Mapping[Path, str], *, max_workers: int = 4
+) -> dict[Path, WrittenFile]:
+    """Atomically write several small files, concurrently on a small thread pool."""
+    if len(files) <= 1 or max_workers <= 1:
+        return {path: write_text_atomic(path, text) for path, text in files.items()}
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(files))) as pool:
+        futures = {path: pool.submit(write_text_atomic, path, text) for path, text in files.items()}
+        return {path: fut.result() for path, fut in futures.items()}
@@ -8,6 +8,7 @@ Usage:
 
 from __future__ import annotations
 
+import importlib.util
 import json
 import os
 import shutil
@@ -230,16 +231,9 @@ def check_dashscope_key() -> CheckResult:
 
 
 def check_python_deps() -> CheckResult:
-    missing: list[str] = []
-    try:
-        import anthropic  # noqa: F401
-    except ImportError:
-        missing.append("anthropic")
-
-    try:
-        import dashscope  # noqa: F401
-    except ImportError:
-        missing.append("dashscope")
+    # find_spec locates the packages without importing them; importing the
+    # SDKs would dominate the run time of --check.
+    missing = [name for name in ("anthropic", "dashscope") if importlib.util.find_spec(name) is None]
 
     if not missing:
         return CheckResult(
@@ -21,3 +21,13 @@ def format_timestamp_vtt(ms: int) -> str:
     seconds = total_seconds % 60
     milliseconds = ms % 1000
     return f"{hours:02d}:{minutes:02d}:{seconds:02d}.{milliseconds:03d}"
+
+
+def format_timestamp_pair(ms: int) -> tuple[str, str]:
+    """Format milliseconds as ``(SRT, VTT)`` timestamps from one H/M/S decomposition."""
+    total_seconds, milliseconds = divmod(ms, 1000)
+    minutes, seconds = divmod(total_seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    hms = f"{hours:02d}:{minutes:02d}:{seconds:02d}"
+    frac = f"{milliseconds:03d}"
+    return f"{hms},{frac}", f"{hms}.{frac}"
@@ -0,0 +1,68 @@
+"""Shared helpers for streaming renderers."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Iterator, Sized
+from typing import Protocol
+
+from ..segment import Segment
+
+
+class TextSink(Protocol):
+    def write(self, s: str, /) -> object: ...
+
+
+class NewlineHoldingWriter:
+    """Write through to ``stream`` while holding back trailing newlines.
+
+    Newlines are only emitted once more text follows them, and :meth:`finish`
+    writes exactly one. The output therefore equals
+    ``"".join(pieces).rstrip("\\n") + "\\n"`` without building the joined string.
+    """
+
+    __slots__ = ("_stream", "_pending")
+
+    def __init__(self, stream: TextSink) -> None:
+        self._stream = stream
+        self._pending = 0
+
+    def write(self, s: str) -> None:
+        body = s.rstrip("\n")
+        if body:
+            self._stream.write("\n" * self._pending + body if self._pending else body)
+            self._pending = len(s) - len(body)
+        else:
+            self._pending += len(s)
+
+    def finish(self) -> None:
+        self._stream.write("\n")
+
+
+_LENGTH_MISMATCH = "Bilingual output requires equal-length zh/en segment lists."
+
+
+def iter_cues(
+    segments_zh: Iterable[Segment], segments_en: Iterable[Segment] | None
+) -> Iterator[tuple[Segment, Segment | None]]:
+    """Pair zh/en segments, validating bilingual input as it streams."""
+    if segments_en is None:
+        for zh in segments_zh:
+            yield zh, None
+        return
+    if isinstance(segments_zh, Sized) and isinstance(segments_en, Sized):
+        if len(segments_en) != len(segments_zh):
+            raise ValueError(_LENGTH_MISMATCH)
+    en_iter = iter(segments_en)
+    for zh in segments_zh:
+        en = next(en_iter, None)
+        if en is None:
+            raise ValueError(_LENGTH_MISMATCH)
+        if (en.start_ms, en.end_ms) != (zh.start_ms, zh.end_ms):
+            raise ValueError("Bilingual zh/en segments must share timestamps.")
+        yield zh, en
+    if next(en_iter, None) is not None:
+        raise ValueError(_LENGTH_MISMATCH)
+
+
+def cue_text(zh: Segment, en: Segment | None, sep: str = "\n") -> str:
+    return zh.text if en is None else f"{zh.text}{sep}{en.text}"
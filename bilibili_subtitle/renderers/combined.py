@@ -0,0 +1,78 @@
+"""Render several subtitle formats in a single pass over the segments."""
+
+from __future__ import annotations
+
+import io
+from collections.abc import Iterable
+from dataclasses import dataclass
+
+from ..segment import Segment
+from ._time import format_timestamp_pair
+from ._writer import NewlineHoldingWriter, TextSink, cue_text, iter_cues
+from .markdown import format_markdown_cue, format_markdown_header
+from .srt import format_srt_cue
+from .vtt import VTT_HEADER, format_vtt_cue
+
+
+@dataclass(frozen=True, slots=True)
+class RenderedTranscript:
+    srt: str
+    vtt: str
+    markdown: str
+
+
+def write_all(
+    segments_zh: Iterable[Segment],
+    *,
+    srt: TextSink | None = None,
+    vtt: TextSink | None = None,
+    markdown: TextSink | None = None,
+    segments_en: Iterable[Segment] | None = None,
+    title: str | None = None,
+) -> None:
+    """Stream SRT, VTT and/or Markdown output while iterating the segments once.
+
+    Each boundary is decomposed into H/M/S/ms once and both timestamp styles
+    are derived from it; a cue starting where the previous one ended reuses
+    the already formatted end. ``segments_zh`` may be a generator; each stream
+    receives the same text the matching ``render_*`` function would return.
+    """
+    srt_out = NewlineHoldingWriter(srt) if srt is not None else None
+    vtt_out = NewlineHoldingWriter(vtt) if vtt is not None else None
+    md_out = NewlineHoldingWriter(markdown) if markdown is not None else None
+
+    if vtt_out is not None:
+        vtt_out.write(VTT_HEADER)
+    if md_out is not None:
+        md_out.write(format_markdown_header(title))
+
+    prev_end_ms = -1
+    prev_end: tuple[str, str] = ("", "")
+    for idx, (zh, en) in enumerate(iter_cues(segments_zh, segments_en), start=1):
+        start = prev_end if zh.start_ms == prev_end_ms else format_timestamp_pair(zh.start_ms)
+        end = format_timestamp_pair(zh.end_ms)
+        prev_end_ms, prev_end = zh.end_ms, end
+
+        text = cue_text(zh, en)
+        if srt_out is not None:
+            srt_out.write(format_srt_cue(idx, start[0], end[0], text))
+        if vtt_out is not None:
+            vtt_out.write(format_vtt_cue(start[1], end[1], text))
+        if md_out is not None:
+            md_out.write(format_markdown_cue(start[1], end[1], cue_text(zh, en, "\n\n")))
+
+    for out in (srt_out, vtt_out, md_out):
+        if out is not None:
+            out.finish()
+
+
+def render_all_formats(
+    segments_zh: Iterable[Segment],
+    *,
+    segments_en: Iterable[Segment] | None = None,
+    title: str | None = None,
+) -> RenderedTranscript:
+    """Render SRT, VTT and Markdown strings in one traversal of the segments."""
+    srt, vtt, md = io.StringIO(), io.StringIO(), io.StringIO()
+    write_all(segments_zh, srt=srt, vtt=vtt, markdown=md, segments_en=segments_en, title=title)
+    return RenderedTranscript(srt=srt.getvalue(), vtt=vtt.getvalue(), markdown=md.getvalue())
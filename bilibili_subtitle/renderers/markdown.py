@@ -1,7 +1,40 @@
 from __future__ import annotations
 
+import io
+from collections.abc import Iterable
+
 from ..segment import Segment
 from ._time import format_timestamp_vtt
+from ._writer import NewlineHoldingWriter, TextSink, cue_text, iter_cues
+
+
+def format_markdown_header(title: str | None) -> str:
+    return f"# {title}\n\n" if title else ""
+
+
+def format_markdown_cue(start: str, end: str, text: str) -> str:
+    return f"## {start} - {end}\n{text}\n\n"
+
+
+def write_transcript_markdown(
+    segments_zh: Iterable[Segment],
+    stream: TextSink,
+    *,
+    segments_en: Iterable[Segment] | None = None,
+    title: str | None = None,
+) -> None:
+    """Stream the Markdown transcript to ``stream`` one section at a time."""
+    out = NewlineHoldingWriter(stream)
+    out.write(format_markdown_header(title))
+    for zh, en in iter_cues(segments_zh, segments_en):
+        out.write(
+            format_markdown_cue(
+                format_timestamp_vtt(zh.start_ms),
+                format_timestamp_vtt(zh.end_ms),
+                cue_text(zh, en, "\n\n"),
+            )
+        )
+    out.finish()
 
 
 def render_transcript_markdown(
@@ -10,27 +43,6 @@ def render_transcript_markdown(
     segments_en: list[Segment] | None = None,
     title: str | None = None,
 ) -> str:
-    if segments_en is not None and len(segments_en) != len(segments_zh):
-        raise ValueError("Bilingual output requires equal-length zh/en segment lists.")
-
-    lines: list[str] = []
-    if title:
-        lines.append(f"# {title}")
-        lines.append("")
-
-    for i, zh in enumerate(segments_zh):
-        start = format_timestamp_vtt(zh.start_ms)
-        end = format_timestamp_vtt(zh.end_ms)
-        if segments_en is not None:
-            en = segments_en[i]
-            if (en.start_ms, en.end_ms) != (zh.start_ms, zh.end_ms):
-                raise ValueError("Bilingual zh/en segments must share timestamps.")
-            text = f"{zh.text}\n\n{en.text}"
-        else:
-            text = zh.text
-        lines.append(f"## {start} - {end}")
-        lines.append(text)
-        lines.append("")
-
-    return "\n".join(lines).rstrip("\n") + "\n"
-
+    buf = io.StringIO()
+    write_transcript_markdown(segments_zh, buf, segments_en=segments_en, title=title)
+    return buf.getvalue()
@@ -1,30 +1,38 @@
 from __future__ import annotations
 
+import io
+from collections.abc import Iterable
+
 from ..segment import Segment
 from ._time import format_timestamp_srt
+from ._writer import NewlineHoldingWriter, TextSink, cue_text, iter_cues
 
 
-def render_srt(segments_zh: list[Segment], *, segments_en: list[Segment] | None = None) -> str:
-    if segments_en is not None and len(segments_en) != len(segments_zh):
-        raise ValueError("Bilingual output requires equal-length zh/en segment lists.")
-
-    lines: list[str] = []
-    for idx, zh in enumerate(segments_zh, start=1):
-        if segments_en is not None:
-            en = segments_en[idx - 1]
-            if (en.start_ms, en.end_ms) != (zh.start_ms, zh.end_ms):
-                raise ValueError("Bilingual zh/en segments must share timestamps.")
-            text = f"{zh.text}\n{en.text}"
-        else:
-            text = zh.text
-
-        lines.extend(
-            [
-                str(idx),
-                f"{format_timestamp_srt(zh.start_ms)} --> {format_timestamp_srt(zh.end_ms)}",
-                text,
-                "",
-            ]
+def format_srt_cue(idx: int, start: str, end: str, text: str) -> str:
+    return f"{idx}\n{start} --> {end}\n{text}\n\n"
+
+
+def write_srt(
+    segments_zh: Iterable[Segment],
+    stream: TextSink,
+    *,
+    segments_en: Iterable[Segment] | None = None,
+) -> None:
+    """Stream SRT cues to ``stream`` one at a time."""
+    out = NewlineHoldingWriter(stream)
+    for idx, (zh, en) in enumerate(iter_cues(segments_zh, segments_en), start=1):
+        out.write(
+            format_srt_cue(
+                idx,
+                format_timestamp_srt(zh.start_ms),
+                format_timestamp_srt(zh.end_ms),
+                cue_text(zh, en),
+            )
         )
-    return "\n".join(lines).rstrip("\n") + "\n"
+    out.finish()
+
 
+def render_srt(segments_zh: list[Segment], *, segments_en: list[Segment] | None = None) -> str:
+    buf = io.StringIO()
+    write_srt(segments_zh, buf, segments_en=segments_en)
+    return buf.getvalue()
@@ -1,29 +1,38 @@
 from __future__ import annotations
 
+import io
+from collections.abc import Iterable
+
 from ..segment import Segment
 from ._time import format_timestamp_vtt
+from ._writer import NewlineHoldingWriter, TextSink, cue_text, iter_cues
 
+VTT_HEADER = "WEBVTT\n\n"
 
-def render_vtt(segments_zh: list[Segment], *, segments_en: list[Segment] | None = None) -> str:
-    if segments_en is not None and len(segments_en) != len(segments_zh):
-        raise ValueError("Bilingual output requires equal-length zh/en segment lists.")
-
-    lines: list[str] = ["WEBVTT", ""]
-    for i, zh in enumerate(segments_zh):
-        if segments_en is not None:
-            en = segments_en[i]
-            if (en.start_ms, en.end_ms) != (zh.start_ms, zh.end_ms):
-                raise ValueError("Bilingual zh/en segments must share timestamps.")
-            text = f"{zh.text}\n{en.text}"
-        else:
-            text = zh.text
-
-        lines.extend(
-            [
-                f"{format_timestamp_vtt(zh.start_ms)} --> {format_timestamp_vtt(zh.end_ms)}",
-                text,
-                "",
-            ]
+
+def format_vtt_cue(start: str, end: str, text: str) -> str:
+    return f"{start} --> {end}\n{text}\n\n"
+
+
+def write_vtt(
+    segments_zh: Iterable[Segment],
+    stream: TextSink,
+    *,
+    segments_en: Iterable[Segment] | None = None,
+) -> None:
+    """Stream a WebVTT document to ``stream`` one cue at a time."""
+    out = NewlineHoldingWriter(stream)
+    out.write(VTT_HEADER)
+    for zh, en in iter_cues(segments_zh, segments_en):
+        out.write(
+            format_vtt_cue(
+                format_timestamp_vtt(zh.start_ms), format_timestamp_vtt(zh.end_ms), cue_text(zh, en)
+            )
         )
-    return "\n".join(lines).rstrip("\n") + "\n"
+    out.finish()
+
 
+def render_vtt(segments_zh: list[Segment], *, segments_en: list[Segment] | None = None) -> str:
+    buf = io.StringIO()
+    write_vtt(segments_zh, buf, segments_en=segments_en)
+    return buf.getvalue()
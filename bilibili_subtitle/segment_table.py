@@ -0,0 +1,126 @@
+"""Columnar, array-backed segment storage for large transcripts."""
+
+from __future__ import annotations
+
+import operator
+from array import array
+from collections.abc import Iterable, Iterator, Sequence
+from itertools import accumulate, compress
+
+from .segment import Segment
+
+_new = object.__new__
+_set = object.__setattr__
+
+
+def _segment_unchecked(start_ms: int, end_ms: int, text: str) -> Segment:
+    """Build a Segment without re-running __post_init__ (caller has validated)."""
+    seg = _new(Segment)
+    _set(seg, "start_ms", start_ms)
+    _set(seg, "end_ms", end_ms)
+    _set(seg, "text", text)
+    return seg
+
+
+class SegmentTable:
+    """Segments stored as ``array('q')`` start/end columns plus one pooled text string.
+
+    A 100k-cue transcript costs two int64 columns, one offsets column and a
+    single string, instead of 100k Segment objects with their own ints and
+    strings. Transforms return new tables and work column-wise; convert with
+    :meth:`from_segments` / :meth:`to_segments` at API boundaries.
+    """
+
+    __slots__ = ("_starts", "_ends", "_pool", "_offsets")
+
+    def __init__(self, starts: array, ends: array, pool: str, offsets: array) -> None:
+        if not (len(starts) == len(ends) == len(offsets) - 1):
+            raise ValueError("starts/ends/offsets lengths do not match.")
+        self._starts = starts
+        self._ends = ends
+        self._pool = pool
+        self._offsets = offsets
+
+    @classmethod
+    def from_columns(
+        cls, starts: Iterable[int], ends: Iterable[int], texts: Sequence[str]
+    ) -> SegmentTable:
+        offsets = array("q", accumulate(map(len, texts), initial=0))
+        return cls(array("q", starts), array("q", ends), "".join(texts), offsets)
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[Segment]) -> SegmentTable:
+        segments = segments if isinstance(segments, Sequence) else list(segments)
+        return cls.from_columns(
+            (s.start_ms for s in segments),
+            (s.end_ms for s in segments),
+            [s.text for s in segments],
+        )
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    @property
+    def starts(self) -> array:
+        return self._starts
+
+    @property
+    def ends(self) -> array:
+        return self._ends
+
+    def text(self, i: int) -> str:
+        return self._pool[self._offsets[i] : self._offsets[i + 1]]
+
+    def texts(self) -> Iterator[str]:
+        pool, offsets = self._pool, self._offsets
+        return (pool[a:b] for a, b in zip(offsets, offsets[1:]))
+
+    def __getitem__(self, i: int) -> Segment:
+        if i < 0:
+            i += len(self)
+        return Segment(start_ms=self._starts[i], end_ms=self._ends[i], text=self.text(i))
+
+    def shift(self, offset_ms: int) -> SegmentTable:
+        """Add ``offset_ms`` to every start/end; the text pool is shared."""
+        if offset_ms == 0:
+            return self
+        add = offset_ms.__add__
+        return SegmentTable(
+            array("q", map(add, self._starts)),
+            array("q", map(add, self._ends)),
+            self._pool,
+            self._offsets,
+        )
+
+    def clamp_monotonic(self, *, initial_end_ms: int = 0) -> SegmentTable:
+        """Clamp each start forward to the previous end, dropping cues that collapse.
+
+        Expects rows sorted by ``(start_ms, end_ms)``. Matches the overlap fix in
+        ``merge_chunk_transcripts``: a dropped row never raises the running end,
+        so the running end is simply the prefix maximum of ``ends``.
+        """
+        prev_ends = accumulate(self._ends, max, initial=initial_end_ms)
+        new_starts = list(map(max, self._starts, prev_ends))
+        keep = list(map(operator.lt, new_starts, self._ends))
+        if all(keep) and new_starts == self._starts.tolist():
+            return self
+        texts = list(compress(self.texts(), keep))
+        return SegmentTable.from_columns(
+            compress(new_starts, keep), compress(self._ends, keep), texts
+        )
+
+    def validate(self) -> None:
+        """Raise ValueError unless every row is a valid Segment."""
+        if not len(self):
+            return
+        if min(self._starts) < 0:
+            raise ValueError("start_ms must be >= 0.")
+        if not all(map(operator.lt, self._starts, self._ends)):
+            raise ValueError("start_ms must be < end_ms.")
+        if not all(t.strip() for t in self.texts()):
+            raise ValueError("text must be non-empty after stripping.")
+
+    def to_segments(self) -> list[Segment]:
+        """Convert back to ``list[Segment]``, validating once for the whole table."""
+        self.validate()
+        return list(map(_segment_unchecked, self._starts, self._ends, self.texts()))
@@ -0,0 +1,203 @@
+"""
+Resident extraction service on a localhost HTTP endpoint.
+
+One process keeps the BBDown client (and its video-info cache), the imported
+pipeline modules and the LLM/ASR clients warm between jobs, so parent skills
+skip pixi activation and Python startup for every video.
+
+Usage:
+    pixi run python -m bilibili_subtitle --serve                 # 127.0.0.1:8765
+    pixi run python -m bilibili_subtitle --serve 127.0.0.1:9000 -j 8 --skip-summary
+
+There is no authentication and callers choose output_dir/cache_dir, so only
+loopback addresses are accepted unless ``--serve-allow-remote`` is given.
+
+API:
+    GET  /health   -> {"status": "ok", "version": ...}
+    POST /extract  {"url": "BV...", "output_dir": "...", ...}
+                   -> ExecutionResult.to_dict() (HTTP 200 also for failed extractions)
+"""
+
+from __future__ import annotations
+
+import ipaddress
+import json
+import sys
+import threading
+from collections.abc import Callable
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from .contract import ExecutionResult, execution_result_for_error
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+# Per-request overrides accepted by POST /extract, with their JSON types.
+REQUEST_OPTIONS: dict[str, tuple[type, ...]] = {
+    "output_dir": (str,),
+    "output_lang": (str,),
+    "skip_proofread": (bool,),
+    "skip_summary": (bool,),
+    "cache_dir": (str,),
+    "use_cache": (bool,),
+    "asr_chunk_seconds": (int, type(None)),
+    "asr_workers": (int,),
+    "asr_stream": (bool,),
+}
+
+_MAX_BODY_BYTES = 1 << 20
+
+Extract = Callable[[str, dict[str, Any]], ExecutionResult]
+
+
+def parse_address(value: str) -> tuple[str, int]:
+    """``PORT``, ``HOST:PORT`` or ``HOST`` -> ``(host, port)``."""
+    host, sep, port = value.rpartition(":")
+    if not sep:
+        host, port = (DEFAULT_HOST, value) if value.isdigit() else (value, str(DEFAULT_PORT))
+    if not port.isdigit() or not 0 <= int(port) <= 65535:
+        raise ValueError(f"Invalid port in address: {value!r}")
+    return host or DEFAULT_HOST, int(port)
+
+
+def is_loopback_host(host: str) -> bool:
+    """True for ``localhost`` and loopback IP addresses (127.0.0.0/8, ::1)."""
+    if host.lower() == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host.strip("[]")).is_loopback
+    except ValueError:
+        return False
+
+
+def parse_extract_request(body: bytes) -> tuple[str, dict[str, Any]]:
+    """Validate a POST /extract body; returns ``(url, options)`` or raises ValueError."""
+    try:
+        data = json.loads(body)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"Invalid JSON: {e}") from e
+    if not isinstance(data, dict):
+        raise ValueError("Request body must be a JSON object")
+    url = data.pop("url", None)
+    if not isinstance(url, str) or not url.strip():
+        raise ValueError("'url' is required")
+    for key, value in data.items():
+        types = REQUEST_OPTIONS.get(key)
+        if types is None:
+            raise ValueError(f"Unknown option: {key!r}")
+        # bool is an int subclass; don't let true/false pass as a number.
+        if not isinstance(value, types) or (isinstance(value, bool) and bool not in types):
+            raise ValueError(f"Invalid type for {key!r}")
+    return url.strip(), data
+
+
+class ExtractionServer(ThreadingHTTPServer):
+    """Threaded HTTP server running ``extract`` for each POST /extract.
+
+    At most ``max_workers`` extractions run at once; further requests wait.
+    """
+
+    daemon_threads = True
+
+    def __init__(
+        self,
+        address: tuple[str, int],
+        extract: Extract,
+        *,
+        max_workers: int = 4,
+        verbose: bool = False,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be >= 1.")
+        self.extract = extract
+        self.verbose = verbose
+        self._slots = threading.BoundedSemaphore(max_workers)
+        super().__init__(address, _Handler)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def run_job(self, url: str, options: dict[str, Any]) -> ExecutionResult:
+        with self._slots:
+            try:
+                return self.extract(url, options)
+            except Exception as e:
+                return execution_result_for_error(e, url=url)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: ExtractionServer
+    protocol_version = "HTTP/1.1"  # keep-alive for clients that reuse connections
+
+    def do_GET(self) -> None:
+        if self.path != "/health":
+            self._send_json(404, {"error": f"Not found: {self.path}"})
+            return
+        from . import __version__
+
+        self._send_json(200, {"status": "ok", "version": __version__})
+
+    def do_POST(self) -> None:
+        if self.path != "/extract":
+            self._send_json(404, {"error": f"Not found: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get("Content-Length", ""))
+        except ValueError:
+            self._send_json(411, {"error": "Content-Length required"})
+            return
+        if not 0 < length <= _MAX_BODY_BYTES:
+            self._send_json(413 if length > 0 else 400, {"error": "Invalid request body size"})
+            return
+        try:
+            url, options = parse_extract_request(self.rfile.read(length))
+        except ValueError as e:
+            self._send_json(400, {"error": str(e)})
+            return
+        self._send_json(200, self.server.run_job(url, options).to_dict())
+
+    def _send_json(self, status: int, payload: dict[str, Any]) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if self.server.verbose:
+            super().log_message(format, *args)
+
+
+def serve(
+    address: tuple[str, int],
+    extract: Extract,
+    *,
+    max_workers: int = 4,
+    verbose: bool = False,
+    allow_remote: bool = False,
+) -> None:
+    """Serve until interrupted (Ctrl-C / SIGINT).
+
+    Raises ValueError for a non-loopback ``address`` unless ``allow_remote``.
+    """
+    if not is_loopback_host(address[0]):
+        if not allow_remote:
+            raise ValueError(
+                f"Refusing to listen on non-loopback address {address[0]!r}: the service has no "
+                "authentication and lets callers write anywhere (pass --serve-allow-remote to override)"
+            )
+        print(
+            f"Warning: listening on {address[0]}; anyone who can reach it can write files as this user",
+            file=sys.stderr,
+            flush=True,
+        )
+    with ExtractionServer(address, extract, max_workers=max_workers, verbose=verbose) as server:
+        print(f"Listening on {server.url}", file=sys.stderr, flush=True)
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
@@ -1,63 +1,79 @@
 from __future__ import annotations
 
 import logging
+import mmap
 import re
+from collections.abc import Iterable, Iterator
+from contextlib import closing
 from dataclasses import dataclass
 from pathlib import Path
 
-from .converters.srt_converter import srt_to_segments
+from .converters.srt_converter import iter_subtitle_segments
 from .errors import SubtitleContentError
 from .segment import Segment
 
 logger = logging.getLogger(__name__)
 
-# VTT timestamp pattern: 00:01:23.456 (dot before ms)
-_VTT_TS_RE = re.compile(r"(\d{2}:\d{2}:\d{2})\.(\d{3})")
 
+class TitleRelevanceMatcher:
+    """Incremental title/subtitle relevance check.
 
-def _normalize_vtt_timestamps(text: str) -> str:
-    """Convert VTT timestamps (dot separator) to SRT format (comma separator).
-
-    Only touches timestamp lines — preserves dots in subtitle text content.
+    Uses character bigram matching for CJK titles and word matching for Latin
+    titles. Feed segment texts one at a time; :attr:`matched` flips to True
+    at the first hit, after which further input can be skipped. Title tokens
+    never contain whitespace, so matching per segment gives the same answer
+    as matching the space-joined transcript.
     """
-    lines = text.splitlines(keepends=True)
-    out: list[str] = []
-    for line in lines:
-        # A timestamp line contains --> and HH:MM:SS.mmm patterns
-        if "-->" in line and _VTT_TS_RE.search(line):
-            line = _VTT_TS_RE.sub(r"\1,\2", line)
-        out.append(line)
-    return "".join(out)
-
 
-def check_title_relevance(segments: list[Segment], title: str | None) -> bool:
+    def __init__(self, title: str | None) -> None:
+        self._tokens: frozenset[str] = frozenset()
+        self._lower = False
+        self.checkable = False
+        self.matched = False
+        if not title or len(title) <= 2:
+            return  # Can't check, assume relevant
+
+        # Detect if title is primarily CJK
+        cjk_chars = sum(1 for c in title if "\u4e00" <= c <= "\u9fff")
+        if cjk_chars > len(title) * 0.3:
+            # CJK: generate character bigrams
+            clean = re.sub(r"\s+", "", title)
+            self._tokens = frozenset(clean[i : i + 2] for i in range(len(clean) - 1))
+        else:
+            # Latin/mixed: split by whitespace, filter short words
+            self._tokens = frozenset(w.lower() for w in title.split() if len(w) >= 3)
+            self._lower = True
+        self.checkable = bool(self._tokens)
+
+    def feed(self, text: str) -> bool:
+        """Check one more piece of subtitle text; returns :attr:`matched`."""
+        if not self.matched and self.checkable:
+            if self._lower:
+                text = text.lower()
+            self.matched = any(tok in text for tok in self._tokens)
+        return self.matched
+
+    def relevant(self, *, saw_text: bool) -> bool:
+        """Final verdict; uncheckable titles and empty transcripts count as relevant."""
+        return self.matched or not self.checkable or not saw_text
+
+
+def check_title_relevance(segments: Iterable[Segment], title: str | None) -> bool:
     """Check if subtitle content is relevant to the video title.
 
-    Uses character bigram matching for CJK titles and word matching for Latin titles.
     Returns True (relevant) if any title token appears in the subtitle text,
-    or if the check cannot be performed (title too short / None).
+    or if the check cannot be performed (title too short / None). Stops
+    consuming ``segments`` at the first match.
     """
-    if not title or len(title) <= 2:
-        return True  # Can't check, assume relevant
-
-    subtitle_text = " ".join(seg.text for seg in segments)
-    if not subtitle_text.strip():
-        return True  # Empty text handled elsewhere
-
-    # Detect if title is primarily CJK
-    cjk_chars = sum(1 for c in title if "\u4e00" <= c <= "\u9fff")
-    if cjk_chars > len(title) * 0.3:
-        # CJK: generate character bigrams
-        clean = re.sub(r"\s+", "", title)
-        bigrams = {clean[i : i + 2] for i in range(len(clean) - 1)}
-        return any(bg in subtitle_text for bg in bigrams)
-    else:
-        # Latin/mixed: split by whitespace, filter short words
-        words = {w.lower() for w in title.split() if len(w) >= 3}
-        if not words:
+    matcher = TitleRelevanceMatcher(title)
+    if not matcher.checkable:
+        return True
+    saw_text = False
+    for seg in segments:
+        saw_text = saw_text or bool(seg.text.strip())
+        if matcher.feed(seg.text):
             return True
-        text_lower = subtitle_text.lower()
-        return any(w in text_lower for w in words)
+    return matcher.relevant(saw_text=saw_text)
 
 
 @dataclass
@@ -67,31 +83,61 @@ class LoadResult:
     relevant: bool = True
 
 
+def _subtitle_ext(path: Path) -> str:
+    ext = path.suffix.lower().lstrip(".")
+    if ext not in ("srt", "vtt"):
+        raise ValueError(f"Unsupported subtitle extension: .{ext}")
+    return ext
+
+
+def _iter_mapped_lines(path: Path) -> Iterator[str]:
+    """Yield decoded lines from a memory-mapped file, reading pages only as needed."""
+    with path.open("rb") as f:
+        if not path.stat().st_size:
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            # A b"\n" byte never occurs inside a multi-byte UTF-8 sequence, so
+            # per-line decoding matches decoding the whole file.
+            for raw in iter(mm.readline, b""):
+                yield raw.decode("utf-8", errors="replace")
+
+
+def iter_segments_from_subtitle_file(path: str | Path) -> Iterator[Segment]:
+    """Lazily parse an SRT or VTT file, yielding segments as they are read."""
+    path = Path(path)
+    _subtitle_ext(path)
+    with closing(_iter_mapped_lines(path)) as lines:
+        yield from iter_subtitle_segments(lines)
+
+
+def probe_title_relevance(path: str | Path, title: str | None) -> bool:
+    """Check relevance while parsing only as far as the first title match.
+
+    In the common (relevant) case this touches just the first few KB of the file.
+    """
+    with closing(iter_segments_from_subtitle_file(path)) as segments:
+        return check_title_relevance(segments, title)
+
+
 def load_segments_from_subtitle_file(
     path: str | Path, *, title: str | None = None
 ) -> LoadResult:
     """Load subtitle segments from SRT or VTT file.
 
-    Returns LoadResult with segments and a relevance flag.
-    Raises SubtitleContentError if the file produces zero segments.
+    Returns LoadResult with segments and a relevance flag; relevance is checked
+    incrementally while parsing. Raises SubtitleContentError if the file
+    produces zero segments.
     """
-    path = Path(path)
-    ext = path.suffix.lower().lstrip(".")
-    text = path.read_text(encoding="utf-8", errors="replace")
-
-    if ext == "vtt":
-        # Strip WEBVTT header, then normalize timestamps for SRT parser
-        text = _normalize_vtt_timestamps(text)
-        segments = srt_to_segments(text)
-    elif ext == "srt":
-        segments = srt_to_segments(text)
-    else:
-        raise ValueError(f"Unsupported subtitle extension: .{ext}")
+    matcher = TitleRelevanceMatcher(title)
+    segments: list[Segment] = []
+    for seg in iter_segments_from_subtitle_file(path):
+        segments.append(seg)
+        matcher.feed(seg.text)
 
     if not segments:
         raise SubtitleContentError("parsed subtitle file contains no segments")
 
-    relevant = check_title_relevance(segments, title)
+    relevant = matcher.relevant(saw_text=True)
     if not relevant:
         logger.warning(
             "Subtitle content may not match video title %r", title
@@ -0,0 +1,169 @@
+"""
+Lightweight per-run tracing: stage spans and counters.
+
+A Tracer is activated for the current context with ``tracing()``; ``span()``
+and ``count()`` are no-ops when none is active, so library code can be
+instrumented unconditionally. Thread pools do not inherit context variables,
+so work submitted to a pool should be wrapped with ``propagate()``.
+
+Results are exported as ``metadata.timings`` (per-stage wall time plus
+counters) or as a Chrome trace (``chrome://tracing`` / Perfetto).
+"""
+
+from __future__ import annotations
+
+import contextvars
+import json
+import os
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, ParamSpec, TypeVar
+
+P = ParamSpec("P")
+T = TypeVar("T")
+
+_current: contextvars.ContextVar[Tracer | None] = contextvars.ContextVar(
+    "bilibili_subtitle_tracer", default=None
+)
+
+
+@dataclass(frozen=True, slots=True)
+class SpanRecord:
+    name: str
+    start_ns: int  # relative to the tracer's start
+    duration_ns: int
+    thread_id: int
+    args: dict[str, Any] = field(default_factory=dict)
+
+
+class Tracer:
+    def __init__(self) -> None:
+        self._t0 = time.perf_counter_ns()
+        self._lock = threading.Lock()
+        self.spans: list[SpanRecord] = []
+        self.counters: dict[str, int | float] = {}
+
+    def _record(self, record: SpanRecord) -> None:
+        with self._lock:
+            self.spans.append(record)
+
+    def add(self, name: str, value: int | float = 1) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def timings(self) -> dict[str, Any]:
+        """Summary for ``metadata.timings``: wall time per span name, plus counters."""
+        with self._lock:
+            spans = list(self.spans)
+            counters = dict(self.counters)
+        stages: dict[str, dict[str, Any]] = {}
+        for s in spans:
+            entry = stages.setdefault(s.name, {"count": 0, "wall_ms": 0.0})
+            entry["count"] += 1
+            entry["wall_ms"] += s.duration_ns / 1e6
+        for entry in stages.values():
+            entry["wall_ms"] = round(entry["wall_ms"], 3)
+        return {
+            "total_ms": round((time.perf_counter_ns() - self._t0) / 1e6, 3),
+            "stages": stages,
+            "counters": counters,
+        }
+
+    def chrome_trace(self) -> dict[str, Any]:
+        """Spans as Chrome trace-event "complete" events (microsecond timestamps)."""
+        pid = os.getpid()
+        with self._lock:
+            spans = list(self.spans)
+            counters = dict(self.counters)
+        events: list[dict[str, Any]] = [
+            {
+                "name": s.name,
+                "ph": "X",
+                "ts": s.start_ns / 1000,
+                "dur": s.duration_ns / 1000,
+                "pid": pid,
+                "tid": s.thread_id,
+                "args": s.args,
+            }
+            for s in spans
+        ]
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": {"counters": counters}}
+
+    def write_chrome_trace(self, path: str | Path) -> None:
+        Path(path).write_text(json.dumps(self.chrome_trace(), ensure_ascii=False), encoding="utf-8")
+
+
+def current_tracer() -> Tracer | None:
+    return _current.get()
+
+
+@contextmanager
+def tracing(tracer: Tracer | None = None) -> Iterator[Tracer]:
+    """Activate ``tracer`` (or a new one) for the current context."""
+    tracer = tracer or Tracer()
+    token = _current.set(tracer)
+    try:
+        yield tracer
+    finally:
+        _current.reset(token)
+
+
+@contextmanager
+def span(name: str, **args: Any) -> Iterator[dict[str, Any]]:
+    """Time a block. The yielded dict can be filled with extra args (bytes, tokens, ...)."""
+    tracer = _current.get()
+    if tracer is None:
+        yield args
+        return
+    start = time.perf_counter_ns()
+    try:
+        yield args
+    finally:
+        end = time.perf_counter_ns()
+        tracer._record(
+            SpanRecord(
+                name=name,
+                start_ns=start - tracer._t0,
+                duration_ns=end - start,
+                thread_id=threading.get_ident(),
+                args=args,
+            )
+        )
+
+
+def count(name: str, value: int | float = 1) -> None:
+    """Add ``value`` to counter ``name`` on the active tracer, if any."""
+    tracer = _current.get()
+    if tracer is not None:
+        tracer.add(name, value)
+
+
+def record_llm_usage(prefix: str, response: Any) -> None:
+    """Count one LLM call and its token usage (Anthropic ``response.usage``)."""
+    tracer = _current.get()
+    if tracer is None:
+        return
+    tracer.add(f"{prefix}.calls")
+    usage = getattr(response, "usage", None)
+    for attr in ("input_tokens", "output_tokens"):
+        value = getattr(usage, attr, None)
+        if isinstance(value, int):
+            tracer.add(f"{prefix}.{attr}", value)
+
+
+def propagate(fn: Callable[P, T]) -> Callable[P, T]:
+    """Wrap ``fn`` so pool threads run it in a copy of the caller's context.
+
+    Each call gets its own copy, since one Context cannot be entered by two
+    threads at once.
+    """
+    ctx = contextvars.copy_context()
+
+    def run(*args: P.args, **kwargs: P.kwargs) -> T:
+        return ctx.copy().run(fn, *args, **kwargs)
+
+    return run
@@ -0,0 +1,11 @@
+from bilibili_subtitle.agents._batching import estimate_tokens, pack_by_budget
+
+
+def test_pack_by_budget_respects_budget_and_covers_all() -> None:
+    ranges = pack_by_budget([3, 3, 3, 10, 1, 1], 6)
+    assert [list(r) for r in ranges] == [[0, 1], [2], [3], [4, 5]]
+
+
+def test_estimate_tokens_counts_cjk_per_char() -> None:
+    assert estimate_tokens("你好世界") == 4
+    assert estimate_tokens("abcdefgh") == 2
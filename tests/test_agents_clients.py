@@ -0,0 +1,158 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+
+from bilibili_subtitle.agents import clients
+from bilibili_subtitle.agents.proofread_agent import ProofreadAgent
+from bilibili_subtitle.agents.summarize_agent import SummarizeAgent
+from bilibili_subtitle.agents.translate_agent import TranslateAgent
+from bilibili_subtitle.segment import Segment
+
+
+class _FakeClient:
+    def __init__(self, api_key: str, base_url: str | None, is_async: bool) -> None:
+        self.key = (api_key, base_url, is_async)
+        self.closed = False
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    created: list[_FakeClient] = []
+
+    def create(api_key, base_url, *, is_async):
+        created.append(_FakeClient(api_key, base_url, is_async))
+        return created[-1]
+
+    monkeypatch.setattr(clients, "_create_client", create)
+    monkeypatch.setattr(clients, "_clients", {})
+    monkeypatch.delenv("ANTHROPIC_BASE_URL", raising=False)
+    monkeypatch.setenv("ANTHROPIC_API_KEY", "env-key")
+    return created
+
+
+def test_clients_are_shared_per_key_and_base_url(registry) -> None:
+    a = clients.get_anthropic_client()
+    assert clients.get_anthropic_client(api_key="env-key") is a
+    assert clients.get_anthropic_client(api_key="other") is not a
+    assert clients.get_anthropic_client(base_url="http://proxy") is not a
+    assert clients.get_async_anthropic_client() is not a
+    assert [c.key for c in registry] == [
+        ("env-key", None, False),
+        ("other", None, False),
+        ("env-key", "http://proxy", False),
+        ("env-key", None, True),
+    ]
+
+    clients.close_clients()
+    assert [c.closed for c in registry] == [True, True, True, False]
+    assert clients.get_anthropic_client() is not a
+
+
+def test_missing_api_key_raises(registry, monkeypatch) -> None:
+    monkeypatch.delenv("ANTHROPIC_API_KEY")
+    with pytest.raises(RuntimeError, match="ANTHROPIC_API_KEY"):
+        clients.get_anthropic_client()
+
+
+def test_agents_share_registry_client(registry) -> None:
+    shared = clients.get_anthropic_client()
+    for agent in (ProofreadAgent(), TranslateAgent(), SummarizeAgent()):
+        assert agent._client() is shared
+    assert len(registry) == 1
+
+
+class _EchoMessages:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def create(self, **kwargs):
+        self.calls += 1
+        payload = json.loads(kwargs["messages"][0]["content"].split("\n\n", 1)[1])
+        items = [{"index": s["index"], "text": s["text"] + "!"} for s in payload["segments"]]
+        return SimpleNamespace(
+            content=[
+                SimpleNamespace(type="thinking", thinking="..."),
+                SimpleNamespace(type="text", text=json.dumps(items)),
+            ]
+        )
+
+
+def test_injected_client_is_used(registry) -> None:
+    injected = SimpleNamespace(messages=_EchoMessages())
+    agent = ProofreadAgent(client=injected)
+    out = agent.proofread_segments([Segment(0, 1000, "a"), Segment(1000, 2000, "b")])
+    assert [s.text for s in out] == ["a!", "b!"]
+    assert injected.messages.calls == 1
+    assert registry == []
+
+
+def test_complete_retries_rate_limits(monkeypatch) -> None:
+    monkeypatch.setattr("bilibili_subtitle.agents._batching.time.sleep", lambda _: None)
+
+    class RateLimitError(Exception):
+        status_code = 429
+
+    attempts = []
+
+    def create(**kwargs):
+        attempts.append(kwargs)
+        if len(attempts) == 1:
+            raise RateLimitError()
+        return SimpleNamespace(content=[SimpleNamespace(type="text", text="ok")])
+
+    client = SimpleNamespace(messages=SimpleNamespace(create=create))
+    text = clients.complete(client, model="m", system="s", user="u", usage_prefix="llm.test")
+    assert text == "ok"
+    assert len(attempts) == 2
+    assert attempts[0]["messages"] == [{"role": "user", "content": "u"}]
+
+
+def test_complete_answers_repeated_requests_from_cache(tmp_path) -> None:
+    from bilibili_subtitle.cache import ResponseCache
+
+    replies = iter(
+        [
+            SimpleNamespace(stop_reason="max_tokens", content=[SimpleNamespace(type="text", text="[trunc")]),
+            SimpleNamespace(stop_reason="end_turn", content=[SimpleNamespace(type="text", text="full")]),
+        ]
+    )
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        return next(replies)
+
+    client = SimpleNamespace(messages=SimpleNamespace(create=create))
+    cache = ResponseCache(tmp_path)
+    ask = lambda: clients.complete(client, model="m", system="s", user="u", usage_prefix="llm.t", cache=cache)
+    assert ask() == "[trunc"  # truncated: not cached
+    assert ask() == "full"
+    assert ask() == "full"
+    assert len(calls) == 2
+    assert cache.stats()["hits"] == 1
+
+
+def test_complete_does_not_cache_replies_that_fail_validation(tmp_path) -> None:
+    from bilibili_subtitle.cache import ResponseCache
+
+    replies = iter(["I can't help with that.", "[1]", "never sent"])
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        return SimpleNamespace(stop_reason="end_turn", content=[SimpleNamespace(type="text", text=next(replies))])
+
+    client = SimpleNamespace(messages=SimpleNamespace(create=create))
+    cache = ResponseCache(tmp_path)
+    ask = lambda: clients.complete(
+        client, model="m", system="s", user="u", usage_prefix="llm.t", cache=cache,
+        validate=lambda text: text.startswith("["),
+    )
+    assert ask() == "I can't help with that."  # refused: not cached
+    assert ask() == "[1]"
+    assert ask() == "[1]"
+    assert len(calls) == 2
@@ -0,0 +1,63 @@
+import io
+import threading
+import time
+
+from bilibili_subtitle.batch import batch_exit_code, iter_batch_inputs, result_line, run_batch
+from bilibili_subtitle.contract import ExecutionResult, ExitCode
+from bilibili_subtitle.errors import InvalidURLError
+
+
+def test_iter_batch_inputs_skips_blanks_and_comments() -> None:
+    stream = io.StringIO("BV1xx411c7mD\n\n# comment\n  av170001  \n")
+    assert list(iter_batch_inputs(stream)) == ["BV1xx411c7mD", "av170001"]
+
+
+def test_run_batch_converts_errors_to_results() -> None:
+    def extract(url: str) -> ExecutionResult:
+        if url == "bad":
+            raise InvalidURLError(url)
+        return ExecutionResult(exit_code=ExitCode.SUCCESS, metadata={"url": url})
+
+    results = list(run_batch(["a", "bad", "b"], extract, max_workers=2))
+    by_url = {r.metadata["url"]: r for r in results}
+    assert set(by_url) == {"a", "bad", "b"}
+    assert by_url["bad"].exit_code == ExitCode.FATAL_ERROR
+    assert by_url["bad"].errors[0]["code"] == "E008"
+    assert '"exit_code": 1' in result_line(by_url["bad"])
+
+
+def test_run_batch_bounds_concurrency() -> None:
+    lock = threading.Lock()
+    active = peak = 0
+
+    def extract(url: str) -> ExecutionResult:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.01)
+        with lock:
+            active -= 1
+        return ExecutionResult(exit_code=ExitCode.SUCCESS, metadata={"url": url})
+
+    results = list(run_batch((str(i) for i in range(20)), extract, max_workers=3))
+    assert len(results) == 20
+    assert peak <= 3
+
+
+def test_batch_exit_code() -> None:
+    assert batch_exit_code(2, 2) == 0
+    assert batch_exit_code(0, 2) == 1
+    assert batch_exit_code(1, 2) == 3
+
+
+def test_missing_batch_file_is_reported(tmp_path, monkeypatch, capsys) -> None:
+    import sys
+
+    from bilibili_subtitle.__main__ import main
+    from bilibili_subtitle.bbdown_client import BBDownClient
+
+    monkeypatch.setattr(BBDownClient, "_find_bbdown", lambda self: "/usr/bin/BBDown")
+    monkeypatch.setattr(sys, "argv", ["bilibili_subtitle", "--batch", str(tmp_path / "missing.txt")])
+    assert main() == 1
+    assert "Cannot read batch file" in capsys.readouterr().err
@@ -1,14 +1,20 @@
 """Tests for bbdown_client.py — Fix 1 (retry/timeout), Fix 5 (regex), Fix 7 (error propagation)."""
 from __future__ import annotations
 
+import asyncio
 import subprocess
-from unittest.mock import patch
+import time
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
 from bilibili_subtitle.bbdown_client import (
+    AsyncBBDownClient,
     BBDownClient,
     BBDownError,
+    SubtitleInfo,
+    VideoInfo,
+    VideoInfoCache,
     _SUBTITLE_LINE_RE,
     _AI_MARKER_RE,
     _LANG_RE,
@@ -125,3 +131,153 @@ def test_extract_subtitle_info_no_subtitle(mock_sleep):
     info = client._extract_subtitle_info("视频标题: test\n完成")
     assert info.has_subtitle is False
     assert info.languages == []
+
+
+# ── Video info cache ──
+
+_BBDOWN_OUT = "视频标题: 量子力学入门\n下载字幕 zh-Hans\n"
+
+
+def _fake_bbdown(work_dir):
+    def run(args, **_):
+        (work_dir / "BV1xx411c7mD.zh-Hans.srt").write_text("1\n", encoding="utf-8")
+        return subprocess.CompletedProcess(args, 0, _BBDOWN_OUT, "")
+    return run
+
+
+def test_video_info_cache_skips_bbdown(tmp_path):
+    client = _make_client()
+    url = "https://www.bilibili.com/video/BV1xx411c7mD/"
+    with patch.object(client, "_run", side_effect=_fake_bbdown(tmp_path)) as run:
+        first = client.get_video_info(url, tmp_path)
+        second = client.get_video_info(url, tmp_path)
+    assert run.call_count == 1
+    assert second == first
+    assert second.title == "量子力学入门"
+
+
+def test_video_info_cache_invalid_when_file_deleted(tmp_path):
+    client = _make_client()
+    url = "https://www.bilibili.com/video/BV1xx411c7mD/"
+    with patch.object(client, "_run", side_effect=_fake_bbdown(tmp_path)) as run:
+        info = client.get_video_info(url, tmp_path)
+        info.subtitle_files[0].unlink()
+        client.get_video_info(url, tmp_path)
+    assert run.call_count == 2
+
+
+def test_video_info_cache_ttl_expiry(tmp_path):
+    info = VideoInfo(
+        video_id="BV1xx411c7mD",
+        title="t",
+        subtitle_info=SubtitleInfo(has_subtitle=False, has_ai_subtitle=False, languages=[]),
+        subtitle_files=[],
+    )
+    cache = VideoInfoCache(tmp_path, ttl_seconds=60)
+    cache.put(info, "zh-Hans")
+    assert cache.get("BV1xx411c7mD", "zh-Hans") == info
+    with patch("bilibili_subtitle.bbdown_client.time.time", return_value=time.time() + 61):
+        assert cache.get("BV1xx411c7mD", "zh-Hans") is None
+
+
+# ── AsyncBBDownClient ──
+
+class _FakeProc:
+    def __init__(self, rc: int, stdout: bytes = b"", stderr: bytes = b"") -> None:
+        self.returncode = rc
+        self._out = (stdout, stderr)
+
+    async def communicate(self):
+        await asyncio.sleep(0.01)
+        return self._out
+
+
+def _make_async_client(**kwargs) -> AsyncBBDownClient:
+    with patch.object(AsyncBBDownClient, "_find_bbdown", return_value="/usr/bin/BBDown"):
+        return AsyncBBDownClient(**kwargs)
+
+
+@patch("bilibili_subtitle.bbdown_client.asyncio.sleep", new=AsyncMock())
+def test_async_retries_transient_then_succeeds():
+    procs = [_FakeProc(1, stderr=b"network error"), _FakeProc(0, b"ok")]
+    with patch(
+        "bilibili_subtitle.bbdown_client.asyncio.create_subprocess_exec",
+        new=AsyncMock(side_effect=procs),
+    ) as exec_:
+        result = asyncio.run(_make_async_client()._run(["x"], retry_delay=0.01))
+    assert result.returncode == 0 and result.stdout == "ok"
+    assert exec_.call_count == 2
+
+
+def test_async_no_retry_fatal():
+    with patch(
+        "bilibili_subtitle.bbdown_client.asyncio.create_subprocess_exec",
+        new=AsyncMock(return_value=_FakeProc(1, stderr=b"login required")),
+    ) as exec_:
+        with pytest.raises(BBDownError, match="non-retryable"):
+            asyncio.run(_make_async_client()._run(["x"]))
+    assert exec_.call_count == 1
+
+
+def test_async_concurrency_is_bounded(monkeypatch):
+    active = peak = 0
+
+    async def fake_exec(*args, **kwargs):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        proc = _FakeProc(0, b"ok")
+        original = proc.communicate
+
+        async def communicate():
+            nonlocal active
+            try:
+                return await original()
+            finally:
+                active -= 1
+
+        proc.communicate = communicate
+        return proc
+
+    monkeypatch.setattr("bilibili_subtitle.bbdown_client.MAX_CONCURRENT_PROCESSES", 3)
+    # The limit is per event loop, so it holds across separate clients.
+    clients = [_make_async_client() for _ in range(4)]
+
+    async def main():
+        await asyncio.gather(*(clients[i % 4]._run(["x"]) for i in range(20)))
+
+    with patch("bilibili_subtitle.bbdown_client.asyncio.create_subprocess_exec", new=fake_exec):
+        asyncio.run(main())
+    assert peak == 3
+
+
+def test_async_cancel_kills_process():
+    class _HangingProc:
+        returncode = None
+        killed = False
+
+        async def communicate(self):
+            await asyncio.sleep(60)
+
+        def kill(self):
+            self.killed = True
+
+        async def wait(self):
+            self.returncode = -9
+            return self.returncode
+
+    proc = _HangingProc()
+
+    async def main():
+        task = asyncio.create_task(_make_async_client()._run(["x"]))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    with patch(
+        "bilibili_subtitle.bbdown_client.asyncio.create_subprocess_exec",
+        new=AsyncMock(return_value=proc),
+    ):
+        asyncio.run(main())
+    assert proc.killed and proc.returncode == -9
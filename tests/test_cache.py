@@ -1,4 +1,7 @@
-from bilibili_subtitle.cache import Cache
+import os
+import time
+
+from bilibili_subtitle.cache import Cache, ResponseCache, TextMemo, hash_inputs, segments_digest
 from bilibili_subtitle.segment import Segment
 
 
@@ -9,3 +12,102 @@ def test_cache_roundtrip(tmp_path) -> None:
     loaded = cache.load_segments("BV1xxx", "segments.zh")
     assert loaded == segs
 
+
+
+def test_stage_roundtrip_and_hash_mismatch(tmp_path) -> None:
+    cache = Cache(tmp_path)
+    segs = [Segment(0, 1000, "a")]
+    key = segments_digest(segs)
+    cache.save_stage_segments("BV1xxx", "proofread", segs, model="m1", input_hash=key)
+    assert cache.load_stage_segments("BV1xxx", "proofread", model="m1", input_hash=key) == segs
+    assert cache.load_stage_segments("BV1xxx", "proofread", model="m2", input_hash=key) is None
+    other = segments_digest([Segment(0, 1000, "b")])
+    assert cache.load_stage("BV1xxx", "proofread", model="m1", input_hash=other) is None
+
+
+def test_stage_corrupt_file_is_miss(tmp_path) -> None:
+    cache = Cache(tmp_path)
+    key = hash_inputs("x")
+    path = cache.save_stage("BV1xxx", "summary", {"a": 1}, model="m", input_hash=key)
+    path.write_text("{truncated", encoding="utf-8")
+    assert cache.load_stage("BV1xxx", "summary", model="m", input_hash=key) is None
+
+
+def test_response_cache_hit_miss_and_ttl(tmp_path, monkeypatch) -> None:
+    cache = ResponseCache(tmp_path, ttl_seconds=60)
+    key = ResponseCache.key(model="m", system="s", user="u", max_tokens=10)
+    assert key != ResponseCache.key(model="m", system="s", user="u", max_tokens=11)
+    assert cache.get(key) is None
+    cache.put(key, "reply")
+    assert cache.get(key) == "reply"
+    assert cache.stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+    now = time.time()
+    monkeypatch.setattr("bilibili_subtitle.cache.time.time", lambda: now + 61)
+    assert cache.get(key) is None
+
+
+def test_response_cache_evicts_least_recently_used(tmp_path) -> None:
+    keys = [hash_inputs(i) for i in range(4)]
+    ResponseCache(tmp_path / "probe").put(keys[0], "x" * 200)
+    entry_size = (tmp_path / "probe" / f"{keys[0]}.json").stat().st_size
+    max_bytes = entry_size * 9 // 2  # room for four entries, not five
+    cache = ResponseCache(tmp_path / "llm", max_bytes=max_bytes)
+    tmp_path = tmp_path / "llm"
+    for i, key in enumerate(keys):
+        cache.put(key, "x" * 200)
+        os.utime(tmp_path / f"{key}.json", (i, i))  # put order = age order
+    cache.get(keys[0])  # touch: now the most recently used
+    cache.put(hash_inputs("new"), "x" * 200)
+    remaining = {p.stem for p in tmp_path.glob("*.json")}
+    assert keys[0] in remaining and hash_inputs("new") in remaining
+    assert keys[1] not in remaining
+    assert sum(p.stat().st_size for p in tmp_path.glob("*.json")) <= max_bytes
+
+
+def test_text_memo_persists_and_skips_corrupt_lines(tmp_path) -> None:
+    path = tmp_path / "memo.jsonl"
+    TextMemo(path).put_many({"a": "A", "b": "B"})
+    with path.open("a", encoding="utf-8") as f:
+        f.write("{truncated\n")
+    TextMemo(path).put_many({"a": "A2"})
+    memo = TextMemo(path)
+    assert (memo.get("a"), memo.get("b"), memo.get("c")) == ("A2", "B", None)
+
+
+def test_text_memo_compacts_stale_lines_on_load(tmp_path) -> None:
+    path = tmp_path / "memo.jsonl"
+    for i in range(20):
+        TextMemo(path).put_many({"a": f"A{i}"})
+    with path.open("a", encoding="utf-8") as f:
+        f.write("{truncated\n")
+    line_bytes = len(TextMemo._line("a", "A10").encode("utf-8"))
+
+    memo = TextMemo(path, max_bytes=line_bytes * 5)
+    assert memo.get("a") == "A19"
+    assert path.read_text(encoding="utf-8").splitlines() == [TextMemo._line("a", "A19").rstrip("\n")]
+
+
+def test_text_memo_keeps_newest_entries_under_cap(tmp_path) -> None:
+    path = tmp_path / "memo.jsonl"
+    line_bytes = len(TextMemo._line("k00", "v00").encode("utf-8"))
+    memo = TextMemo(path, max_bytes=line_bytes * 10)
+    for i in range(25):
+        memo.put_many({f"k{i:02d}": f"v{i:02d}"})
+
+    assert path.stat().st_size <= line_bytes * 10
+    assert memo.get("k24") == "v24" and memo.get("k00") is None
+    reloaded = TextMemo(path, max_bytes=line_bytes * 10)
+    assert reloaded.get("k24") == "v24" and reloaded.get("k00") is None
+
+
+def test_stage_max_age(tmp_path, monkeypatch) -> None:
+    import time
+
+    cache = Cache(tmp_path)
+    cache.save_stage("BV1", "subtitle", {"x": 1}, model="m", input_hash="h")
+    assert cache.load_stage("BV1", "subtitle", model="m", input_hash="h", max_age_seconds=60) == {"x": 1}
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 120)
+    assert cache.load_stage("BV1", "subtitle", model="m", input_hash="h", max_age_seconds=60) is None
+    assert cache.load_stage("BV1", "subtitle", model="m", input_hash="h") == {"x": 1}
@@ -0,0 +1,46 @@
+import io
+import wave
+
+import pytest
+
+from bilibili_subtitle.chunker import iter_pcm_windows, write_wav
+
+
+class _Trickle(io.BytesIO):
+    """Return short reads, like a pipe."""
+
+    def read(self, size: int = -1) -> bytes:
+        return super().read(min(size, 777) if size > 0 else 777)
+
+
+def _pcm(duration_ms: int, sample_rate: int) -> bytes:
+    n = duration_ms * sample_rate // 1000
+    return b"".join((i % 256).to_bytes(2, "little") for i in range(n))
+
+
+def _expected_bounds(duration_ms: int, chunk_ms: int, overlap_ms: int) -> list[tuple[int, int]]:
+    out, start = [], 0
+    while start < duration_ms:
+        out.append((start, min(duration_ms, start + chunk_ms)))
+        start += chunk_ms - overlap_ms
+    return out
+
+
+@pytest.mark.parametrize("stream_cls", [io.BytesIO, _Trickle])
+@pytest.mark.parametrize("duration_ms", [0, 500, 10_000, 10_500, 11_999, 25_000, 90_000])
+def test_pcm_windows_match_seek_layout(duration_ms: int, stream_cls: type) -> None:
+    sample_rate = 1000
+    pcm = _pcm(duration_ms, sample_rate)
+    windows = list(
+        iter_pcm_windows(stream_cls(pcm), chunk_ms=10_000, overlap_ms=2_000, sample_rate=sample_rate)
+    )
+    assert [(w.start_ms, w.end_ms) for w in windows] == _expected_bounds(duration_ms, 10_000, 2_000)
+    for w in windows:
+        assert w.pcm == pcm[w.start_ms * 2 : w.end_ms * 2]
+
+
+def test_write_wav_header(tmp_path) -> None:
+    path = tmp_path / "a.wav"
+    write_wav(path, _pcm(100, 16000))
+    with wave.open(str(path), "rb") as w:
+        assert (w.getnchannels(), w.getsampwidth(), w.getframerate(), w.getnframes()) == (1, 2, 16000, 1600)
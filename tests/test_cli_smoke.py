@@ -12,3 +12,39 @@ def test_cli_help_runs() -> None:
     output = proc.stdout + proc.stderr
     assert "usage: bilibili_subtitle" in output
     assert "Extract Bilibili subtitles" in output
+
+
+def _loaded_modules(code: str) -> set[str]:
+    proc = subprocess.run(
+        [sys.executable, "-c", code + "\nimport sys; print('\\n'.join(sys.modules))"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return set(proc.stdout.split())
+
+
+def test_package_import_is_lazy() -> None:
+    loaded = _loaded_modules("import bilibili_subtitle")
+    assert {m for m in loaded if m.startswith("bilibili_subtitle.")} == set()
+    assert "asyncio" not in loaded
+
+
+def test_cli_help_imports_no_pipeline_modules() -> None:
+    loaded = _loaded_modules(
+        "import sys; sys.argv = ['bilibili_subtitle', '--help']\n"
+        "from bilibili_subtitle.__main__ import main\n"
+        "try:\n    main()\nexcept SystemExit:\n    pass"
+    )
+    ours = {m for m in loaded if m.startswith("bilibili_subtitle.")}
+    assert ours == {"bilibili_subtitle.__main__", "bilibili_subtitle._defaults"}
+    assert not {"asyncio", "subprocess", "concurrent.futures"} & loaded
+
+
+def test_lazy_public_api_resolves() -> None:
+    import bilibili_subtitle
+    from bilibili_subtitle.bbdown_client import BBDownClient
+
+    assert bilibili_subtitle.BBDownClient is BBDownClient
+    assert all(hasattr(bilibili_subtitle, name) for name in bilibili_subtitle.__all__)
+    assert set(bilibili_subtitle.__all__) <= set(dir(bilibili_subtitle))
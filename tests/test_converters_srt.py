@@ -1,4 +1,8 @@
-from bilibili_subtitle.converters.srt_converter import srt_to_segments
+from bilibili_subtitle.converters.srt_converter import (
+    iter_subtitle_segments,
+    srt_to_segments,
+    vtt_to_segments,
+)
 
 
 def test_srt_to_segments_basic() -> None:
@@ -9,3 +13,44 @@ def test_srt_to_segments_basic() -> None:
         (1000, 2000, "world"),
     ]
 
+
+
+def test_srt_to_segments_tolerates_crlf_bom_and_missing_index() -> None:
+    srt = "\ufeff1\r\n00:00:00,000 --> 00:00:01,500\r\nhello\r\n  there \r\n\r\n00:00:02,000-->00:00:03,000\r\nworld\r\n"
+    segments = srt_to_segments(srt)
+    assert [(s.start_ms, s.end_ms, s.text) for s in segments] == [
+        (0, 1500, "hello there"),
+        (2000, 3000, "world"),
+    ]
+
+
+def test_srt_to_segments_skips_malformed_and_empty_cues() -> None:
+    srt = (
+        "1\n00:00:00,000 --> 00:00:01,000\n\n"
+        "2\nnot a timing line\ntext\n\n"
+        "3\n00:00:02,000 --> 00:00:02,000\nzero length\n\n"
+        "4\n00:00:03,000 --> 00:00:04,000\nkept\n"
+    )
+    assert [s.text for s in srt_to_segments(srt)] == ["kept"]
+
+
+def test_vtt_to_segments_native_syntax() -> None:
+    vtt = (
+        "WEBVTT - title\n\n"
+        "STYLE\n::cue { color: red }\n\n"
+        "NOTE a comment\nspanning lines\n\n"
+        "intro\n00:01.000 --> 00:02.500 align:start position:10%\nVersion 3.14 is out\n\n"
+        "01:00:00.000 --> 01:00:01.000\nlate\n"
+    )
+    segments = vtt_to_segments(vtt)
+    assert [(s.start_ms, s.end_ms, s.text) for s in segments] == [
+        (1000, 2500, "Version 3.14 is out"),
+        (3_600_000, 3_601_000, "late"),
+    ]
+
+
+def test_iter_subtitle_segments_reads_file_lines(tmp_path) -> None:
+    path = tmp_path / "a.srt"
+    path.write_text("1\n00:00:00,000 --> 00:00:01,000\nhello\n", encoding="utf-8")
+    with path.open(encoding="utf-8") as f:
+        assert [s.text for s in iter_subtitle_segments(f)] == ["hello"]
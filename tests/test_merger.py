@@ -1,6 +1,14 @@
+import difflib
+import random
+
 import pytest
 
-from bilibili_subtitle.merger import ChunkTranscript, merge_chunk_transcripts, validate_strictly_increasing
+from bilibili_subtitle.merger import (
+    ChunkMerger,
+    ChunkTranscript,
+    merge_chunk_transcripts,
+    validate_strictly_increasing,
+)
 from bilibili_subtitle.segment import Segment
 
 
@@ -29,3 +37,93 @@ def test_validate_strictly_increasing_raises() -> None:
     with pytest.raises(ValueError):
         validate_strictly_increasing([Segment(0, 1000, "a"), Segment(900, 2000, "b")])
 
+
+
+def _reference_merge(transcripts, *, overlap_ms, similarity_threshold):
+    """Original quadratic merge, kept to check the windowed engine against."""
+    merged = []
+    for t in sorted(transcripts, key=lambda t: t.chunk_start_ms):
+        shifted = [Segment(s.start_ms + t.chunk_start_ms, s.end_ms + t.chunk_start_ms, s.text) for s in t.segments]
+        if not merged:
+            merged.extend(shifted)
+            continue
+        overlap_end = t.chunk_start_ms + overlap_ms
+        candidates = [s for s in merged if s.end_ms > t.chunk_start_ms and s.start_ms < overlap_end]
+        for seg in shifted:
+            dup = seg.start_ms < overlap_end and any(
+                max(seg.start_ms, c.start_ms) < min(seg.end_ms, c.end_ms)
+                and difflib.SequenceMatcher(None, seg.text, c.text).ratio() >= similarity_threshold
+                for c in candidates
+            )
+            if not dup:
+                merged.append(seg)
+    merged.sort(key=lambda s: (s.start_ms, s.end_ms))
+    fixed = []
+    prev_end = 0
+    for seg in merged:
+        start = max(seg.start_ms, prev_end)
+        if start < seg.end_ms:
+            fixed.append(Segment(start, seg.end_ms, seg.text))
+            prev_end = seg.end_ms
+    return fixed
+
+
+def _random_chunks(rng: random.Random, *, n_chunks: int, chunk_ms: int, overlap_ms: int) -> list[ChunkTranscript]:
+    words = ["overlap text", "overlap txt", "hello", "你好世界", "你好世", "next", "a b c", "xyz"]
+    chunks = []
+    for i in range(n_chunks):
+        segs = []
+        t = 0
+        while t < chunk_ms - 200:
+            dur = rng.randint(200, 3000)
+            segs.append(Segment(t, min(chunk_ms, t + dur), rng.choice(words)))
+            t += rng.randint(100, dur)
+        chunks.append(ChunkTranscript(chunk_start_ms=i * (chunk_ms - overlap_ms), segments=segs))
+    rng.shuffle(chunks)
+    return chunks
+
+
+@pytest.mark.parametrize("seed", range(20))
+def test_merge_matches_reference_implementation(seed: int) -> None:
+    rng = random.Random(seed)
+    chunks = _random_chunks(rng, n_chunks=6, chunk_ms=10_000, overlap_ms=2000)
+    expected = _reference_merge(chunks, overlap_ms=2000, similarity_threshold=0.8)
+    assert merge_chunk_transcripts(chunks, overlap_ms=2000, similarity_threshold=0.8) == expected
+
+
+@pytest.mark.parametrize("seed", range(10))
+def test_chunk_merger_out_of_order_matches_batch_merge(seed: int) -> None:
+    rng = random.Random(seed)
+    chunks = sorted(
+        _random_chunks(rng, n_chunks=6, chunk_ms=10_000, overlap_ms=2000),
+        key=lambda t: t.chunk_start_ms,
+    )
+    order = list(range(len(chunks)))
+    rng.shuffle(order)
+
+    merger = ChunkMerger(overlap_ms=2000)
+    emitted = []
+    for idx in order:
+        emitted.extend(merger.add(idx, chunks[idx]))
+    emitted.extend(merger.finish())
+
+    assert emitted == merge_chunk_transcripts(chunks, overlap_ms=2000)
+
+
+def test_chunk_merger_emits_before_later_chunks_arrive() -> None:
+    c0 = ChunkTranscript(0, [Segment(0, 5000, "one"), Segment(7000, 10_000, "overlap text")])
+    c1 = ChunkTranscript(8000, [Segment(0, 2000, "overlap text"), Segment(2000, 4000, "two")])
+    c2 = ChunkTranscript(16_000, [Segment(0, 1000, "three")])
+    merger = ChunkMerger(overlap_ms=2000)
+
+    assert merger.add(1, c1) == []  # buffered until chunk 0 arrives
+    assert [s.text for s in merger.add(0, c0)] == ["one", "overlap text"]
+    assert [s.text for s in merger.add(2, c2)] == ["two"]
+    assert [s.text for s in merger.finish()] == ["three"]
+
+
+def test_chunk_merger_rejects_duplicate_index() -> None:
+    merger = ChunkMerger()
+    merger.add(0, ChunkTranscript(0, []))
+    with pytest.raises(ValueError):
+        merger.add(0, ChunkTranscript(0, []))
@@ -0,0 +1,61 @@
+import hashlib
+import os
+
+import pytest
+
+from bilibili_subtitle.errors import OutputWriteError
+from bilibili_subtitle.output_writer import atomic_outputs, write_text_atomic, write_texts_atomic
+
+
+def test_write_text_atomic_records_size_and_hash(tmp_path) -> None:
+    path = tmp_path / "a.md"
+    written = write_text_atomic(path, "你好\n")
+    data = "你好\n".encode("utf-8")
+    assert path.read_bytes() == data
+    assert (written.size, written.sha256) == (len(data), hashlib.sha256(data).hexdigest())
+    assert list(tmp_path.iterdir()) == [path]
+
+
+def test_atomic_outputs_discards_everything_on_error(tmp_path) -> None:
+    a, b = tmp_path / "a.srt", tmp_path / "b.vtt"
+    a.write_text("old", encoding="utf-8")
+    with pytest.raises(RuntimeError):
+        with atomic_outputs(a, b) as (fa, fb):
+            fa.write("new")
+            fb.write("new")
+            raise RuntimeError("crash mid-render")
+    assert a.read_text(encoding="utf-8") == "old"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["a.srt"]
+
+
+def test_atomic_outputs_commits_on_success(tmp_path) -> None:
+    a, b = tmp_path / "a.srt", tmp_path / "b.vtt"
+    with atomic_outputs(a, b) as (fa, fb):
+        fa.write("x" * 100_000)
+        fb.write("y")
+    assert fa.written.size == 100_000 and a.read_text(encoding="utf-8") == "x" * 100_000
+    assert fb.written.path == b and b.read_text(encoding="utf-8") == "y"
+
+
+def test_write_texts_atomic_concurrently(tmp_path) -> None:
+    files = {tmp_path / f"{i}.json": str(i) for i in range(4)}
+    written = write_texts_atomic(files, max_workers=4)
+    assert {p: w.size for p, w in written.items()} == {p: 1 for p in files}
+
+
+def test_unwritable_directory_raises_output_write_error(tmp_path) -> None:
+    with pytest.raises(OutputWriteError) as excinfo:
+        write_text_atomic(tmp_path / "missing" / "a.srt", "x")
+    assert excinfo.value.code == "E009"
+
+
+@pytest.mark.skipif(os.name != "posix", reason="POSIX permissions")
+def test_process_umask_is_read_without_changing_it() -> None:
+    from bilibili_subtitle.output_writer import _process_umask
+
+    before = os.umask(0o027)
+    try:
+        assert _process_umask() == 0o027
+        assert os.umask(0o027) == 0o027
+    finally:
+        os.umask(before)
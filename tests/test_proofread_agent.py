@@ -1,3 +1,6 @@
+import json
+from types import SimpleNamespace
+
 from bilibili_subtitle.agents.proofread_agent import ProofreadAgent, diff_segments
 from bilibili_subtitle.segment import Segment
 
@@ -15,3 +18,122 @@ def test_diff_segments_reports_changes() -> None:
     diff = diff_segments(before, after)
     assert diff == [{"index": 1, "before": "b", "after": "B"}]
 
+
+
+class _FakeMessages:
+    def __init__(self) -> None:
+        self.payloads: list[dict] = []
+
+    def create(self, **kwargs):
+        payload = json.loads(kwargs["messages"][0]["content"].split("\n\n", 1)[1])
+        self.payloads.append(payload)
+        # Drop one index to simulate a truncated reply; echo context to make sure it is ignored.
+        items = [{"index": s["index"], "text": s["text"].upper()} for s in payload["segments"]]
+        items += [{"index": s["index"], "text": "CTX"} for s in payload["context_before"]]
+        if 3 in {s["index"] for s in payload["segments"]}:
+            items = [it for it in items if it["index"] != 3]
+        return SimpleNamespace(content=[SimpleNamespace(type="text", text=json.dumps(items))])
+
+
+def test_proofread_windows_are_stitched_by_index(monkeypatch) -> None:
+    fake = SimpleNamespace(messages=_FakeMessages())
+    monkeypatch.setattr(ProofreadAgent, "_client", lambda self: fake)
+    segments = [Segment(i * 1000, (i + 1) * 1000, f"seg{i}") for i in range(10)]
+    agent = ProofreadAgent(max_window_tokens=40, context_segments=1, max_workers=3)
+
+    result = agent.proofread(segments)
+
+    assert len(fake.messages.payloads) > 1
+    assert [s.text for s in result.segments] == [
+        "seg3" if i == 3 else f"SEG{i}" for i in range(10)
+    ]
+    assert [(s.start_ms, s.end_ms) for s in result.segments] == [
+        (s.start_ms, s.end_ms) for s in segments
+    ]
+    assert result.unproofread == [3]
+    # Every index is sent once; the dropped one is re-sent on its own until
+    # the rounds run out.
+    windows = [[s["index"] for s in p["segments"]] for p in fake.messages.payloads]
+    assert windows[-2:] == [[3], [3]]
+    assert sorted(i for w in windows[:-2] for i in w) == list(range(10))
+
+
+class _DropOnceMessages(_FakeMessages):
+    """Omits index 3 from the first reply only."""
+
+    def create(self, **kwargs):
+        reply = super().create(**kwargs)
+        if len(self.payloads) == 1:
+            return reply
+        items = json.loads(reply.content[0].text)
+        items += [{"index": s["index"], "text": s["text"].upper()} for s in self.payloads[-1]["segments"] if s["index"] == 3]
+        return SimpleNamespace(content=[SimpleNamespace(type="text", text=json.dumps(items))])
+
+
+def test_proofread_rerequests_omitted_segments(monkeypatch) -> None:
+    fake = SimpleNamespace(messages=_DropOnceMessages())
+    monkeypatch.setattr(ProofreadAgent, "_client", lambda self: fake)
+    segments = [Segment(i * 1000, (i + 1) * 1000, f"seg{i}") for i in range(6)]
+
+    result = ProofreadAgent(context_segments=1).proofread(segments)
+
+    assert [s.text for s in result.segments] == [f"SEG{i}" for i in range(6)]
+    assert result.unproofread == []
+    assert [[s["index"] for s in p["segments"]] for p in fake.messages.payloads] == [list(range(6)), [3]]
+
+
+def test_memo_skips_segments_already_proofread(monkeypatch, tmp_path) -> None:
+    from bilibili_subtitle.cache import TextMemo
+
+    fake = SimpleNamespace(messages=_FakeMessages())
+    monkeypatch.setattr(ProofreadAgent, "_client", lambda self: fake)
+    memo_path = tmp_path / "memo.jsonl"
+    intro = [Segment(i * 1000, (i + 1) * 1000, f"intro{i}") for i in range(4)]
+    body = [Segment(4000 + i * 1000, 5000 + i * 1000, f"body{i}") for i in range(4)]
+
+    first = ProofreadAgent(memo=TextMemo(memo_path), context_segments=1)
+    first.proofread(intro + body)
+    # All 8 once, then index 3 re-requested in each remaining round.
+    assert sum(len(p["segments"]) for p in fake.messages.payloads) == 10
+
+    # Same intro followed by a different body: intro0-2 come from the memo.
+    # intro3 is re-sent (its right-hand neighbour changed, and the fake never
+    # returned text for index 3), and so is the new body.
+    fake.messages.payloads.clear()
+    other = [Segment(s.start_ms, s.end_ms, s.text.replace("body", "other")) for s in body]
+    second = ProofreadAgent(memo=TextMemo(memo_path), context_segments=1)
+    result = second.proofread(intro + other)
+
+    sent = [s["index"] for p in fake.messages.payloads for s in p["segments"]]
+    assert sorted(sent) == [3, 3, 3, 4, 5, 6, 7]
+    assert [s.text for s in result.segments] == [
+        "INTRO0", "INTRO1", "INTRO2", "intro3", "OTHER0", "OTHER1", "OTHER2", "OTHER3"
+    ]
+    contexts = [p["context_before"] for p in fake.messages.payloads if p["segments"][0]["index"] == 3]
+    assert contexts == [[{"index": 2, "text": "intro2"}]] * 3
+
+
+def test_unparseable_reply_is_not_replayed_from_cache(monkeypatch, tmp_path) -> None:
+    import pytest
+
+    from bilibili_subtitle.cache import ResponseCache
+
+    fake = SimpleNamespace(messages=_FakeMessages())
+    replies = ["Sorry, I can't do that."]
+    create = fake.messages.create
+
+    def refuse_once(**kwargs):
+        if replies:
+            fake.messages.payloads.append({})
+            return SimpleNamespace(content=[SimpleNamespace(type="text", text=replies.pop())])
+        return create(**kwargs)
+
+    fake.messages.create = refuse_once
+    monkeypatch.setattr(ProofreadAgent, "_client", lambda self: fake)
+    segments = [Segment(i * 1000, (i + 1) * 1000, f"seg{i}") for i in range(2)]
+    agent = ProofreadAgent(response_cache=ResponseCache(tmp_path))
+
+    with pytest.raises(ValueError, match="JSON array"):
+        agent.proofread(segments)
+    assert [s.text for s in agent.proofread(segments).segments] == ["SEG0", "SEG1"]
+    assert len(fake.messages.payloads) == 2
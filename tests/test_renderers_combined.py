@@ -0,0 +1,90 @@
+import io
+
+import pytest
+
+from bilibili_subtitle.renderers._time import (
+    format_timestamp_pair,
+    format_timestamp_srt,
+    format_timestamp_vtt,
+)
+from bilibili_subtitle.renderers._writer import NewlineHoldingWriter
+from bilibili_subtitle.renderers.combined import render_all_formats, write_all
+from bilibili_subtitle.renderers.markdown import render_transcript_markdown
+from bilibili_subtitle.renderers.srt import render_srt, write_srt
+from bilibili_subtitle.renderers.vtt import render_vtt
+from bilibili_subtitle.segment import Segment
+
+
+def _join_srt(segments):
+    lines = []
+    for idx, s in enumerate(segments, start=1):
+        lines += [str(idx), f"{format_timestamp_srt(s.start_ms)} --> {format_timestamp_srt(s.end_ms)}", s.text, ""]
+    return "\n".join(lines).rstrip("\n") + "\n"
+
+
+def _join_vtt(segments):
+    lines = ["WEBVTT", ""]
+    for s in segments:
+        lines += [f"{format_timestamp_vtt(s.start_ms)} --> {format_timestamp_vtt(s.end_ms)}", s.text, ""]
+    return "\n".join(lines).rstrip("\n") + "\n"
+
+
+def _join_markdown(segments, title):
+    lines = [f"# {title}", ""] if title else []
+    for s in segments:
+        lines += [f"## {format_timestamp_vtt(s.start_ms)} - {format_timestamp_vtt(s.end_ms)}", s.text, ""]
+    return "\n".join(lines).rstrip("\n") + "\n"
+
+
+CASES = [
+    [],
+    [Segment(0, 1000, "a")],
+    [Segment(0, 1000, "第一行"), Segment(1000, 3_725_042, "two\nlines"), Segment(3_725_042, 3_800_000, "end\n\n")],
+]
+
+
+@pytest.mark.parametrize("segments", CASES)
+@pytest.mark.parametrize("title", [None, "标题"])
+def test_streaming_output_matches_joined_rendering(segments, title) -> None:
+    srt, vtt, md = io.StringIO(), io.StringIO(), io.StringIO()
+    write_all(iter(segments), srt=srt, vtt=vtt, markdown=md, title=title)
+
+    assert srt.getvalue() == render_srt(segments) == _join_srt(segments)
+    assert vtt.getvalue() == render_vtt(segments) == _join_vtt(segments)
+    assert md.getvalue() == render_transcript_markdown(segments, title=title) == _join_markdown(segments, title)
+
+
+def test_write_all_bilingual_markdown_separates_languages() -> None:
+    md = io.StringIO()
+    write_all([Segment(0, 1000, "你好")], markdown=md, segments_en=[Segment(0, 1000, "Hello")])
+    assert md.getvalue() == "## 00:00:00.000 - 00:00:01.000\n你好\n\nHello\n"
+
+
+def test_bilingual_length_mismatch_with_generators() -> None:
+    zh = (s for s in [Segment(0, 1000, "a"), Segment(1000, 2000, "b")])
+    en = (s for s in [Segment(0, 1000, "A")])
+    with pytest.raises(ValueError, match="equal-length"):
+        write_srt(zh, io.StringIO(), segments_en=en)
+
+
+def test_newline_holding_writer() -> None:
+    buf = io.StringIO()
+    out = NewlineHoldingWriter(buf)
+    for piece in ["a\n\n", "\n", "b\n", "\n\n"]:
+        out.write(piece)
+    out.finish()
+    assert buf.getvalue() == "a\n\n\nb\n"
+
+
+@pytest.mark.parametrize("ms", [0, 999, 1000, 59_999, 3_599_999, 3_600_000, 360_000_123])
+def test_format_timestamp_pair_matches_single_formatters(ms) -> None:
+    assert format_timestamp_pair(ms) == (format_timestamp_srt(ms), format_timestamp_vtt(ms))
+
+
+def test_render_all_formats_bilingual_matches_individual_renderers() -> None:
+    zh = [Segment(0, 1000, "你好"), Segment(1000, 2500, "世界"), Segment(4000, 5000, "再见")]
+    en = [Segment(0, 1000, "Hello"), Segment(1000, 2500, "World"), Segment(4000, 5000, "Bye")]
+    out = render_all_formats(zh, segments_en=en, title="T")
+    assert out.srt == render_srt(zh, segments_en=en)
+    assert out.vtt == render_vtt(zh, segments_en=en)
+    assert out.markdown == render_transcript_markdown(zh, segments_en=en, title="T")
@@ -0,0 +1,149 @@
+import hashlib
+from pathlib import Path
+
+from bilibili_subtitle.__main__ import run_extraction
+from bilibili_subtitle.bbdown_client import SubtitleInfo, VideoInfo
+
+_SRT = "1\n00:00:01,000 --> 00:00:03,000\n量子力学很有趣\n"
+
+
+class FakeClient:
+    def __init__(self, work_dir: Path) -> None:
+        self.calls = 0
+        self._work_dir = work_dir
+
+    def get_video_info(self, url: str, work_dir: Path, **_: object) -> VideoInfo:
+        self.calls += 1
+        sub = work_dir / "BV1xx411c7mD.zh-Hans.srt"
+        sub.write_text(_SRT, encoding="utf-8")
+        return VideoInfo(
+            video_id="BV1xx411c7mD",
+            title="量子力学入门",
+            subtitle_info=SubtitleInfo(has_subtitle=True, has_ai_subtitle=False, languages=["zh"]),
+            subtitle_files=[sub],
+        )
+
+
+def _run(tmp_path: Path, client: FakeClient, **kwargs):
+    return run_extraction(
+        "BV1xx411c7mD",
+        tmp_path / "out",
+        cache_dir=tmp_path / "cache",
+        skip_proofread=True,
+        skip_summary=True,
+        client=client,  # type: ignore[arg-type]
+        **kwargs,
+    )
+
+
+def test_stage_cache_skips_bbdown_on_rerun(tmp_path) -> None:
+    client = FakeClient(tmp_path)
+    first = _run(tmp_path, client)
+    second = _run(tmp_path, client)
+    assert client.calls == 1
+    assert first.output.title == second.output.title == "量子力学入门"
+    assert second.output.srt_file.read_text(encoding="utf-8").startswith("1\n00:00:01,000")
+
+
+def test_no_cache_always_fetches(tmp_path) -> None:
+    client = FakeClient(tmp_path)
+    _run(tmp_path, client, use_cache=False)
+    _run(tmp_path, client, use_cache=False)
+    assert client.calls == 2
+
+
+def test_metadata_records_output_sizes_and_hashes(tmp_path) -> None:
+    result = _run(tmp_path, FakeClient(tmp_path))
+    files = result.metadata["files"]
+    assert set(files) == {"srt", "vtt", "transcript"}
+    for entry in files.values():
+        data = Path(entry["path"]).read_bytes()
+        assert entry["size"] == len(data)
+        assert entry["sha256"] == hashlib.sha256(data).hexdigest()
+    assert not list((tmp_path / "out").glob(".*.tmp"))
+
+
+def test_metadata_records_stage_timings(tmp_path) -> None:
+    first = _run(tmp_path, FakeClient(tmp_path))
+    second = _run(tmp_path, FakeClient(tmp_path))
+    stages = first.metadata["timings"]["stages"]
+    assert {"run_extraction", "acquire", "subtitle.load", "render"} <= set(stages)
+    assert "acquire" not in second.metadata["timings"]["stages"]
+    assert second.metadata["timings"]["stages"]["cache.lookup"]["count"] == 1
+
+
+def test_verbose_progress_goes_to_stderr(tmp_path, capsys) -> None:
+    _run(tmp_path, FakeClient(tmp_path), verbose=True)
+    out, err = capsys.readouterr()
+    assert out == ""
+    assert "[INFO] Processing: BV1xx411c7mD" in err
+
+
+def test_subtitle_file_is_parsed_once(tmp_path, monkeypatch) -> None:
+    import bilibili_subtitle.subtitle_loader as loader
+
+    parsed = []
+    original = loader.iter_subtitle_segments
+
+    def counting(lines):
+        for seg in original(lines):
+            parsed.append(seg)
+            yield seg
+
+    monkeypatch.setattr(loader, "iter_subtitle_segments", counting)
+    _run(tmp_path, FakeClient(tmp_path))
+    assert len(parsed) == 1
+
+
+def test_subtitle_stage_expires_with_info_cache_ttl(tmp_path, monkeypatch) -> None:
+    import time
+
+    client = FakeClient(tmp_path)
+    _run(tmp_path, client)
+    _run(tmp_path, client)
+    assert client.calls == 1
+    later = time.time() + 3600
+    monkeypatch.setattr(time, "time", lambda: later)
+    _run(tmp_path, client, info_cache_ttl=60)
+    assert client.calls == 2
+    _run(tmp_path, client, info_cache_ttl=0)
+    assert client.calls == 3
+
+
+class AsrClient(FakeClient):
+    def __init__(self, work_dir: Path) -> None:
+        super().__init__(work_dir)
+        self.audio_downloads = 0
+
+    def get_video_info(self, url: str, work_dir: Path, **_: object) -> VideoInfo:
+        self.calls += 1
+        return VideoInfo(
+            video_id="BV1xx411c7mD",
+            title="量子力学入门",
+            subtitle_info=SubtitleInfo(has_subtitle=False, has_ai_subtitle=False, languages=[]),
+            subtitle_files=[],
+        )
+
+    def download_audio(self, url: str, work_dir: Path) -> Path:
+        self.audio_downloads += 1
+        audio = work_dir / "BV1xx411c7mD.m4a"
+        audio.write_bytes(b"")
+        return audio
+
+
+def test_asr_fallback_uses_the_given_client(tmp_path, monkeypatch) -> None:
+    from types import SimpleNamespace
+
+    from bilibili_subtitle.agents.transcribe_agent import TranscribeAgent
+    from bilibili_subtitle.segment import Segment
+
+    monkeypatch.setattr("shutil.which", lambda name: f"/usr/bin/{name}")
+    monkeypatch.setattr(
+        TranscribeAgent,
+        "transcribe",
+        lambda self, path: SimpleNamespace(segments=[Segment(0, 1000, "量子力学")]),
+    )
+    client = AsrClient(tmp_path)
+    result = _run(tmp_path, client)
+    assert client.audio_downloads == 1
+    assert result.output.srt_file.read_text(encoding="utf-8").startswith("1\n00:00:00,000")
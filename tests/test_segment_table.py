@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import pytest
+
+from bilibili_subtitle.segment import Segment
+from bilibili_subtitle.segment_table import SegmentTable
+
+
+def _segs() -> list[Segment]:
+    return [
+        Segment(start_ms=0, end_ms=1000, text="你好"),
+        Segment(start_ms=1000, end_ms=2500, text="hello"),
+        Segment(start_ms=3000, end_ms=4000, text="世界"),
+    ]
+
+
+def test_roundtrip() -> None:
+    segs = _segs()
+    table = SegmentTable.from_segments(segs)
+    assert len(table) == 3
+    assert table.text(1) == "hello"
+    assert table[-1] == segs[-1]
+    assert table.to_segments() == segs
+
+
+def test_empty_table() -> None:
+    table = SegmentTable.from_segments([])
+    assert len(table) == 0
+    assert table.clamp_monotonic().to_segments() == []
+
+
+def test_shift_shares_text_pool() -> None:
+    table = SegmentTable.from_segments(_segs()).shift(500)
+    assert list(table.starts) == [500, 1500, 3500]
+    assert list(table.ends) == [1500, 3000, 4500]
+    assert list(table.texts()) == ["你好", "hello", "世界"]
+
+
+def test_clamp_monotonic_matches_merger_semantics() -> None:
+    table = SegmentTable.from_columns(
+        [0, 500, 800, 2000],
+        [1000, 900, 1500, 2500],
+        ["a", "dropped", "c", "d"],
+    )
+    out = table.clamp_monotonic().to_segments()
+    assert out == [
+        Segment(start_ms=0, end_ms=1000, text="a"),
+        Segment(start_ms=1000, end_ms=1500, text="c"),
+        Segment(start_ms=2000, end_ms=2500, text="d"),
+    ]
+
+
+def test_clamp_monotonic_respects_initial_end() -> None:
+    table = SegmentTable.from_columns([0, 1000], [800, 2000], ["a", "b"])
+    out = table.clamp_monotonic(initial_end_ms=1200).to_segments()
+    assert out == [Segment(start_ms=1200, end_ms=2000, text="b")]
+
+
+@pytest.mark.parametrize(
+    ("starts", "ends", "texts"),
+    [
+        ([-1], [10], ["x"]),
+        ([10], [10], ["x"]),
+        ([0], [10], ["   "]),
+    ],
+)
+def test_validate_rejects_invalid_rows(starts, ends, texts) -> None:
+    table = SegmentTable.from_columns(starts, ends, texts)
+    with pytest.raises(ValueError):
+        table.to_segments()
+
+
+def test_mismatched_columns_rejected() -> None:
+    with pytest.raises(ValueError):
+        SegmentTable.from_columns([0, 1], [1], ["a", "b"])
@@ -0,0 +1,193 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+from bilibili_subtitle.contract import (
+    ExecutionResult,
+    ExitCode,
+    SubtitleOutput,
+    extract_video,
+)
+from bilibili_subtitle.errors import InvalidURLError
+from bilibili_subtitle.server import (
+    ExtractionServer,
+    is_loopback_host,
+    parse_address,
+    parse_extract_request,
+    serve,
+)
+
+
+def _result(url: str, options: dict) -> ExecutionResult:
+    return ExecutionResult(
+        exit_code=ExitCode.SUCCESS,
+        output=SubtitleOutput(
+            video_id=url,
+            title="标题",
+            transcript_md=Path(options.get("output_dir", "out")) / f"{url}.transcript.md",
+        ),
+        warnings=["w"],
+        metadata={"options": options},
+    )
+
+
+@pytest.fixture
+def server():
+    calls: list[tuple[str, dict]] = []
+
+    def extract(url: str, options: dict) -> ExecutionResult:
+        calls.append((url, options))
+        if url == "bad":
+            raise InvalidURLError(url)
+        return _result(url, options)
+
+    srv = ExtractionServer(("127.0.0.1", 0), extract, max_workers=2)
+    thread = threading.Thread(target=srv.serve_forever, daemon=True)
+    thread.start()
+    srv.calls = calls
+    yield srv
+    srv.shutdown()
+    srv.server_close()
+
+
+def _post(url: str, body: bytes) -> tuple[int, dict]:
+    req = urllib.request.Request(url, data=body, method="POST")
+    try:
+        with urllib.request.urlopen(req) as resp:
+            return resp.status, json.loads(resp.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_extract_returns_execution_result_payload(server) -> None:
+    status, data = _post(
+        f"{server.url}/extract",
+        json.dumps({"url": "BV1xx411c7mD", "output_dir": "/tmp/o", "skip_summary": True}).encode(),
+    )
+    assert status == 200
+    assert data == _result("BV1xx411c7mD", {"output_dir": "/tmp/o", "skip_summary": True}).to_dict()
+    assert server.calls == [("BV1xx411c7mD", {"output_dir": "/tmp/o", "skip_summary": True})]
+
+
+def test_extract_errors_become_failed_results(server) -> None:
+    status, data = _post(f"{server.url}/extract", json.dumps({"url": "bad"}).encode())
+    assert status == 200
+    assert data["success"] is False
+    assert data["errors"][0]["code"] == "E008"
+
+
+@pytest.mark.parametrize(
+    "body",
+    [b"not json", b"[]", b'{"output_dir": "x"}', b'{"url": "BV1", "bogus": 1}', b'{"url": "BV1", "asr_workers": true}'],
+)
+def test_bad_requests_are_rejected(server, body) -> None:
+    status, data = _post(f"{server.url}/extract", body)
+    assert status == 400
+    assert "error" in data
+    assert server.calls == []
+
+
+def test_health(server) -> None:
+    with urllib.request.urlopen(f"{server.url}/health") as resp:
+        assert json.loads(resp.read())["status"] == "ok"
+
+
+def test_extract_video_uses_service(server, tmp_path) -> None:
+    result = extract_video("BV1xx411c7mD", tmp_path, server_url=server.url)
+    assert result.exit_code is ExitCode.SUCCESS
+    assert result.output is not None
+    assert result.output.transcript_md == tmp_path / "BV1xx411c7mD.transcript.md"
+    assert result.warnings == ["w"]
+
+
+def test_extract_video_falls_back_to_cli(monkeypatch, tmp_path) -> None:
+    import subprocess
+
+    seen: list[list[str]] = []
+
+    def fake_run(cmd, **_):
+        seen.append(cmd)
+        stdout = json.dumps({"exit_code": 1, "error": {"code": "E001", "message": "BBDown missing"}})
+        return subprocess.CompletedProcess(cmd, 1, stdout=stdout, stderr="")
+
+    monkeypatch.setattr(subprocess, "run", fake_run)
+    result = extract_video("BV1xx411c7mD", tmp_path, server_url="http://127.0.0.1:9")
+    assert seen and seen[0][-1] == "--json-output"
+    assert result.exit_code is ExitCode.FATAL_ERROR
+    assert result.errors == [{"code": "E001", "message": "BBDown missing"}]
+
+
+def test_extract_video_service_timeout_does_not_fall_back(monkeypatch, tmp_path) -> None:
+    import subprocess
+
+    release = threading.Event()
+
+    def slow_extract(url: str, options: dict) -> ExecutionResult:
+        release.wait(5)
+        return _result(url, options)
+
+    def fail_run(*args, **kwargs):
+        raise AssertionError("CLI fallback must not run")
+
+    monkeypatch.setattr(subprocess, "run", fail_run)
+    srv = ExtractionServer(("127.0.0.1", 0), slow_extract)
+    threading.Thread(target=srv.serve_forever, daemon=True).start()
+    try:
+        result = extract_video("BV1xx411c7mD", tmp_path, server_url=srv.url, timeout=0.2)
+    finally:
+        release.set()
+        srv.shutdown()
+        srv.server_close()
+    assert result.exit_code is ExitCode.RECOVERABLE_ERROR
+    assert "Timed out" in result.errors[0]["message"]
+
+
+def test_extract_video_cli_timeout_becomes_result(monkeypatch, tmp_path) -> None:
+    import subprocess
+
+    def slow_run(cmd, **kwargs):
+        raise subprocess.TimeoutExpired(cmd, kwargs["timeout"])
+
+    monkeypatch.setattr(subprocess, "run", slow_run)
+    result = extract_video("BV1xx411c7mD", tmp_path, server_url="http://127.0.0.1:9", timeout=1)
+    assert result.exit_code is ExitCode.RECOVERABLE_ERROR
+    assert result.errors[0]["message"] == "Timed out after 1s waiting for the CLI"
+    assert result.metadata == {"url": "BV1xx411c7mD"}
+
+
+def test_execution_result_round_trips() -> None:
+    original = _result("BV1", {"output_dir": "o"})
+    assert ExecutionResult.from_dict(original.to_dict()) == original
+
+
+def test_parse_helpers() -> None:
+    assert parse_address("9000") == ("127.0.0.1", 9000)
+    assert parse_address("0.0.0.0:80") == ("0.0.0.0", 80)
+    assert parse_address("localhost") == ("localhost", 8765)
+    with pytest.raises(ValueError):
+        parse_address("host:notaport")
+    assert parse_extract_request(b'{"url": " BV1 ", "asr_chunk_seconds": null}') == (
+        "BV1",
+        {"asr_chunk_seconds": None},
+    )
+
+
+def test_non_loopback_bind_requires_opt_in() -> None:
+    assert all(is_loopback_host(h) for h in ("127.0.0.1", "127.0.0.2", "localhost", "::1", "[::1]"))
+    assert not any(is_loopback_host(h) for h in ("0.0.0.0", "192.168.1.10", "::", "example.com"))
+    with pytest.raises(ValueError, match="non-loopback"):
+        serve(("0.0.0.0", 0), lambda url, options: _result(url, options))
+
+
+def test_cli_refuses_remote_serve_without_flag(monkeypatch, capsys) -> None:
+    import sys
+
+    from bilibili_subtitle.__main__ import main
+
+    monkeypatch.setattr(sys, "argv", ["bilibili_subtitle", "--serve", "0.0.0.0:8765"])
+    assert main() == 1
+    assert "--serve-allow-remote" in capsys.readouterr().err
@@ -7,9 +7,11 @@ from bilibili_subtitle.segment import Segment
 from bilibili_subtitle.subtitle_loader import (
     LoadResult,
     check_title_relevance,
+    iter_segments_from_subtitle_file,
     load_segments_from_subtitle_file,
-    _normalize_vtt_timestamps,
+    probe_title_relevance,
 )
+from bilibili_subtitle.converters.srt_converter import vtt_to_segments
 from bilibili_subtitle.errors import SubtitleContentError
 
 
@@ -41,19 +43,23 @@ def test_relevance_short_title_skipped():
 def test_relevance_none_title():
     assert check_title_relevance(_segs("anything"), None) is True
 
+def test_relevance_stops_at_first_match():
+    def segments():
+        yield Segment(start_ms=0, end_ms=1000, text="今天讲量子力学")
+        raise AssertionError("consumed past the first match")
+
+    assert check_title_relevance(segments(), "量子力学入门") is True
+
 
 # ── Fix 6: VTT timestamp normalization ──
 
 def test_vtt_timestamps_converted():
-    vtt = "00:01:23.456 --> 00:01:25.789\nHello world"
-    result = _normalize_vtt_timestamps(vtt)
-    assert "00:01:23,456 --> 00:01:25,789" in result
+    vtt = "WEBVTT\n\n00:01:23.456 --> 00:01:25.789\nHello world\n"
+    assert vtt_to_segments(vtt) == [Segment(start_ms=83_456, end_ms=85_789, text="Hello world")]
 
 def test_vtt_preserves_text_dots():
-    vtt = "00:01:23.456 --> 00:01:25.789\nVersion 3.14 is out"
-    result = _normalize_vtt_timestamps(vtt)
-    assert "3.14" in result
-    assert "00:01:23,456" in result
+    vtt = "WEBVTT\n\n00:01:23.456 --> 00:01:25.789\nVersion 3.14 is out\n"
+    assert [s.text for s in vtt_to_segments(vtt)] == ["Version 3.14 is out"]
 
 
 # ── File loading ──
@@ -93,3 +99,23 @@ def test_unsupported_ext(tmp_path):
     p.write_text("content", encoding="utf-8")
     with pytest.raises(ValueError, match="Unsupported"):
         load_segments_from_subtitle_file(p)
+
+def test_load_empty_file_raises(tmp_path):
+    p = tmp_path / "test.srt"
+    p.write_bytes(b"")
+    with pytest.raises(SubtitleContentError):
+        load_segments_from_subtitle_file(p)
+
+def test_iter_segments_is_lazy(tmp_path):
+    p = tmp_path / "test.vtt"
+    p.write_text(_VTT, encoding="utf-8")
+    segments = iter_segments_from_subtitle_file(p)
+    first = next(segments)
+    assert (first.start_ms, first.text) == (1000, "量子力学很有趣")
+    segments.close()
+
+def test_probe_title_relevance(tmp_path):
+    p = tmp_path / "test.srt"
+    p.write_text(_SRT, encoding="utf-8")
+    assert probe_title_relevance(p, "量子力学入门") is True
+    assert probe_title_relevance(p, "How to cook pasta at home") is False
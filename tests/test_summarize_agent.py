@@ -1,5 +1,6 @@
 import json
 from pathlib import Path
+from types import SimpleNamespace
 
 import jsonschema
 
@@ -13,3 +14,90 @@ def test_noop_summary_conforms_to_schema() -> None:
     result = agent.summarize([Segment(0, 1000, "a")], title="t")
     jsonschema.validate(result.summary, schema)
 
+
+
+def test_map_reduce_keeps_global_segment_references(monkeypatch) -> None:
+    segments = [Segment(i * 1000, (i + 1) * 1000, f"第{i}段内容") for i in range(40)]
+    sections_seen: list[list[int]] = []
+
+    def create(**kwargs):
+        user = json.loads(kwargs["messages"][0]["content"])
+        if "sections" in user:
+            # Reduce: echo section timestamps, plus one bogus reference.
+            stamps = [t for s in user["sections"] for t in s["timestamps"]]
+            stamps.append({"start_ms": 5, "end_ms": 6, "segment_indices": [999], "note": "bad"})
+            body = {"key_points": ["k"], "outline": [], "entities": [], "timestamps": stamps}
+        else:
+            indices = [line[0] for line in user["transcript"]]
+            sections_seen.append(indices)
+            # Cite the section's first index, plus one outside the section (ignored).
+            body = {
+                "key_points": ["p"],
+                "outline": [{"title": "t", "segment_indices": [indices[0]]}],
+                "entities": [],
+                "timestamps": [{"segment_indices": [indices[0], 999], "note": "n"}],
+            }
+        return SimpleNamespace(content=[SimpleNamespace(type="text", text=json.dumps(body))])
+
+    fake = SimpleNamespace(messages=SimpleNamespace(create=create))
+    monkeypatch.setattr(SummarizeAgent, "_client", lambda self: fake)
+    agent = SummarizeAgent(map_reduce_threshold_tokens=100, section_tokens=100, max_workers=3)
+
+    result = agent.summarize(segments, title="t")
+
+    assert len(sections_seen) > 1
+    firsts = sorted(s[0] for s in sections_seen)
+    assert result.summary["timestamps"] == [
+        {"start_ms": i * 1000, "end_ms": (i + 1) * 1000, "segment_indices": [i], "note": "n"}
+        for i in firsts
+    ]
+    schema = json.loads(Path("schemas/summary_schema.json").read_text(encoding="utf-8"))
+    jsonschema.validate(result.summary, schema)
+
+
+def test_reduced_summary_conforms_to_schema(monkeypatch) -> None:
+    segments = [Segment(i * 1000, (i + 1) * 1000, f"第{i}段内容") for i in range(40)]
+
+    def create(**kwargs):
+        user = json.loads(kwargs["messages"][0]["content"])
+        if "sections" in user:
+            # Reduce: reuse the sections' outline items as-is (with their
+            # segment_indices), plus one item with times only.
+            outline = [o for s in user["sections"] for o in s["outline"]]
+            outline.append({"title": "tail", "start_ms": 39_500, "end_ms": 99_999})
+            entities = [
+                {"name": "量子", "type": "concept", "description": "d", "segment_indices": [1]},
+                {"name": "no type"},
+                "not an object",
+            ]
+            body = {
+                "key_points": ["k", 3, {"text": "x"}],
+                "outline": outline,
+                "entities": entities,
+                "timestamps": [],
+                "notes": "extra",
+            }
+        else:
+            first = user["transcript"][0][0]
+            body = {
+                "key_points": [],
+                "outline": [{"title": f"s{first}", "segment_indices": [first, first + 1]}],
+                "entities": [],
+                "timestamps": [],
+            }
+        return SimpleNamespace(content=[SimpleNamespace(type="text", text=json.dumps(body))])
+
+    fake = SimpleNamespace(messages=SimpleNamespace(create=create))
+    monkeypatch.setattr(SummarizeAgent, "_client", lambda self: fake)
+    agent = SummarizeAgent(map_reduce_threshold_tokens=100, section_tokens=100)
+
+    result = agent.summarize(segments, title="t")
+
+    outline = result.summary["outline"]
+    assert len(outline) > 2
+    assert outline[0] == {"title": "s0", "start_ms": 0, "end_ms": 2000}
+    assert outline[-1] == {"title": "tail", "start_ms": 39_500, "end_ms": 40_000}
+    assert result.summary["key_points"] == ["k"]
+    assert result.summary["entities"] == [{"name": "量子", "type": "concept", "description": "d"}]
+    schema = json.loads(Path("schemas/summary_schema.json").read_text(encoding="utf-8"))
+    jsonschema.validate(result.summary, schema)
@@ -0,0 +1,84 @@
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from bilibili_subtitle.tracing import (
+    Tracer,
+    count,
+    current_tracer,
+    propagate,
+    record_llm_usage,
+    span,
+    tracing,
+)
+
+
+class _Usage:
+    input_tokens = 120
+    output_tokens = 30
+
+
+class _Response:
+    usage = _Usage()
+
+
+def test_span_and_count_are_noops_without_tracer() -> None:
+    assert current_tracer() is None
+    with span("x", n=1) as args:
+        args["extra"] = 2
+    count("y")
+    record_llm_usage("llm.test", _Response())
+
+
+def test_timings_aggregate_spans_and_counters() -> None:
+    with tracing() as tracer:
+        for _ in range(3):
+            with span("stage"):
+                pass
+        count("bytes", 10)
+        count("bytes", 5)
+        record_llm_usage("llm.test", _Response())
+    timings = tracer.timings()
+    assert timings["stages"]["stage"]["count"] == 3
+    assert timings["stages"]["stage"]["wall_ms"] >= 0
+    assert timings["counters"] == {
+        "bytes": 15,
+        "llm.test.calls": 1,
+        "llm.test.input_tokens": 120,
+        "llm.test.output_tokens": 30,
+    }
+    assert current_tracer() is None
+
+
+def test_propagate_carries_tracer_into_pool_threads() -> None:
+    def work(i: int) -> int:
+        with span("work", i=i):
+            count("items")
+        return threading.get_ident()
+
+    with tracing() as tracer:
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            list(pool.map(propagate(work), range(8)))
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            pool.submit(work, 99).result()  # not propagated: invisible
+    assert tracer.counters == {"items": 8}
+    assert sorted(s.args["i"] for s in tracer.spans) == list(range(8))
+
+
+def test_chrome_trace_format(tmp_path) -> None:
+    tracer = Tracer()
+    with tracing(tracer):
+        with span("outer"):
+            with span("inner", n=3):
+                pass
+        count("calls")
+    path = tmp_path / "trace.json"
+    tracer.write_chrome_trace(path)
+    data = json.loads(path.read_text(encoding="utf-8"))
+    events = {e["name"]: e for e in data["traceEvents"]}
+    assert set(events) == {"outer", "inner"}
+    assert all(e["ph"] == "X" for e in events.values())
+    assert events["inner"]["args"] == {"n": 3}
+    assert events["outer"]["ts"] <= events["inner"]["ts"]
+    assert events["inner"]["ts"] + events["inner"]["dur"] <= events["outer"]["ts"] + events["outer"]["dur"]
+    assert data["otherData"]["counters"] == {"calls": 1}
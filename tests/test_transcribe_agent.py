@@ -0,0 +1,109 @@
+import sys
+import threading
+import time
+import types
+from pathlib import Path
+from unittest.mock import patch
+
+from bilibili_subtitle.agents.transcribe_agent import TranscribeAgent
+from bilibili_subtitle.chunker import AudioChunk, PcmWindow
+
+
+def test_chunked_transcription_merges_with_real_offsets(tmp_path, monkeypatch) -> None:
+    monkeypatch.setitem(sys.modules, "dashscope", types.ModuleType("dashscope"))
+    chunks = [
+        AudioChunk(0, 60_000, tmp_path / "c0.wav"),
+        AudioChunk(58_000, 118_000, tmp_path / "c1.wav"),
+        AudioChunk(116_000, 130_000, tmp_path / "c2.wav"),
+    ]
+    texts = {"c0.wav": "第一段", "c1.wav": "第二段", "c2.wav": "  "}
+    lock = threading.Lock()
+    active = peak = 0
+
+    def fake_asr(self, wav_path: str) -> str:
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.01)
+        with lock:
+            active -= 1
+        return texts[Path(wav_path).name]
+
+    agent = TranscribeAgent(mode="qwen", api_key="k", chunk_seconds=60, max_workers=2)
+    with (
+        patch("bilibili_subtitle.chunker.chunk_audio_ffmpeg", return_value=chunks),
+        patch.object(TranscribeAgent, "_call_asr", fake_asr),
+    ):
+        result = agent.transcribe(str(tmp_path / "audio.m4a"))
+
+    assert [(s.start_ms, s.end_ms, s.text) for s in result.segments] == [
+        (0, 60_000, "第一段"),
+        (60_000, 118_000, "第二段"),
+    ]
+    assert peak <= 2
+
+
+def test_streaming_transcription_sends_in_memory_wav(tmp_path, monkeypatch) -> None:
+    monkeypatch.setitem(sys.modules, "dashscope", types.ModuleType("dashscope"))
+    windows = [PcmWindow(0, 60_000, b"\x00\x00" * 8), PcmWindow(58_000, 90_000, b"\x01\x00" * 8)]
+    sent: list[str] = []
+
+    def fake_asr(self, audio: str) -> str:
+        sent.append(audio)
+        return "甲" if len(sent) == 1 else "乙"
+
+    agent = TranscribeAgent(mode="qwen", api_key="k", stream=True, max_workers=1)
+    assert agent.chunk_seconds == 60
+    batches: list[list[str]] = []
+    with (
+        patch("bilibili_subtitle.chunker.stream_pcm_windows", return_value=iter(windows)),
+        patch.object(TranscribeAgent, "_call_asr", fake_asr),
+    ):
+        result = agent.transcribe(
+            str(tmp_path / "audio.m4a"),
+            on_segments=lambda segs: batches.append([s.text for s in segs]),
+        )
+
+    assert all(a.startswith("data:audio/wav;base64,") for a in sent)
+    assert [(s.start_ms, s.end_ms, s.text) for s in result.segments] == [
+        (0, 60_000, "甲"),
+        (60_000, 90_000, "乙"),
+    ]
+    assert batches == [["甲"], ["乙"]]
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_overlapping_chunk_text_is_not_duplicated(tmp_path, monkeypatch) -> None:
+    monkeypatch.setitem(sys.modules, "dashscope", types.ModuleType("dashscope"))
+    # Each chunk re-transcribes the last 2 s of the previous one; the cut
+    # words at chunk edges come out slightly differently.
+    chunks = [
+        AudioChunk(0, 20_000, tmp_path / "c0.wav"),
+        AudioChunk(18_000, 38_000, tmp_path / "c1.wav"),
+        AudioChunk(36_000, 50_000, tmp_path / "c2.wav"),
+    ]
+    texts = {
+        "c0.wav": "大家好今天我们来讲一讲量子力学的基本概",
+        "c1.wav": "量子力学的基本概念首先是波粒二象性它告诉我",
+        "c2.wav": "性它告诉我们光既是波也是粒子",
+    }
+    agent = TranscribeAgent(mode="qwen", api_key="k", chunk_seconds=20, max_workers=3)
+    with (
+        patch("bilibili_subtitle.chunker.chunk_audio_ffmpeg", return_value=chunks),
+        patch.object(TranscribeAgent, "_call_asr", lambda self, p: texts[Path(p).name]),
+    ):
+        result = agent.transcribe(str(tmp_path / "audio.m4a"))
+
+    assert "".join(s.text for s in result.segments) == (
+        "大家好今天我们来讲一讲量子力学的基本概念首先是波粒二象性它告诉我们光既是波也是粒子"
+    )
+    assert [c["text"] for c in result.raw["chunks"]] == list(texts.values())
+
+
+def test_duplicated_prefix_len_ignores_unrelated_text() -> None:
+    from bilibili_subtitle.agents.transcribe_agent import duplicated_prefix_len
+
+    assert duplicated_prefix_len("今天天气很好", "我们去公园玩吧", overlap_fraction=0.1) == 0
+    assert duplicated_prefix_len("hello world foo", "x foo bar", overlap_fraction=0.2) == 5
+    assert duplicated_prefix_len("abc", "abc", overlap_fraction=0) == 0
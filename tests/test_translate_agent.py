@@ -1,3 +1,7 @@
+import json
+import threading
+from types import SimpleNamespace
+
 from bilibili_subtitle.agents.translate_agent import TranslateAgent
 from bilibili_subtitle.segment import Segment
 
@@ -8,3 +12,71 @@ def test_translate_agent_noop() -> None:
     out = agent.translate_segments(segments)
     assert out == segments
 
+
+
+class _RateLimited(Exception):
+    status_code = 429
+
+
+class _FakeMessages:
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.calls = 0
+        self.seen: list[list[int]] = []
+        self.rate_limited = False
+
+    def create(self, **kwargs):
+        with self.lock:
+            self.calls += 1
+            if not self.rate_limited:
+                self.rate_limited = True
+                raise _RateLimited()
+        payload = json.loads(kwargs["messages"][0]["content"].split("\n\n", 1)[1])
+        indices = [p["index"] for p in payload]
+        with self.lock:
+            first_time = not any(set(indices) & set(s) for s in self.seen)
+            self.seen.append(indices)
+        # First pass drops odd indices, the selective retry fills them in.
+        items = [
+            {"index": p["index"], "text": f"en{p['index']}"}
+            for p in payload
+            if not (first_time and p["index"] % 2)
+        ]
+        return SimpleNamespace(content=[SimpleNamespace(type="text", text=json.dumps(items))])
+
+
+def test_translate_batches_retries_and_fills_missing(monkeypatch) -> None:
+    fake = SimpleNamespace(messages=_FakeMessages())
+    monkeypatch.setattr(TranslateAgent, "_client", lambda self: fake)
+    monkeypatch.setattr("bilibili_subtitle.agents._batching.time.sleep", lambda s: None)
+    segments = [Segment(i * 1000, (i + 1) * 1000, f"中文{i}") for i in range(8)]
+    agent = TranslateAgent(max_batch_tokens=100, max_workers=2)
+
+    out = agent.translate_segments(segments)
+
+    assert [s.text for s in out] == [f"en{i}" for i in range(8)]
+    requested = [i for batch in fake.messages.seen for i in batch]
+    # Even indices were translated on the first pass and never re-sent.
+    assert sorted(requested) == [0, 1, 1, 2, 3, 3, 4, 5, 5, 6, 7, 7]
+    assert len(fake.messages.seen) > 2  # token budget forced several batches
+
+
+def test_rerequest_rounds_bypass_response_cache(monkeypatch, tmp_path) -> None:
+    from bilibili_subtitle.cache import ResponseCache
+
+    replies = iter(["[]", json.dumps([{"index": 0, "text": "hello"}])])
+    calls = []
+
+    def create(**kwargs):
+        calls.append(kwargs)
+        return SimpleNamespace(content=[SimpleNamespace(type="text", text=next(replies))])
+
+    fake = SimpleNamespace(messages=SimpleNamespace(create=create))
+    monkeypatch.setattr(TranslateAgent, "_client", lambda self: fake)
+    agent = TranslateAgent(response_cache=ResponseCache(tmp_path))
+
+    out = agent.translate_segments([Segment(0, 1000, "你好")])
+
+    # The re-sent batch is identical to the first; it must not get the cached "[]".
+    assert [s.text for s in out] == ["hello"]
+    assert len(calls) == 2